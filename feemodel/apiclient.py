@@ -38,6 +38,12 @@ class APIClient(object):
         }
         return self._get_resource("decidefee", data=data)
 
+    def submit_scenarios(self, grid):
+        return self._put_resource("scenarios", {"grid": grid})["scenarios"]
+
+    def get_scenario(self, key):
+        return self._get_resource("scenarios/" + key)
+
     def get_poolsobj(self):
         from base64 import b64decode
         from feemodel.util import pickle
@@ -105,7 +105,7 @@ def main(mempool_only=False, txsourcefile=None):
     def estimatefee(waitminutes):
         # TODO: check if it transient stats are outdated.
         try:
-            stats = sim.transient.stats
+            stats = sim.transient.get_feestats()
         except AttributeError:
             abort(501)
         if stats is None:
@@ -113,13 +113,14 @@ def main(mempool_only=False, txsourcefile=None):
         feerate = stats.estimatefee(waitminutes)
         if feerate is None:
             feerate = -1
-        response = {'feerate': feerate, 'avgwait': waitminutes}
+        response = {'feerate': feerate, 'avgwait': waitminutes,
+                    'approximate': stats.approximate}
         return jsonify(response)
 
     @app.route('/feemodel/decidefee', methods=['GET'])
     def decidefee():
         try:
-            stats = sim.transient.stats
+            stats = sim.transient.get_feestats()
         except AttributeError:
             abort(501)
         if stats is None:
@@ -145,10 +146,39 @@ def main(mempool_only=False, txsourcefile=None):
             "fee": fee,
             "feerate": fee*1000/txsize,
             "expectedwait": expectedwait,
-            "totalcost": totalcost
+            "totalcost": totalcost,
+            "approximate": stats.approximate
         }
         return jsonify(response)
 
+    @app.route('/feemodel/scenarios', methods=['PUT'])
+    def scenarios():
+        try:
+            engine = sim.scenarios
+        except AttributeError:
+            abort(501)
+        try:
+            grid = request.get_json(force=True)['grid']
+        except Exception:
+            abort(400)
+        try:
+            scenarios = engine.submit(grid)
+        except ValueError as e:
+            response = {'message': '400: {}'.format(e)}
+            return make_response(jsonify(response), 400)
+        return jsonify({'scenarios': scenarios})
+
+    @app.route('/feemodel/scenarios/<key>', methods=['GET'])
+    def scenario(key):
+        try:
+            engine = sim.scenarios
+        except AttributeError:
+            abort(501)
+        scenario = engine.get_scenario(key)
+        if scenario is None:
+            abort(404)
+        return jsonify(scenario)
+
     @app.route('/feemodel/loglevel', methods=['GET', 'PUT'])
     def loglevel():
         if request.method == 'PUT':
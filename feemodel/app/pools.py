@@ -21,6 +21,7 @@ class PoolsOnlineEstimator(object):
                  minblocks=DEFAULT_MINBLOCKS):
         self.window = window
         self.minblocks = minblocks
+        self.version = 0
         self.poolsestimate = None
         self.loadingthread = threading.Thread(target=self.load_estimates,
                                               args=(currheight, stopflag))
@@ -36,7 +37,7 @@ class PoolsOnlineEstimator(object):
             if memblock is not None:
                 poolsestimate.update(memblock, windowsize=self.window)
         self.check_minblocks(poolsestimate)
-        self.poolsestimate = poolsestimate
+        self._publish(poolsestimate)
         self.save_estimates()
 
     def get_pools(self):
@@ -46,6 +47,12 @@ class PoolsOnlineEstimator(object):
         # operations on the object.
         return self.poolsestimate
 
+    def _publish(self, poolsestimate):
+        '''Publish a new estimate, stamped with the next version.'''
+        self.version += 1
+        poolsestimate.version = self.version
+        self.poolsestimate = poolsestimate
+
     def save_estimates(self):
         try:
             save_obj(self.poolsestimate, SAVEFILE)
@@ -64,7 +71,7 @@ class PoolsOnlineEstimator(object):
         blockrangetuple = (startheight, currheight+1)
         poolsestimate.start(blockrangetuple, stopflag=stopflag)
         self.check_minblocks(poolsestimate)
-        self.poolsestimate = poolsestimate
+        self._publish(poolsestimate)
 
     def check_minblocks(self, poolsestimate):
         if len(poolsestimate.blockstats) < self.minblocks:
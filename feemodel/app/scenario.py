@@ -0,0 +1,367 @@
+'''What-if transient sims, under overrides of the current estimates.'''
+from __future__ import division
+
+import logging
+import threading
+import multiprocessing
+import hashlib
+import itertools
+import Queue
+from collections import OrderedDict
+from time import time
+
+from feemodel.util import StoppableThread
+from feemodel.simul import Simul, SimPool, SimPools, SimTxSource
+from feemodel.simul.simul import pack_entries
+from feemodel.simul.transient import transientsim, TransientWorkerPool
+from feemodel.simul.remote import TransientRemotePool
+from feemodel.txmempool import MemBlock, MEMBLOCK_DBFILE
+from feemodel.app.transient import TransientStats
+
+default_miniters = 1000
+default_maxiters = 10000
+default_maxtime = 60
+default_cachesize = 100
+default_numprocesses = 1
+default_maxconcurrent = 4
+# All the scenarios are run with this seed, so that their results are a
+# function of their inputs (up to the scheduling of the workers), and
+# differences between scenarios aren't mostly noise.
+SCENARIO_SEED = 0
+# The overrides, and their types. maxblocksize is that of every pool;
+# hashrate and txrate are factors on the total hashrate (i.e. the block
+# rate) and on the tx arrival rate; mempoolheight replaces the current
+# mempool by the memblock at that height.
+SCENARIO_PARAMS = {
+    'maxblocksize': int,
+    'hashrate': float,
+    'txrate': float,
+    'mempoolheight': int,
+}
+
+logger = logging.getLogger(__name__)
+
+
+class ScenarioEngine(StoppableThread):
+    '''Runs transient sims of scenarios, i.e. overrides of the estimates.
+
+    The scenarios are against the resources (pools, tx source and mempool)
+    of the last update of transient (a TransientOnline), so that they are
+    comparable with its stats, and stay the same till its next update.
+
+    The scenarios have their own workers, apart from those of transient,
+    so that they don't hold up its updates: numprocesses local processes
+    (all the CPUs if None), or the remote workers if remoteworkers is
+    given (see TransientOnline). They are run in submission order, up to
+    maxconcurrent at a time: the workers are split evenly into that many
+    lanes, each with its own worker pool, and each lane runs one scenario
+    at a time; so the scenarios of a grid run side by side, rather than
+    each waiting for the ones before it. The results are
+    cached by scenario key, a hash of the contents of all the inputs, so
+    resubmitting a scenario is instant; the cachesize most recent results
+    are kept.
+    '''
+
+    def __init__(self, transient,
+                 miniters=default_miniters,
+                 maxiters=default_maxiters,
+                 maxtime=default_maxtime,
+                 cachesize=default_cachesize,
+                 numprocesses=default_numprocesses,
+                 remoteworkers=None,
+                 antithetic=False,
+                 control=False,
+                 dbfile=MEMBLOCK_DBFILE,
+                 maxconcurrent=default_maxconcurrent):
+        self.transient = transient
+        self.miniters = miniters
+        self.maxiters = maxiters
+        self.maxtime = maxtime
+        self.cachesize = cachesize
+        self.numprocesses = numprocesses
+        self.remoteworkers = remoteworkers
+        self.maxconcurrent = maxconcurrent
+        self.antithetic = antithetic
+        self.control = control
+        self.dbfile = dbfile
+
+        # Scenario key -> scenario dict, in order of last access
+        self._scenarios = OrderedDict()
+        self._lock = threading.Lock()
+        self._queue = Queue.Queue()
+        # (object, digest) of the last digested resources, by identity
+        self._digests = {}
+        super(ScenarioEngine, self).__init__()
+
+    def run(self):
+        logger.info("Starting scenario engine.")
+        lanes = [threading.Thread(target=self._run_lane, args=(lane,))
+                 for lane in self._get_lanes()]
+        for lane in lanes:
+            lane.start()
+        for lane in lanes:
+            lane.join()
+        logger.info("Stopped scenario engine.")
+
+    def _get_lanes(self):
+        '''Split the workers into lanes, for running scenarios at once.
+
+        Returns a list of _ScenarioLane, at most maxconcurrent of them.
+        '''
+        if self.remoteworkers:
+            numlanes = min(self.maxconcurrent, len(self.remoteworkers))
+            return [
+                _ScenarioLane(remoteworkers=self.remoteworkers[i::numlanes])
+                for i in range(numlanes)]
+        numprocesses = self.numprocesses or multiprocessing.cpu_count()
+        numlanes = min(self.maxconcurrent, numprocesses)
+        return [
+            _ScenarioLane(numprocesses=(numprocesses // numlanes +
+                                        (i < numprocesses % numlanes)))
+            for i in range(numlanes)]
+
+    def _run_lane(self, lane):
+        '''Run the queued scenarios, one at a time, on lane.'''
+        try:
+            while not self.is_stopped():
+                try:
+                    key, resources = self._queue.get(timeout=1)
+                except Queue.Empty:
+                    continue
+                self._run_scenario(key, resources, lane)
+        finally:
+            lane.close()
+
+    def submit(self, grid):
+        '''Submit the scenarios of a grid (see expand_grid).
+
+        Returns the list of the scenarios, as in get_scenario; those not
+        already cached are queued to run. Raises ValueError if the grid is
+        invalid, or if there are no resources yet (i.e. transient hasn't
+        updated).
+        '''
+        overrides_list = expand_grid(grid)
+        resources = self.transient.get_lastresources()
+        if resources is None:
+            raise ValueError("No estimates yet.")
+        scenarios = []
+        with self._lock:
+            for overrides in overrides_list:
+                key = self.get_key(resources, overrides)
+                scenario = self._scenarios.pop(key, None)
+                if scenario is None:
+                    scenario = {
+                        'key': key,
+                        'overrides': overrides,
+                        'status': 'pending',
+                        'timestamp': time(),
+                    }
+                    self._queue.put((key, resources))
+                self._scenarios[key] = scenario
+                scenarios.append(dict(scenario))
+            self._trim_cache()
+        return scenarios
+
+    def get_scenario(self, key):
+        '''Get a scenario by key, or None if there is none.
+
+        A scenario is a dict with keys 'key', 'overrides', 'timestamp' and
+        'status', which is 'pending', 'done' or 'error'. If done, 'stats'
+        are the TransientStats stats of the sim, and if error, 'error' is
+        the error message.
+        '''
+        with self._lock:
+            scenario = self._scenarios.get(key)
+            return dict(scenario) if scenario is not None else None
+
+    def get_key(self, resources, overrides):
+        '''The scenario key: a hash of the contents of its inputs.
+
+        The mempool at mempoolheight is identified by the height, since
+        memblocks don't change.
+        '''
+        pools, tx_source, mempoolstate = resources
+        mempooldigest = (
+            ('mempoolheight', overrides['mempoolheight'])
+            if 'mempoolheight' in overrides else
+            self._get_digest(mempoolstate, _mempool_contents))
+        contents = (
+            self._get_digest(pools, _pools_contents),
+            self._get_digest(tx_source, _txsource_contents),
+            mempooldigest,
+            sorted(overrides.items()),
+            (self.miniters, self.maxiters, self.antithetic, self.control,
+             SCENARIO_SEED))
+        return hashlib.sha1(repr(contents)).hexdigest()
+
+    def _get_digest(self, obj, contentsfn):
+        '''The hash of contentsfn(obj), memoized by the identity of obj.
+
+        The resources aren't modified once published (see
+        PoolsOnlineEstimator._publish), so this is safe.
+        '''
+        memo = self._digests.get(contentsfn)
+        if memo is None or memo[0] is not obj:
+            memo = (obj, hashlib.sha1(contentsfn(obj)).hexdigest())
+            self._digests[contentsfn] = memo
+        return memo[1]
+
+    def _run_scenario(self, key, resources, lane):
+        scenario = self.get_scenario(key)
+        if scenario is None:
+            # Evicted before it could run.
+            return
+        update = {}
+        starttime = time()
+        try:
+            pools, tx_source, entries = apply_overrides(
+                resources, scenario['overrides'], dbfile=self.dbfile)
+            sim = Simul(pools, tx_source)
+            feepoints, waitstats = transientsim(
+                sim,
+                init_entries=entries,
+                minfeerate=sim.stablefeerate,
+                miniters=self.miniters,
+                maxiters=self.maxiters,
+                maxtime=self.maxtime,
+                stopflag=self.get_stop_object(),
+                workerpool=lane.get_workerpool(),
+                accumulate=True,
+                antithetic=self.antithetic,
+                control=self.control,
+                seed=SCENARIO_SEED)
+        except StopIteration:
+            return
+        except Exception as e:
+            logger.warning("Scenario {} failed: {}".format(
+                scenario['overrides'], repr(e)))
+            update = {'status': 'error', 'error': str(e)}
+        else:
+            stats = TransientStats()
+            stats.record_waitstats(feepoints, waitstats)
+            update = {'status': 'done', 'stats': stats.get_stats()}
+            logger.info("Scenario {} done in {:.2f}s and {} iters.".format(
+                scenario['overrides'], time() - starttime, stats.numiters))
+        with self._lock:
+            scenario = self._scenarios.get(key)
+            if scenario is not None:
+                scenario.update(update)
+            self._trim_cache()
+
+    def _trim_cache(self):
+        '''Evict the least recently accessed completed scenarios.'''
+        numexcess = len(self._scenarios) - self.cachesize
+        if numexcess <= 0:
+            return
+        for key in [key for key, scenario in self._scenarios.items()
+                    if scenario['status'] != 'pending'][:numexcess]:
+            del self._scenarios[key]
+
+
+class _ScenarioLane(object):
+    '''A share of the workers, with its own worker pool.
+
+    The pool is started on first use: TransientWorkerPool with
+    numprocesses, or TransientRemotePool if remoteworkers is given.
+    '''
+
+    def __init__(self, numprocesses=None, remoteworkers=None):
+        self.numprocesses = numprocesses
+        self.remoteworkers = remoteworkers
+        self.workerpool = None
+
+    def get_workerpool(self):
+        if self.workerpool is None:
+            if self.remoteworkers:
+                self.workerpool = TransientRemotePool(self.remoteworkers)
+            else:
+                self.workerpool = TransientWorkerPool(self.numprocesses)
+        return self.workerpool
+
+    def close(self):
+        if self.workerpool is not None:
+            self.workerpool.close()
+            self.workerpool = None
+
+
+def expand_grid(grid):
+    '''Expand a grid of overrides into a list of scenario overrides.
+
+    grid is a dict of param (one of SCENARIO_PARAMS) to a value, or a list
+    of values. The scenarios are all the combinations of values, in the
+    order of itertools.product over the params in sorted order. Raises
+    ValueError if the grid is invalid.
+    '''
+    if not grid:
+        raise ValueError("Empty grid.")
+    params = sorted(grid)
+    valuelists = []
+    for param in params:
+        if param not in SCENARIO_PARAMS:
+            raise ValueError("Unknown scenario param {}.".format(param))
+        values = grid[param]
+        if not isinstance(values, (list, tuple)):
+            values = [values]
+        if not values:
+            raise ValueError("No values for {}.".format(param))
+        paramtype = SCENARIO_PARAMS[param]
+        try:
+            values = [paramtype(value) for value in values]
+        except (TypeError, ValueError):
+            raise ValueError("Bad values for {}.".format(param))
+        if any([value <= 0 for value in values]):
+            raise ValueError("Values for {} must be positive.".format(param))
+        valuelists.append(values)
+    return [dict(zip(params, values))
+            for values in itertools.product(*valuelists)]
+
+
+def apply_overrides(resources, overrides, dbfile=MEMBLOCK_DBFILE):
+    '''Returns the (pools, tx_source, entries) of a scenario.
+
+    resources is (pools, tx_source, mempoolstate); they're not modified.
+    '''
+    pools, tx_source, mempoolstate = resources
+    maxblocksize = overrides.get('maxblocksize')
+    pools = SimPools(
+        pools={
+            name: SimPool(
+                pool.hashrate,
+                maxblocksize if maxblocksize else pool.maxblocksize,
+                pool.minfeerate)
+            for name, pool in pools.pools.items()},
+        blockrate=pools.blockrate*overrides.get('hashrate', 1))
+    tx_source = SimTxSource(
+        tx_source.txsample,
+        tx_source.txrate*overrides.get('txrate', 1),
+        weights=tx_source.weights)
+    if 'mempoolheight' in overrides:
+        memblock = MemBlock.read(overrides['mempoolheight'], dbfile=dbfile)
+        if memblock is None:
+            raise ValueError("No memblock at height {}.".format(
+                overrides['mempoolheight']))
+        entries = memblock.entries
+    else:
+        entries = mempoolstate.entries
+    return pools, tx_source, entries
+
+
+def _pools_contents(pools):
+    return repr((
+        sorted([(name, pool.hashrate, pool.maxblocksize, pool.minfeerate)
+                for name, pool in pools.pools.items()]),
+        pools.blockrate))
+
+
+def _txsource_contents(tx_source):
+    return repr((
+        [(tx.feerate, tx.size) for tx in tx_source.txsample],
+        tx_source.weights,
+        tx_source.txrate))
+
+
+def _mempool_contents(mempoolstate):
+    txids, feerates, sizes, depends_start, depends = pack_entries(
+        mempoolstate.entries)
+    return ''.join([repr(txids)] + [a.tostring() for a in (
+        feerates, sizes, depends_start, depends)])
@@ -10,6 +10,9 @@ import feemodel.util
 from feemodel.app.pools import PoolsOnlineEstimator
 from feemodel.app.txrate import TxRateOnlineEstimator
 from feemodel.app.transient import TransientOnline
+from feemodel.app.scenario import ScenarioEngine
+from feemodel.simul.transient import PrecisionTarget
+from feemodel.simul.remote import parse_addresses
 from feemodel.app.predict import Prediction, PVALS_DBFILE
 
 logger = logging.getLogger(__name__)
@@ -36,18 +39,61 @@ class SimOnline(TxMempool):
         trans_numprocesses = config.getint("app", "trans_numprocesses")
         if trans_numprocesses == -1:
             trans_numprocesses = None
+        trans_target_rse = config.getfloat("app", "trans_target_rse")
+        if trans_target_rse > 0:
+            trans_stoppingrule = PrecisionTarget(
+                trans_target_rse,
+                percentiles=map(float, config.get(
+                    "app", "trans_target_percentiles").split(",")))
+        else:
+            trans_stoppingrule = None
+        trans_tilt = config.get("app", "trans_importance_tilt").strip()
+        if trans_tilt:
+            trans_tilt = tuple(map(float, trans_tilt.split(",")))
+        else:
+            trans_tilt = None
+        trans_remoteworkers = parse_addresses(
+            config.get("app", "trans_remote_workers"),
+            defaultport=config.getint("app", "trans_worker_port"))
         self.transient = TransientOnline(
             self,
             self.poolsonline,
             self.txonline,
             update_period=config.getint("app", "trans_update_period"),
+            min_refresh=config.getfloat("app", "trans_min_refresh"),
             miniters=config.getint("app", "trans_miniters"),
             maxiters=config.getint("app", "trans_maxiters"),
-            numprocesses=trans_numprocesses)
+            numprocesses=trans_numprocesses,
+            stoppingrule=trans_stoppingrule,
+            antithetic=config.getboolean("app", "trans_antithetic"),
+            control=config.getboolean("app", "trans_control_variate"),
+            crn=config.getboolean("app", "trans_common_random_numbers"),
+            warmstart=config.getboolean("app", "trans_warmstart"),
+            warmstart_halflife=config.getfloat(
+                "app", "trans_warmstart_halflife"),
+            dense=config.getboolean("app", "trans_dense"),
+            remoteworkers=trans_remoteworkers,
+            tilt=trans_tilt)
+        scenario_numprocesses = config.getint("app", "scenario_numprocesses")
+        if scenario_numprocesses == -1:
+            scenario_numprocesses = None
+        self.scenarios = ScenarioEngine(
+            self.transient,
+            miniters=config.getint("app", "scenario_miniters"),
+            maxiters=config.getint("app", "scenario_maxiters"),
+            maxtime=config.getfloat("app", "scenario_maxtime"),
+            cachesize=config.getint("app", "scenario_cachesize"),
+            maxconcurrent=config.getint("app", "scenario_maxconcurrent"),
+            numprocesses=scenario_numprocesses,
+            remoteworkers=parse_addresses(
+                config.get("app", "scenario_remote_workers"),
+                defaultport=config.getint("app", "trans_worker_port")),
+            antithetic=config.getboolean("app", "trans_antithetic"),
+            control=config.getboolean("app", "trans_control_variate"))
 
     @logexceptions
     def run(self):
-        with self.transient.context_start():
+        with self.transient.context_start(), self.scenarios.context_start():
             self.predictworker.start()
             super(SimOnline, self).run()
             self.predictworker.stop()
@@ -58,11 +104,13 @@ class SimOnline(TxMempool):
         state = super(SimOnline, self).update()
         self.predictworker.put(state, self.transient.stats)
         self.txonline.update(state)
+        self.transient.notify_update()
 
     def process_blocks(self, *args):
         memblocks = super(SimOnline, self).process_blocks(*args)
         self.predictworker.put(memblocks)
         self.poolsonline.update(memblocks)
+        self.transient.notify_block()
 
     def update_predicts(self, *args):
         if len(args) == 2:
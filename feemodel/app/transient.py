@@ -1,20 +1,39 @@
 from __future__ import division
 
 import logging
+import threading
 from time import time
 from math import ceil, sqrt
-from collections import defaultdict
+from bisect import bisect_right
+from random import getrandbits
 
-from feemodel.util import StoppableThread, DataSample
+from feemodel.util import StoppableThread
 from feemodel.simul import Simul
-from feemodel.simul.stats import WaitFn
-from feemodel.simul.transient import transientsim
+from feemodel.simul.stats import WaitFn, Capacity
+from feemodel.simul.transient import (transientsim, TransientWorkerPool,
+                                      WaitAccumulator, get_precision,
+                                      get_default_feepoints,
+                                      get_dense_feerates, fluid_waits,
+                                      pack_entries)
+from feemodel.simul.remote import TransientRemotePool
+from feemodel.txmempool import calc_sizefn
 from feemodel.app.predict import WAIT_PERCENTILE_PTS, TxPrediction
 from feemodel.config import EXPECTED_BLOCK_INTERVAL, MINRELAYTXFEE
 
 default_update_period = 60.
+default_min_refresh = 5.
 default_miniters = 2000
 default_maxiters = 10000
+default_warmstart_halflife = 180.
+# Changes in the inputs beyond these are material, i.e. they trigger an
+# update, and preclude a warm start: in the mempool size at each feepoint,
+# as a fraction of the max block capacity (i.e. in blocks), and in the tx
+# byterate at each feepoint, relative.
+MAX_MEMPOOL_DELTA = 0.1
+MAX_TXRATE_DELTA = 0.05
+# On a warm start, the fraction of miniters and maxiters which is always
+# run anew.
+WARMSTART_MIN_REFRESH = 0.2
 
 logger = logging.getLogger(__name__)
 
@@ -23,59 +42,259 @@ class TransientOnline(StoppableThread):
 
     def __init__(self, mempool, poolsonline, txonline,
                  update_period=default_update_period,
+                 min_refresh=default_min_refresh,
                  miniters=default_miniters,
                  maxiters=default_maxiters,
-                 numprocesses=None):
+                 numprocesses=None,
+                 stoppingrule=None,
+                 antithetic=False,
+                 control=False,
+                 crn=False,
+                 warmstart=False,
+                 warmstart_halflife=default_warmstart_halflife,
+                 dense=False,
+                 remoteworkers=None,
+                 tilt=None):
+        '''Online transient sim.
+
+        The updates are event-driven: a new block (notify_block) triggers
+        an update straight away, cancelling the one in progress, and a
+        material change in the mempool or estimates (notify_update)
+        triggers one after the update in progress. Updates are at least
+        min_refresh, and at most update_period, seconds apart (from start
+        to start).
+
+        stoppingrule is an optional PrecisionTarget for transientsim, and
+        antithetic and control are its variance reduction options. If crn
+        is True, every update uses the same seed (common random numbers),
+        so that the changes in the estimates from one update to the next
+        are mostly due to changes in the mempool and estimates.
+
+        If warmstart is True, the wait times of the previous update are
+        reused if the inputs have changed only a little (see
+        _get_warmstart), downweighted by their age with half-life
+        warmstart_halflife seconds; only enough new iterations are then
+        run to make up miniters and maxiters, or to meet the stopping
+        rule.
+
+        If dense is True, the expected waits are also estimated at every
+        feerate at which they can change (see get_dense_feerates), and
+        used by estimatefee and decidefee in place of the interpolated
+        ones.
+
+        If remoteworkers (a list of (host, port)) is given, the sim is run
+        on the TransientWorkerServers at those addresses, instead of on
+        local processes (see TransientRemotePool); numprocesses is then
+        ignored.
+
+        tilt is the optional (intervaltilt, arrivaltilt) pair for
+        importance sampling in transientsim, for more precise tail wait
+        percentiles.
+
+        Till the first update completes, approximate stats (from
+        fluid_waits) are used for fee estimation; see get_feestats.
+        '''
         self.mempool = mempool
         self.txonline = txonline
         self.poolsonline = poolsonline
         self.update_period = update_period
+        self.min_refresh = min_refresh
         self.miniters = miniters
         self.maxiters = maxiters
         self.numprocesses = numprocesses
+        self.stoppingrule = stoppingrule
+        self.antithetic = antithetic
+        self.control = control
+        self.seed = getrandbits(32) if crn else None
+        self.warmstart = warmstart
+        self.warmstart_halflife = warmstart_halflife
+        self.dense = dense
+        self.remoteworkers = remoteworkers
+        self.tilt = tilt
 
         self.stats = None
+        # The approximate TransientStats, when there are no sim stats
+        self.approxstats = None
+        # (pools version, tx source version, Capacity)
+        self._capcache = None
+        # The _RunInputs of the last update (or the one in progress)
+        self._lastinputs = None
+        # The (pools, tx_source, mempoolstate) of the last completed update
+        self._lastresources = None
+        # The _PriorRun of the last update, for warm starts
+        self._prior = None
+        self._numwarmstarts = 0
+        self._laststart = None
+        self._trigger = threading.Event()
+        # The stop flag of the update in progress
+        self._runflag = threading.Event()
+        # Started on the first update, and closed when the thread stops
+        # (or restarts after an error).
+        self._workerpool = None
         super(TransientOnline, self).__init__()
 
     @StoppableThread.auto_restart(60)
     def run(self):
         logger.info("Starting transient online sim.")
-        while not self.is_stopped():
-            try:
-                self.update()
-            except StopIteration:
-                pass
-            self.sleep_till_next()
+        try:
+            while not self.is_stopped():
+                try:
+                    self.update()
+                except StopIteration:
+                    pass
+                self.sleep_till_next()
+        finally:
+            if self._workerpool is not None:
+                self._workerpool.close()
+                self._workerpool = None
         logger.info("Stopped transient online sim.")
         # Ensures that Prediction.update_predictions doesn't get outdated
         # values, if this thread has bugged out
         self.stats = None
+        self.approxstats = None
 
-    def sleep_till_next(self):
-        '''Sleep till the next update.'''
+    def get_feestats(self):
+        '''Get the TransientStats for fee estimation.
+
+        These are the sim stats, or if there are none yet, the approximate
+        stats (or None if neither is available).
+        '''
         stats = self.stats
-        if stats is not None:
-            time_till_next = max(
-                stats.timestamp + self.update_period - time(), 0)
-            self.sleep(time_till_next)
+        return stats if stats is not None else self.approxstats
+
+    def get_lastresources(self):
+        '''Get the (pools, tx_source, mempoolstate) of the last update.
+
+        That is, the resources from which the current stats were
+        computed, or None if no update has completed.
+        '''
+        return self._lastresources
+
+    def sleep_till_next(self):
+        '''Sleep till the next update.
+
+        That is, till triggered, but no sooner than min_refresh, and no
+        later than update_period, after the start of the last update.
+        '''
+        laststart = self._laststart
+        if laststart is None:
+            return
+        self.sleep(max(laststart + self.min_refresh - time(), 0))
+        self._trigger.wait(max(laststart + self.update_period - time(), 0))
+
+    def notify_block(self):
+        '''Trigger an update for a new block.
+
+        The update in progress, if any, is stale, so it's cancelled.
+        '''
+        logger.debug("Transient update triggered: new block.")
+        self._trigger.set()
+        self._runflag.set()
+
+    def notify_update(self):
+        '''Trigger an update if the inputs have materially changed.
+
+        This is called on updates of the mempool, and of the estimates.
+        The change is relative to the inputs of the last update, or of
+        the one in progress (which is not cancelled).
+        '''
+        inputs = self._lastinputs
+        pools = self.poolsonline.get_pools()
+        tx_source = self.txonline.get_txsource()
+        mempoolstate = self.mempool.state
+        if inputs is None or not (mempoolstate and pools and tx_source):
+            return
+        change = inputs.get_change(pools, mempoolstate,
+                                   tx_source.get_byteratefn())
+        if change is not None:
+            logger.debug("Transient update triggered: {}.".format(change))
+            self._trigger.set()
+
+    def stop(self):
+        super(TransientOnline, self).stop()
+        self._runflag.set()
+        self._trigger.set()
 
     def update(self):
+        self._trigger.clear()
+        runflag = self._runflag = threading.Event()
+        if self.is_stopped():
+            raise StopIteration
+        self._laststart = time()
         pools, tx_source, mempoolstate = self._get_resources()
-        sim = Simul(pools, tx_source)
+        sim = Simul(pools, tx_source,
+                    cap=self._get_capacity(pools, tx_source))
         feepoints = self.calc_feepoints(sim, mempoolstate)
-        init_entries = remove_lowfee(mempoolstate.entries, sim.stablefeerate)
-
+        if feepoints is None:
+            feepoints = get_default_feepoints(sim)
+        # The entries are packed once, for the sim processes (which remove
+        # the low fee txs from the arrays) and for the inputs below.
+        init_entries = tuple(pack_entries(mempoolstate.entries)[1:])
+        mempool_sizefn = calc_sizefn(*init_entries[:2])
+        prior = self._get_warmstart(sim, pools, mempoolstate, mempool_sizefn)
+        self._prior = None
+        miniters, maxiters, seed = self.miniters, self.maxiters, self.seed
+        if prior is not None:
+            feepoints = prior.feepoints
+            sim.stablefeerate = prior.stablefeerate
+            weight = 0.5**((time() - prior.timestamp) /
+                           self.warmstart_halflife)
+            prior.accumulator.downweight(weight)
+            numreused = prior.accumulator.numiters
+            miniters = max(self.miniters - numreused,
+                           int(self.miniters*WARMSTART_MIN_REFRESH))
+            maxiters = max(self.maxiters - numreused,
+                           int(self.maxiters*WARMSTART_MIN_REFRESH))
+            if seed is not None:
+                # Otherwise the prior realizations would just be repeated.
+                self._numwarmstarts += 1
+                seed = hash((seed, self._numwarmstarts))
+            logger.debug("Warm start with {} iters (weight {:.3f}).".format(
+                numreused, weight))
+        else:
+            numreused = 0
+            self._numwarmstarts = 0
+        if self.stats is None:
+            approxstats = TransientStats()
+            approxstats.record_approx(*fluid_waits(
+                sim, mempool_sizefn, feepoints))
+            self.approxstats = approxstats
+        inputs = _RunInputs(sim, pools, mempoolstate, mempool_sizefn,
+                            feepoints)
+        self._lastinputs = inputs
+        densefeerates = None
+        if self.dense and prior is None:
+            densefeerates = get_dense_feerates(sim, init_entries)
+
+        if self._workerpool is None:
+            if self.remoteworkers:
+                self._workerpool = TransientRemotePool(self.remoteworkers)
+            else:
+                self._workerpool = TransientWorkerPool(self.numprocesses)
         stats = TransientStats()
-        feepoints, waittimes = transientsim(
+        feepoints, waitstats = transientsim(
             sim,
             feepoints=feepoints,
             init_entries=init_entries,
-            miniters=self.miniters,
-            maxiters=self.maxiters,
+            miniters=miniters,
+            maxiters=maxiters,
             maxtime=self.update_period,
-            numprocesses=self.numprocesses,
-            stopflag=self.get_stop_object())
-        stats.record_waittimes(feepoints, waittimes)
+            stopflag=runflag,
+            workerpool=self._workerpool,
+            accumulate=True,
+            stoppingrule=self.stoppingrule,
+            antithetic=self.antithetic,
+            control=self.control,
+            seed=seed,
+            prior=prior.accumulator if prior is not None else None,
+            densefeerates=densefeerates,
+            tilt=self.tilt,
+            minfeerate=sim.stablefeerate)
+        stats.record_waitstats(feepoints, waitstats,
+                               stoppingrule=self.stoppingrule)
+        stats.numreused = numreused
+        if self.warmstart:
+            self._prior = _PriorRun(inputs, waitstats, stats.timestamp)
 
         logger.debug("Finished transient sim in %.2fs and %d iterations" %
                      (stats.timespent, stats.numiters))
@@ -84,6 +303,8 @@ class TransientOnline(StoppableThread):
             logger.warning("Transient sim took %.2fs to do %d iters." %
                            (stats.timespent, stats.numiters))
         self.stats = stats
+        self.approxstats = None
+        self._lastresources = (pools, tx_source, mempoolstate)
 
     def _get_resources(self):
         """Get transient sim resources.
@@ -100,9 +321,54 @@ class TransientOnline(StoppableThread):
             # Resources aren't available due to some error elsewhere,
             # so get rid of stats to avoid giving stale stats to others.
             self.stats = None
+            self.approxstats = None
             self.sleep(5)
         raise StopIteration
 
+    def _get_capacity(self, pools, tx_source):
+        """Get the Capacity of pools and tx_source.
+
+        The estimates published by the online estimators (see their
+        _publish methods) are version stamped, and immutable: the
+        estimators' updates work on a copy. So if neither version has
+        changed since the last update, the last Capacity (with its memoized
+        stablefeerate etc.) is reused; if only the tx source has changed,
+        the pools' hashrate and capacity functions are reused.
+        """
+        poolsversion = getattr(pools, 'version', None)
+        txversion = getattr(tx_source, 'version', None)
+        cached = self._capcache
+        if (cached is None or poolsversion is None or
+                cached[0] != poolsversion):
+            cap = Capacity(pools, tx_source)
+        elif txversion is None or cached[1] != txversion:
+            cap = cached[2].for_txsource(tx_source)
+        else:
+            cap = cached[2]
+        self._capcache = (poolsversion, txversion, cap)
+        return cap
+
+    def _get_warmstart(self, sim, pools, mempoolstate, mempool_sizefn):
+        """Get the _PriorRun to warm start from, if any.
+
+        The previous run is reused unless the inputs have materially
+        changed (see _RunInputs.get_change), or sim.stablefeerate has gone
+        up. Returns None otherwise. mempool_sizefn is that of mempoolstate.
+        """
+        prior = self._prior
+        if not self.warmstart or prior is None:
+            return None
+        if sim.stablefeerate > prior.stablefeerate:
+            logger.debug("No warm start: stablefeerate has gone up.")
+            return None
+        change = prior.inputs.get_change(pools, mempoolstate,
+                                         sim.cap.txbyteratefn,
+                                         mempool_sizefn=mempool_sizefn)
+        if change is not None:
+            logger.debug("No warm start: {}.".format(change))
+            return None
+        return prior
+
     def calc_feepoints(self, sim, mempoolstate,
                        max_wait_delta=60, min_num_pts=20):
         """Get feepoints at which to evaluate wait times.
@@ -173,7 +439,15 @@ class TransientOnline(StoppableThread):
             'params': {
                 'miniters': self.miniters,
                 'maxiters': self.maxiters,
-                'update_period': self.update_period
+                'update_period': self.update_period,
+                'min_refresh': self.min_refresh,
+                'target_rse': getattr(self.stoppingrule, 'rse', None),
+                'antithetic': self.antithetic,
+                'control': self.control,
+                'crn': self.seed is not None,
+                'warmstart': self.warmstart,
+                'dense': self.dense,
+                'tilt': self.tilt,
             }
         }
         tstats = self.stats
@@ -182,47 +456,177 @@ class TransientOnline(StoppableThread):
         return stats
 
 
+class _RunInputs(object):
+    """The inputs of a TransientOnline update, for detecting changes."""
+
+    def __init__(self, sim, pools, mempoolstate, mempool_sizefn, feepoints):
+        self.height = mempoolstate.height
+        self.poolsversion = getattr(pools, 'version', None)
+        self.stablefeerate = sim.stablefeerate
+        self.feepoints = feepoints
+        self.maxblocksize = sim.cap.capfn[-1][1]*EXPECTED_BLOCK_INTERVAL
+        self.mempoolsizes = mempool_sizefn.evaluate(feepoints)
+        self.txbyterates = sim.cap.txbyteratefn.evaluate(feepoints)
+
+    def get_change(self, pools, mempoolstate, txbyteratefn,
+                   mempool_sizefn=None):
+        """Describe the material change in the inputs, if any.
+
+        That is, if there's been a new block, the pools estimate has
+        changed, or the mempool size or tx byterate at any feepoint has
+        changed by more than MAX_MEMPOOL_DELTA or MAX_TXRATE_DELTA. Pools
+        without a version are always taken to have changed. Returns None
+        if there's no material change.
+
+        mempool_sizefn is that of mempoolstate, if it's already been
+        computed.
+        """
+        if mempoolstate.height != self.height:
+            return "new block"
+        poolsversion = getattr(pools, 'version', None)
+        if poolsversion is None or poolsversion != self.poolsversion:
+            return "pools have changed"
+        if mempool_sizefn is None:
+            mempool_sizefn = mempoolstate.get_sizefn()
+        mempoolsizes = mempool_sizefn.evaluate(self.feepoints)
+        txbyterates = txbyteratefn.evaluate(self.feepoints)
+        mempool_delta = max([
+            abs(size - prevsize) / self.maxblocksize
+            for size, prevsize in zip(mempoolsizes, self.mempoolsizes)])
+        txrate_delta = max([
+            abs(rate - prevrate) / prevrate if prevrate else
+            float("inf") if rate else 0
+            for rate, prevrate in zip(txbyterates, self.txbyterates)])
+        if mempool_delta > MAX_MEMPOOL_DELTA or (
+                txrate_delta > MAX_TXRATE_DELTA):
+            return "mempool delta {:.3f}, txrate delta {:.3f}".format(
+                mempool_delta, txrate_delta)
+        return None
+
+
+class _PriorRun(object):
+    """The inputs and wait times of a TransientOnline update."""
+
+    def __init__(self, inputs, accumulator, timestamp):
+        self.inputs = inputs
+        self.feepoints = inputs.feepoints
+        self.stablefeerate = inputs.stablefeerate
+        self.accumulator = accumulator
+        self.timestamp = timestamp
+
+
 class TransientStats(object):
 
+    # Whether the stats are from fluid_waits, rather than the sim. It's a
+    # class attribute so that it's also set on stats pickled without it.
+    approximate = False
+    # The effective sample size (see WaitAccumulator.get_ess); likewise a
+    # class attribute for older pickles.
+    ess = None
+
     def __init__(self):
         self.timestamp = time()
+        # The number of iterations reused from the previous update
+        self.numreused = 0
+        self.densewaits = self.densestds = None
 
     def record_waittimes(self, feepoints, waittimes):
+        """Record the stats of the wait time samples at each feepoint."""
+        waitstats = WaitAccumulator(len(feepoints))
+        waitstats.add_waittimes(waittimes)
+        self.record_waitstats(feepoints, waitstats)
+
+    def record_waitstats(self, feepoints, waitstats, stoppingrule=None):
+        """Record the stats of a WaitAccumulator.
+
+        This can be done at any time, e.g. with a partial accumulator.
+        The achieved precision is recorded too: for the mean wait, and
+        also for the percentiles targeted by stoppingrule, if given.
+        """
         self.timespent = time() - self.timestamp
-        self.numiters = len(waittimes[0])
+        self.numiters = waitstats.numiters
+        self.ess = waitstats.get_ess()
 
-        expectedwaits = []
-        expectedwaits_err = []
+        expectedwaits, expectedwaits_err = waitstats.get_expectedwaits()
+        self.waitstds = []
         waitpercentiles = []
-        for waitsample in waittimes:
-            waitdata = DataSample(waitsample)
+        for waitdata in waitstats.samples:
             waitdata.calc_stats()
-            expectedwaits.append(waitdata.mean)
-            expectedwaits_err.append(waitdata.std / sqrt(self.numiters))
+            self.waitstds.append(waitdata.std)
             waitpercentiles.append(
                 [waitdata.get_percentile(p) for p in WAIT_PERCENTILE_PTS])
+        # The variance of the plain sample mean over that of the estimate
+        self.variance_reduction = waitstats.get_reduction_factors()
 
         self.feepoints = feepoints
         self.expectedwaits = WaitFn(feepoints, expectedwaits,
                                     expectedwaits_err)
         self.waitmatrix = [WaitFn(feepoints, w) for w in zip(*waitpercentiles)]
 
+        if waitstats.densestats is not None:
+            densefeerates, densewaits, self.densestds = waitstats.get_dense()
+            n = waitstats.densestats[0]
+            self.densewaits = WaitFn(
+                densefeerates, densewaits,
+                [std / sqrt(n) for std in self.densestds])
+
+        percentiles = stoppingrule.percentiles if stoppingrule else []
+        precision = get_precision(waitstats, percentiles)
+        self.precision = {
+            'target_rse': stoppingrule.rse if stoppingrule else None,
+            'percentiles': percentiles,
+            'expectedwaits_rse': precision['expectedwaits'],
+            'percentiles_rse': precision['percentiles'],
+        }
+
+    def record_approx(self, feepoints, expectedwaits, waitstds):
+        """Record the approximate waits from fluid_waits.
+
+        There are no wait percentiles, so these stats don't predict.
+        """
+        self.approximate = True
+        self.timespent = time() - self.timestamp
+        self.numiters = 0
+        self.feepoints = feepoints
+        self.expectedwaits = WaitFn(feepoints, expectedwaits)
+        self.waitstds = waitstds
+        self.waitmatrix = []
+        self.variance_reduction = None
+        self.precision = None
+
     def predict(self, feerate, currtime):
         '''Predict the wait time of a transaction with specified feerate.
 
-        entry is a mementry object. Returns a TxPrediction object.
+        entry is a mementry object. Returns a TxPrediction object, or None
+        if the feerate is too low, or the stats are approximate.
         '''
-        if feerate < self.feepoints[0]:
+        if self.approximate or feerate < self.feepoints[0]:
             return None
         waitpercentiles = [w(feerate) for w in self.waitmatrix]
         return TxPrediction(waitpercentiles, feerate, currtime)
 
     def estimatefee(self, waitminutes):
+        if self.densewaits is not None:
+            return self._estimatefee_dense(waitminutes)
         feerate = self.expectedwaits.inv(waitminutes*60)
         if feerate is not None:
             feerate = int(ceil(feerate))
         return feerate
 
+    def _estimatefee_dense(self, waitminutes):
+        """The lowest of the dense feerates with expected wait at most
+        waitminutes.
+
+        The expected wait only changes at the dense feerates, so there's
+        no need to interpolate.
+        """
+        waits = self.densewaits.waits
+        # The waits are non-increasing.
+        idx = len(waits) - bisect_right(waits[::-1], waitminutes*60)
+        if idx == len(waits):
+            return None
+        return int(self.densewaits.feerates[idx])
+
     def decidefee(self, txsize, ten_minute_cost, waitcostfn="quadratic"):
         """Compute the optimal transaction fee.
 
@@ -243,16 +647,25 @@ class TransientStats(object):
 
         In the future perhaps this method could be generalized to accept
         arbitrary wait cost functions.
+
+        The dense expected waits are used, if available.
         """
+        if self.densewaits is not None:
+            feerates = self.densewaits.feerates
+            expectedwaits = self.densewaits.waits
+            waitstds = self.densestds
+        else:
+            feerates = self.feepoints
+            expectedwaits = self.expectedwaits.waits
+            waitstds = self.waitstds
         if waitcostfn == "linear":
             waitcosts = [meanwait / 600 * ten_minute_cost
-                         for meanwait in self.expectedwaits.waits]
+                         for meanwait in expectedwaits]
         elif waitcostfn == "quadratic":
             # mean squared wait = var(wait) + mean(wait)^2
             meansq_waits = [
-                self.numiters*stderr**2 + meanwait**2
-                for stderr, meanwait in
-                zip(self.expectedwaits.errors, self.expectedwaits.waits)]
+                std**2 + meanwait**2
+                for std, meanwait in zip(waitstds, expectedwaits)]
             waitcosts = [meansq_wait / 360000 * ten_minute_cost
                          for meansq_wait in meansq_waits]
         else:
@@ -260,13 +673,13 @@ class TransientStats(object):
                              "'linear' or 'quadratic'.")
 
         C_array = [feerate*txsize/1000 + waitcost
-                   for feerate, waitcost in zip(self.feepoints, waitcosts)]
+                   for feerate, waitcost in zip(feerates, waitcosts)]
 
         bestidx = min(enumerate(C_array), key=lambda c: c[1])[0]
         C = C_array[bestidx]
-        best_feerate = self.feepoints[bestidx]
+        best_feerate = feerates[bestidx]
         best_fee = int(ceil(best_feerate * txsize / 1000))
-        expectedwait = self.expectedwaits.waits[bestidx]
+        expectedwait = expectedwaits[bestidx]
         return best_fee, expectedwait, C
 
     def get_stats(self):
@@ -278,27 +691,15 @@ class TransientStats(object):
             'expectedwaits': self.expectedwaits.waits,
             'expectedwaits_stderr': self.expectedwaits.errors,
             'waitmatrix': [w.waits for w in self.waitmatrix],
+            'precision': self.precision,
+            'variance_reduction': self.variance_reduction,
+            'numreused': self.numreused,
+            'ess': self.ess,
+            'approximate': self.approximate,
         }
+        if self.densewaits is not None:
+            stats['densewaits'] = {
+                'feerates': self.densewaits.feerates,
+                'expectedwaits': self.densewaits.waits,
+            }
         return stats
-
-
-def remove_lowfee(entries, feethresh):
-    """Remove all low fee (< feethresh) transactions and their dependants.
-    """
-    # Build a dependency map
-    depmap = defaultdict(list)
-    for txid, entry in entries.items():
-        for dep in entry.depends:
-            depmap[dep].append(txid)
-    removed = set()
-    for txid, entry in entries.items():
-        if entry.feerate < feethresh:
-            removelist = [txid]
-            while removelist:
-                txid_remove = removelist.pop()
-                if txid_remove in removed:
-                    continue
-                removed.add(txid_remove)
-                removelist.extend(depmap[txid_remove])
-    return {txid: entry for txid, entry in entries.items()
-            if txid not in removed}
@@ -20,7 +20,10 @@ class TxRateOnlineEstimator(object):
             raise ValueError("Specified halflife does not"
                              "match with init txsource.")
         self.halflife = halflife
-        self.tx_estimator = txsource_init
+        self.version = 0
+        self.tx_estimator = None
+        if txsource_init is not None:
+            self._publish(txsource_init)
 
     def update(self, state):
         tx_estimator = copy(self.tx_estimator)
@@ -29,6 +32,12 @@ class TxRateOnlineEstimator(object):
             tx_estimator.start(state.height)
         tx_estimator.update(state)
         logger.debug(repr(tx_estimator))
+        self._publish(tx_estimator)
+
+    def _publish(self, tx_estimator):
+        '''Publish a new estimate, stamped with the next version.'''
+        self.version += 1
+        tx_estimator.version = self.version
         self.tx_estimator = tx_estimator
 
     def get_txsource(self):
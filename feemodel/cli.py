@@ -36,6 +36,29 @@ def start(mempool, txsource):
     main(mempool_only=mempool, txsourcefile=txsource)
 
 
+@cli.command()
+@click.option('--host', type=click.STRING, default='localhost',
+              help="Address to listen on.")
+@click.option('--port', type=click.INT, default=None,
+              help="Port to listen on (default trans_worker_port).")
+def transientworker(host, port):
+    '''Start a remote transient sim worker.
+
+    The simulation app uses it if listed in trans_remote_workers. Tasks
+    are unpickled, so only listen on addresses reachable from trusted
+    hosts.
+    '''
+    from feemodel.app.main import configure_logger, logfile
+    from feemodel.config import config
+    from feemodel.simul.remote import serve_transient
+    if port is None:
+        port = config.getint("app", "trans_worker_port")
+    configure_logger()
+    click.echo("Starting transient worker on {}:{}; logging to {}".format(
+        host, port, logfile))
+    serve_transient(host, port)
+
+
 @cli.command()
 def pools():
     '''Get mining pool statistics.'''
@@ -101,11 +124,68 @@ def transient():
     table = [
         ("Timestamp", time.ctime(stats['timestamp'])),
         ("Timespent", stats['timespent']),
-        ("Num iters", stats['numiters'])
+        ("Num iters", stats['numiters']),
+        ("Effective sample size", stats.get('ess'))
     ]
     click.echo(tabulate(table))
 
 
+@cli.command()
+@click.option('--nowait', is_flag=True,
+              help="Don't wait for the scenarios to complete.")
+@click.argument('overrides', type=click.STRING, nargs=-1, required=True)
+def scenario(overrides, nowait):
+    '''Get transient sim stats under what-if scenarios.
+
+    Each of OVERRIDES is PARAM=VALUE[,VALUE...], where PARAM is
+    maxblocksize (of every pool), hashrate (factor on the total hashrate),
+    txrate (factor on the tx rate) or mempoolheight (use the mempool at
+    that block height). A scenario is run for every combination of
+    values, against the current estimates. The results are cached, so
+    repeating a query is instant.
+    '''
+    import time
+    from tabulate import tabulate
+
+    grid = {}
+    for override in overrides:
+        try:
+            param, values = override.split("=", 1)
+            grid[param] = map(float, values.split(","))
+        except ValueError:
+            click.echo("Bad override: {}".format(override))
+            return
+    try:
+        scenarios = client.submit_scenarios(grid)
+        while not nowait and any(
+                [s['status'] == 'pending' for s in scenarios]):
+            time.sleep(2)
+            scenarios = [client.get_scenario(s['key']) for s in scenarios]
+    except Exception as e:
+        click.echo(repr(e))
+        return
+
+    for s in scenarios:
+        click.echo("")
+        click.echo(", ".join([
+            "{}={}".format(param, value)
+            for param, value in sorted(s['overrides'].items())]))
+        click.echo("===========================")
+        if s['status'] == 'pending':
+            click.echo("Pending.")
+        elif s['status'] == 'error':
+            click.echo("Error: {}".format(s['error']))
+        else:
+            stats = s['stats']
+            table = zip(
+                stats['feepoints'],
+                stats['expectedwaits'],
+                stats['expectedwaits_stderr'])
+            click.echo(tabulate(
+                table, headers=['Feerate', 'Wait (s)', 'Std Error (s)']))
+            click.echo("Num iters: {}".format(stats['numiters']))
+
+
 @cli.command()
 def prediction():
     '''Get prediction scores.'''
@@ -192,6 +272,9 @@ def estimatefee(waittime):
         click.echo(repr(e))
         return
     click.echo(res['feerate'])
+    if res.get('approximate'):
+        click.echo("Approximate: the simulation has not completed yet.",
+                   err=True)
 
 
 @cli.command()
@@ -43,6 +43,13 @@ class PoolsEstimatorNP(SimPoolsNP):
         self._calc_estimates()
         logger.info("Finished NP pool estimation.")
 
+    def __copy__(self):
+        # blockstats is updated in place, so it must not be shared.
+        cpy = self.__class__.__new__(self.__class__)
+        cpy.__dict__.update(self.__dict__)
+        cpy.blockstats = self.blockstats.copy()
+        return cpy
+
     def update(self, memblock, is_init=False, windowsize=None):
         sfr_stats = memblock.calc_stranding_feerate()
         if sfr_stats is None or sfr_stats['altbiasref'] == MINRELAYTXFEE:
@@ -1,22 +1,37 @@
 from __future__ import division
 
 import logging
-from random import sample
 from time import time
 from math import log
-from feemodel.util import round_random
 from feemodel.txmempool import MemBlock, MEMBLOCK_DBFILE
-from feemodel.simul.txsources import SimTxSource, SimTx
+from feemodel.simul.txsources import SimTxSource, SimTx, TxHistogram
 
 DEFAULT_MAXSAMPLESIZE = 10000
+# In ExpEstimator, histogram bins whose weight has decayed below this are
+# thinned out.
+MIN_WEIGHT = 0.5
 logger = logging.getLogger(__name__)
 
 
 class ExpEstimator(SimTxSource):
-    '''Continuous rate estimation with an exponential smoother.'''
+    '''Continuous rate estimation with an exponential smoother.
+
+    The txs are kept in a (feerate, size) histogram, with weights which
+    decay exponentially with age. Bins whose weight falls below MIN_WEIGHT
+    are randomly thinned out (keeping the weights unbiased), which bounds
+    the number of bins.
+
+    Decaying the weights is O(1) (see TxHistogram.rescale); the thinning is
+    done whenever the number of bins has doubled, so it's amortized O(1)
+    per tx. txsample and weights are the histogram's bins and weights.
+    '''
 
     BATCH_INTERVAL = 30
 
+    # For compatibility with instances pickled before the histogram.
+    _hist = None
+    _thinsize = 0
+
     def __init__(self, halflife):
         '''Specify the halflife of the exponential decay, in seconds.'''
         self.halflife = halflife
@@ -26,9 +41,12 @@ class ExpEstimator(SimTxSource):
     def _reset_params(self):
         '''Reset the params; at init and upon (re)starting estimation.'''
         self.txsample = []
+        self.weights = []
         self.txrate = None
         self.totaltime = 0
         self.prevstate = None
+        self._hist = TxHistogram()
+        self._thinsize = 0
 
     def start(self, blockheight, stopflag=None, dbfile=MEMBLOCK_DBFILE):
         self._reset_params()
@@ -101,20 +119,40 @@ class ExpEstimator(SimTxSource):
         interval is the time in seconds since the last update.
         '''
         self.totaltime += interval
-        num_old_to_keep = round_random(
-            len(self.txsample)*self._alpha**interval)
-        self.txsample = sample(self.txsample, num_old_to_keep) + new_txs
+        if self._hist is None:
+            self._hist = TxHistogram()
+            self._hist.add(self.txsample, self.weights)
+        self._hist.rescale(self._alpha**interval)
+        self._hist.add(new_txs)
+        if len(self._hist) > 2*self._thinsize:
+            self._hist.thin(MIN_WEIGHT)
+            self._thinsize = len(self._hist)
         if not is_init:
             self._calc_txrate()
 
     def _calc_txrate(self):
         '''Calculate the tx rate (arrivals per second).'''
+        self.txsample, self.weights = self._hist.get_sample()
         if self.totaltime > 0:
-            self.txrate = len(self.txsample) * log(self._alpha) / (
-                self._alpha**self.totaltime - 1)
+            self.txrate = self._hist.get_totalweight() * log(
+                self._alpha) / (self._alpha**self.totaltime - 1)
+
+    def __copy__(self):
+        # The histogram is updated in place, so it must not be shared.
+        cpy = self.__class__.__new__(self.__class__)
+        cpy.__dict__.update(self.__dict__)
+        if self._hist is not None:
+            cpy._hist = self._hist.copy()
+        return cpy
 
 
 class RectEstimator(SimTxSource):
+    '''Rate estimation over a range of blocks, with uniform weighting.
+
+    The txs are kept in a (feerate, size) histogram with counts. If the
+    number of bins exceeds maxsamplesize, the low-count bins are randomly
+    thinned out, keeping the counts unbiased.
+    '''
 
     def __init__(self, maxsamplesize=DEFAULT_MAXSAMPLESIZE):
         self.maxsamplesize = maxsamplesize
@@ -122,9 +160,11 @@ class RectEstimator(SimTxSource):
 
     def _reset_params(self):
         self.txsample = []
+        self.weights = []
         self.txrate = None
         self.totaltime = 0.
         self.totaltxs = 0
+        self._hist = TxHistogram()
 
     def start(self, blockrangetuple, stopflag=None, dbfile=MEMBLOCK_DBFILE):
         logger.info("Starting TxRate estimation "
@@ -140,6 +180,7 @@ class RectEstimator(SimTxSource):
             prevblock = block
         if self.totaltxs < 0 or self.totaltime <= 0:
             raise ValueError("Insufficient number of blocks.")
+        self.txsample, self.weights = self._hist.get_sample()
         self.txrate = self.totaltxs / self.totaltime
         logger.info("Finished TxRate estimation in %.2f seconds." %
                     (time()-starttime))
@@ -154,22 +195,11 @@ class RectEstimator(SimTxSource):
             return
         newtxs = [SimTx(entry.feerate, entry.size)
                   for entry in blockdelta.entries.values()]
-        newtotaltxs = self.totaltxs + len(newtxs)
-        if newtotaltxs:
-            oldprop = self.totaltxs / newtotaltxs
-            combinedsize = min(self.maxsamplesize,
-                               len(self.txsample)+len(newtxs))
-            numkeepold = round_random(oldprop*combinedsize)
-            if numkeepold > len(self.txsample):
-                numkeepold = len(self.txsample)
-                numaddnew = round_random(numkeepold/oldprop*(1-oldprop))
-            elif combinedsize - numkeepold > len(newtxs):
-                numaddnew = len(newtxs)
-                numkeepold = round_random(numaddnew/(1-oldprop)*oldprop)
-            else:
-                numaddnew = combinedsize - numkeepold
-            self.txsample = (sample(self.txsample, numkeepold) +
-                             sample(newtxs, numaddnew))
-
-        self.totaltxs = newtotaltxs
+        self._hist.add(newtxs)
+        if len(self._hist) > self.maxsamplesize:
+            # At most maxsamplesize/2 bins have count >= the threshold,
+            # and the expected number of the rest kept is <= that too.
+            self._hist.thin(
+                2*self._hist.get_totalweight() / self.maxsamplesize)
+        self.totaltxs += len(newtxs)
         self.totaltime += blockdelta.time
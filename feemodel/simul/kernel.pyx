@@ -0,0 +1,273 @@
+from __future__ import division
+
+from libc.math cimport log, exp
+from cpython.array cimport array, clone, resize
+from cpython.mem cimport (PyMem_Malloc as malloc,
+                          PyMem_Free as free)
+from feemodel.simul.simul cimport Simul
+
+cdef array DOUBLE_ARRAY_TEMPLATE = array('d')
+
+
+cdef class TransientKernel:
+    """Compiled equivalent of transient.transientsim_core.
+
+    Runs the transient simulation and records, for each realization, the
+    wait time (i.e. the time taken until the first block with sfr <=
+    feepoint) at each feepoint. The blocks are drawn with Simul._next_block,
+    so that the per-block work is done entirely in C, and we only return
+    to Python once per chunk of realizations.
+
+    Two variance reduction options are available. If antithetic is True,
+    the realizations are in antithetic pairs (see BlockSource): the block
+    intervals of every odd-numbered realization are the antithetic
+    variates of those of the one before. If control is True, a control
+    variate is also recorded with each wait time: the sim time minus the
+    number of blocks times the mean block interval. By Wald's identity,
+    its expectation is zero.
+
+    If densefeerates is given, the wait times at each of them are also
+    recorded, in the same pass, but only as running sums of the waits and
+    squared waits (see pop_dense), since there are typically many of them.
+    A realization then ends when both feepoints and densefeerates have
+    all cleared.
+
+    If tilt, a pair (intervaltilt, arrivaltilt) of factors >= 1, is given,
+    the realizations are importance sampled, tilted towards congestion:
+    the mean block interval is scaled by intervaltilt, and the tx arrival
+    rate by arrivaltilt. Each row then ends with the likelihood ratio of
+    the realization, i.e. its weight, and the dense stats are of the
+    weighted waits, so that the plain means of the weighted waits are
+    unbiased. The control variate uses the tilted mean block interval, so
+    it still has zero expectation.
+
+    init_entries can be packed entries, as in Simul.run. The initial txs
+    with feerate < minfeerate are excluded, along with their dependants
+    (see SimMempool.from_arrays).
+    """
+
+    cdef:
+        readonly Simul sim
+        readonly list feepoints
+        double *_feepoints
+        double *_waittimes
+        double *_controls
+        int numfeepoints
+        int min_sfr_idx
+        readonly bint antithetic, control
+        double _meaninterval
+        long _numblocks
+        # Importance sampling
+        readonly object tilt
+        readonly bint weighted
+        double _logintervaltilt, _logarrivaltilt
+        # The log likelihood ratio per unit of sim time
+        double _timelogratio
+        # Dense wait times
+        readonly bint dense
+        double *_densefeerates
+        double *_densewaits
+        int numdense
+        int min_dense_idx
+        # (count, sums, sums of squares) of the dense wait times
+        array _densestats
+
+    def __cinit__(self, *args, **kwargs):
+        self._feepoints = NULL
+        self._waittimes = NULL
+        self._controls = NULL
+        self._densefeerates = NULL
+        self._densewaits = NULL
+
+    def __init__(self, Simul sim not None, feepoints, init_entries=None,
+                 bint antithetic=False, bint control=False,
+                 densefeerates=None, tilt=None, minfeerate=0):
+        """feepoints (and densefeerates) should be sorted, and >=
+        sim.stablefeerate.
+        """
+        if not feepoints:
+            raise ValueError("No feepoints.")
+        if min(feepoints) < sim.stablefeerate:
+            raise ValueError("All feepoints must be >= sim.stablefeerate.")
+        self.dense = bool(densefeerates)
+        if self.dense:
+            if min(densefeerates) < sim.stablefeerate:
+                raise ValueError(
+                    "All densefeerates must be >= sim.stablefeerate.")
+            self.numdense = len(densefeerates)
+            self._densefeerates = <double *>malloc(
+                self.numdense*sizeof(double))
+            self._densewaits = <double *>malloc(self.numdense*sizeof(double))
+            for i in range(self.numdense):
+                self._densefeerates[i] = densefeerates[i]
+                self._densewaits[i] = 0
+            self.min_dense_idx = self.numdense
+            self._densestats = clone(DOUBLE_ARRAY_TEMPLATE,
+                                     1 + 2*self.numdense, zero=True)
+        else:
+            self.numdense = 0
+            self.min_dense_idx = 0
+        self.sim = sim
+        self.feepoints = list(feepoints)
+        self.numfeepoints = len(feepoints)
+        self._feepoints = <double *>malloc(self.numfeepoints*sizeof(double))
+        self._waittimes = <double *>malloc(self.numfeepoints*sizeof(double))
+        self._controls = <double *>malloc(self.numfeepoints*sizeof(double))
+        for i in range(self.numfeepoints):
+            self._feepoints[i] = feepoints[i]
+            self._waittimes[i] = 0
+            self._controls[i] = 0
+        self.min_sfr_idx = self.numfeepoints
+        self.antithetic = antithetic
+        self.control = control
+        self._numblocks = 0
+        self.weighted = tilt is not None
+        if self.weighted:
+            intervaltilt, arrivaltilt = tilt
+            if intervaltilt < 1 or arrivaltilt < 1:
+                raise ValueError("The tilt factors must be >= 1.")
+            self.tilt = (intervaltilt, arrivaltilt)
+        else:
+            intervaltilt = arrivaltilt = 1
+        sim._start(init_entries, True, minfeerate)
+        sim._blocksource.set_tilt(intervaltilt)
+        sim._blocksource.antithetic = antithetic
+        sim._emitter.tilt = arrivaltilt
+        sim._emitter.numemitted = 0
+        blockrate = sim._blocksource.blockrate
+        self._meaninterval = intervaltilt / blockrate
+        self._logintervaltilt = log(intervaltilt)
+        self._logarrivaltilt = log(arrivaltilt)
+        self._timelogratio = (sim._emitter.txrate*(arrivaltilt - 1) -
+                              blockrate*(1 - 1/intervaltilt))
+
+    def run(self, int numiters, stopflag=None):
+        """Run numiters realizations of the wait time vector.
+
+        Returns an array('d') of the wait times, of length
+        numiters*len(self.feepoints), in row-major order (i.e. each
+        consecutive len(self.feepoints) elements is one realization).
+
+        If stopflag is set, we return early; in that case the array holds
+        only the completed realizations.
+
+        If self.control is True, each row also has the control variates
+        after the wait times, i.e. it is of length 2*len(self.feepoints);
+        if self.weighted, each row also has the weight, at the end.
+        """
+        cdef:
+            int n, rowsize, numdone, sfr_idx, i
+            int numdense, dense_idx
+            double simtime, sfr, control, wait, weight
+            array waitbuffer
+            double *waits
+            double *densestats = NULL
+
+        n = self.numfeepoints
+        rowsize = 2*n if self.control else n
+        if self.weighted:
+            rowsize += 1
+        waitbuffer = clone(DOUBLE_ARRAY_TEMPLATE, numiters*rowsize,
+                           zero=False)
+        numdense = self.numdense
+        if self.dense:
+            densestats = self._densestats.data.as_doubles
+        waits = waitbuffer.data.as_doubles
+        numdone = 0
+        if numiters <= 0:
+            return waitbuffer
+        while True:
+            sfr = self.sim._next_block()
+            self._numblocks += 1
+            sfr_idx = bisect_left(self._feepoints, n, sfr)
+            if sfr_idx < self.min_sfr_idx:
+                simtime = self.sim.simtime
+                control = simtime - self._numblocks*self._meaninterval
+                for i in range(sfr_idx, self.min_sfr_idx):
+                    self._waittimes[i] = simtime
+                    self._controls[i] = control
+                self.min_sfr_idx = sfr_idx
+            if self.dense:
+                dense_idx = bisect_left(self._densefeerates, numdense, sfr)
+                if dense_idx < self.min_dense_idx:
+                    simtime = self.sim.simtime
+                    for i in range(dense_idx, self.min_dense_idx):
+                        self._densewaits[i] = simtime
+                    self.min_dense_idx = dense_idx
+            if self.min_sfr_idx == 0 and self.min_dense_idx == 0:
+                for i in range(n):
+                    waits[numdone*rowsize + i] = self._waittimes[i]
+                if self.control:
+                    for i in range(n):
+                        waits[numdone*rowsize + n + i] = self._controls[i]
+                weight = 1
+                if self.weighted:
+                    weight = self._get_weight()
+                    waits[numdone*rowsize + rowsize - 1] = weight
+                if self.dense:
+                    densestats[0] += 1
+                    for i in range(numdense):
+                        wait = self._densewaits[i]
+                        densestats[1 + i] += weight*wait
+                        densestats[1 + numdense + i] += weight*wait*wait
+                    self.min_dense_idx = numdense
+                numdone += 1
+                self.min_sfr_idx = n
+                self.sim.simtime = 0
+                self.sim.mempool.reset()
+                self._numblocks = 0
+                if self.antithetic:
+                    self.sim._blocksource.next_realization()
+                if numdone == numiters:
+                    break
+                if stopflag is not None and stopflag.is_set():
+                    resize(waitbuffer, numdone*rowsize)
+                    break
+        return waitbuffer
+
+    cdef double _get_weight(self):
+        """The likelihood ratio of the realization just completed.
+
+        That is, of its block intervals and tx arrival counts under the
+        untilted distribution, over that under the tilted one; it only
+        depends on the number of blocks, the total sim time and the number
+        of txs emitted.
+        """
+        cdef long numtxs = self.sim._emitter.numemitted
+        self.sim._emitter.numemitted = 0
+        return exp(self.sim.simtime*self._timelogratio +
+                   self._numblocks*self._logintervaltilt -
+                   numtxs*self._logarrivaltilt)
+
+    def pop_dense(self):
+        """Get the dense wait time stats, and reset them.
+
+        Returns an array('d') of the number of realizations (since the
+        last pop), followed by the sums of the wait times at each of
+        densefeerates, and then the sums of the squared wait times.
+        """
+        if not self.dense:
+            raise ValueError("No densefeerates.")
+        densestats = self._densestats
+        self._densestats = clone(DOUBLE_ARRAY_TEMPLATE, 1 + 2*self.numdense,
+                                 zero=True)
+        return densestats
+
+    def __dealloc__(self):
+        free(self._feepoints)
+        free(self._waittimes)
+        free(self._controls)
+        free(self._densefeerates)
+        free(self._densewaits)
+
+
+cdef inline int bisect_left(double *a, int n, double x):
+    """Like bisect.bisect_left, for a sorted C array a of length n."""
+    cdef int lo = 0, hi = n, mid
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if a[mid] < x:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
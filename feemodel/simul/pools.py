@@ -1,7 +1,5 @@
 from __future__ import division
 
-from random import random, expovariate, choice
-from bisect import bisect_left
 from itertools import groupby
 from operator import attrgetter
 from collections import Counter
@@ -9,9 +7,11 @@ from collections import Counter
 from tabulate import tabulate
 
 from feemodel.util import cumsum_gen, StepFunction
-from feemodel.simul.simul import SimBlock
+from feemodel.simul.simul import SimBlock, BlockSource
 
 DEFAULT_BLOCKRATE = 1./600
+# Number of blocks drawn at a time from the BlockSource in blockgen.
+BLOCKGEN_CHUNKSIZE = 100
 
 
 class SimPool(object):
@@ -55,15 +55,25 @@ class SimPoolsNP(object):
             if not getattr(self, attr):
                 raise ValueError("{} must be nonzero.".format(attr))
 
-    def blockgen(self):
-        self.check()
+    def blockgen(self, variates=None):
+        '''Generate (simblock, blockinterval) tuples.
+
+        The random draws are taken from variates (a Variates instance), or
+        a new one if None.
+        '''
+        blocksource = self.get_blocksource(variates)
         while True:
-            blockinterval = expovariate(self.blockrate)
-            maxblocksize = choice(self.maxblocksizes)
-            minfeerate = choice(self.minfeerates)
-            pool = SimPool(1, maxblocksize, minfeerate)
-            simblock = SimBlock('', pool)
-            yield simblock, blockinterval
+            for _dum, blockinterval, maxblocksize, minfeerate in (
+                    blocksource.sample(BLOCKGEN_CHUNKSIZE)):
+                pool = SimPool(1, maxblocksize, minfeerate)
+                simblock = SimBlock('', pool)
+                yield simblock, blockinterval
+
+    def get_blocksource(self, variates=None):
+        '''Get the compiled BlockSource equivalent of blockgen.'''
+        self.check()
+        return BlockSource(self.blockrate, self.maxblocksizes,
+                           self.minfeerates, variates=variates)
 
     def get_capacityfn(self):
         def cap_mapfn(y):
@@ -123,20 +133,36 @@ class SimPools(object):
                     for pool in self.pools.values()]):
             raise ValueError("Zero pools capacity.")
 
-    def blockgen(self):
-        self.check()
-        poolitems = sorted(self.pools.items(),
-                           key=lambda item: item[1].hashrate)
-        cumhashrates = list(
-            cumsum_gen([pool.hashrate for name, pool in poolitems]))
-        totalhashrate = cumhashrates[-1]
-        prop_table = map(lambda hashrate: hashrate/totalhashrate,
-                         cumhashrates)
+    def blockgen(self, variates=None):
+        '''Generate (simblock, blockinterval) tuples.
+
+        simblock.poolidx is the index of the pool name in sorted(self.pools).
+        The random draws are taken from variates (a Variates instance), or
+        a new one if None.
+        '''
+        blocksource = self.get_blocksource(variates)
+        poolitems = sorted(self.pools.items())
         while True:
-            poolidx = bisect_left(prop_table, random())
-            simblock = SimBlock(*poolitems[poolidx])
-            blockinterval = expovariate(self.blockrate)
-            yield simblock, blockinterval
+            for poolidx, blockinterval, _dum0, _dum1 in (
+                    blocksource.sample(BLOCKGEN_CHUNKSIZE)):
+                poolname, pool = poolitems[poolidx]
+                simblock = SimBlock(poolname, pool, poolidx)
+                yield simblock, blockinterval
+
+    def get_blocksource(self, variates=None):
+        '''Get the compiled BlockSource equivalent of blockgen.
+
+        The pool index of each block is the index of the pool name in
+        sorted(self.pools).
+        '''
+        self.check()
+        pools = [pool for name, pool in sorted(self.pools.items())]
+        return BlockSource(
+            self.blockrate,
+            [pool.maxblocksize for pool in pools],
+            [pool.minfeerate for pool in pools],
+            weights=[pool.hashrate for pool in pools],
+            variates=variates)
 
     def get_capacityfn(self):
         """Get cumulative capacity as function of minfeerate."""
@@ -0,0 +1,388 @@
+"""Transient sim on remote hosts.
+
+TransientWorkerServer runs on each worker host, and a TransientRemotePool
+on the coordinator is used in place of a TransientWorkerPool, i.e. as the
+workerpool arg of transientsim.
+
+The protocol is a sequence of messages over TCP, each of which is a
+header (the message type, and the payload length) followed by the
+payload:
+
+    TASK      coordinator -> worker: the pickled tuple (simversion,
+              simpickle, feepoints, kernelargs, seed, packed entries);
+              simpickle is None if the worker has the Simul of that
+              version from a previous task.
+    RESULT    worker -> coordinator: a chunk of packed wait vectors, as
+              sent by run_kernel.
+    DENSE     worker -> coordinator: as RESULT, but the chunk also has the
+              dense stats (see TransientKernel.pop_dense); the payload is
+              the length of the wait vectors, the wait vectors, and then
+              the dense stats.
+    STOP      coordinator -> worker: stop the task.
+    COMPLETE  worker -> coordinator: the task is stopped, and all its
+              results sent.
+
+The tasks are pickled, so the server must only accept connections from
+trusted hosts. The arrays are sent in native byte order, so the workers
+should be on the same platform as the coordinator.
+"""
+from __future__ import division
+
+import random
+import socket
+import struct
+import select
+import logging
+import threading
+import SocketServer
+import Queue
+import cPickle as pickle
+from array import array
+
+from feemodel.util import logexceptions
+from feemodel.simul.transient import (
+    PROCESS_COMPLETE, collect_waittimes, make_kernel, run_kernel,
+    get_siminputs, siminputs_changed, _get_kernelargs, _get_packed,
+    _process_seed)
+
+MSG_TASK = 1
+MSG_RESULT = 2
+MSG_DENSE = 3
+MSG_STOP = 4
+MSG_COMPLETE = 5
+HEADER = struct.Struct('!BI')
+DENSE_HEADER = struct.Struct('!I')
+# A worker is taken to be lost if nothing is received from it for this
+# many seconds during a task, or if it can't be connected to within this
+# time.
+WORKER_TIMEOUT = 60
+DEFAULT_WORKER_PORT = 8351
+
+logger = logging.getLogger(__name__)
+
+
+class TransientRemotePool(object):
+    """Transient sim workers on remote hosts.
+
+    Used like a TransientWorkerPool, with each worker being a connection
+    to a TransientWorkerServer at one of addresses, a list of (host,
+    port). An address can be listed more than once, for more than one
+    worker on that host; the server handles each connection in a separate
+    process.
+
+    The connections are kept across calls, and the Simul is only sent to a
+    worker if it has changed since the last call (as in
+    TransientWorkerPool). Worker i (i.e. at addresses[i]) is seeded with
+    _process_seed(seed, i), so the seeds are the same across calls as long
+    as the addresses are.
+
+    A worker which is lost during a call (it disconnects, or times out) is
+    dropped, and the results it has already sent are kept; the call only
+    fails if there are no workers at all. Lost workers are reconnected to
+    on the next call.
+    """
+
+    def __init__(self, addresses, timeout=WORKER_TIMEOUT):
+        self.addresses = list(addresses)
+        self.timeout = timeout
+        self._conns = [None]*len(self.addresses)
+        # The Simul version last sent to each worker
+        self._sentversions = [None]*len(self.addresses)
+        self._siminputs = None
+        self._simversion = 0
+        self._closed = False
+
+    def run(self, sim, feepoints, init_entries, miniters=1000,
+            maxiters=10000, maxtime=60, stopflag=None, accumulator=None,
+            stoppingrule=None, seed=None, minfeerate=0):
+        """Run the transient sim.
+
+        As in TransientWorkerPool.run. Raises ValueError if there are no
+        workers which can be connected to.
+        """
+        if self._closed:
+            raise ValueError("Worker pool is closed.")
+        siminputs = get_siminputs(sim)
+        if siminputs_changed(siminputs, self._siminputs):
+            self._siminputs = siminputs
+            self._simversion += 1
+        simpickle = pickle.dumps(sim, 2)
+        entries = [a.tostring() for a in _get_packed(init_entries)]
+        kernelargs = _get_kernelargs(accumulator, minfeerate)
+
+        workers = []
+        for idx in range(len(self.addresses)):
+            if self._conns[idx] is None and not self._connect(idx):
+                continue
+            task = (self._simversion,
+                    simpickle
+                    if self._sentversions[idx] != self._simversion else None,
+                    list(feepoints), kernelargs, _process_seed(seed, idx),
+                    entries)
+            try:
+                send_msg(self._conns[idx], MSG_TASK,
+                         pickle.dumps(task, 2))
+            except socket.error as e:
+                self._drop(idx, e)
+                continue
+            self._sentversions[idx] = self._simversion
+            workers.append(idx)
+        if not workers:
+            raise ValueError("No remote workers available.")
+        logger.debug("Sent tasks to {} remote workers.".format(len(workers)))
+
+        resultqueue = Queue.Queue()
+        readers = [
+            threading.Thread(target=self._read_results,
+                             args=(idx, resultqueue))
+            for idx in workers]
+        for reader in readers:
+            reader.daemon = True
+            reader.start()
+        waittimes = collect_waittimes(
+            resultqueue, len(feepoints), len(workers),
+            _RemoteStopFlag(self, workers), miniters, maxiters, maxtime,
+            stopflag, accumulator=accumulator, stoppingrule=stoppingrule)
+        for reader in readers:
+            reader.join()
+        if stopflag and stopflag.is_set():
+            raise StopIteration
+        return waittimes
+
+    def close(self):
+        """Close the connections; the workers then exit."""
+        for idx, conn in enumerate(self._conns):
+            if conn is not None:
+                conn.close()
+                self._conns[idx] = None
+        self._closed = True
+        logger.debug("Remote worker pool closed.")
+
+    def _connect(self, idx):
+        """Connect to worker idx; returns whether it succeeded."""
+        try:
+            conn = socket.create_connection(self.addresses[idx],
+                                            timeout=self.timeout)
+        except socket.error as e:
+            logger.warning("Unable to connect to remote worker {}: {}".
+                           format(self.addresses[idx], e))
+            return False
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._conns[idx] = conn
+        self._sentversions[idx] = None
+        return True
+
+    def _drop(self, idx, e):
+        logger.warning("Lost remote worker {}: {}".format(
+            self.addresses[idx], repr(e)))
+        conn = self._conns[idx]
+        self._conns[idx] = None
+        if conn is not None:
+            conn.close()
+
+    @logexceptions
+    def _read_results(self, idx, resultqueue):
+        """Put the chunks from worker idx in resultqueue.
+
+        PROCESS_COMPLETE is put once the worker has completed, or is lost.
+        """
+        conn = self._conns[idx]
+        try:
+            while True:
+                msgtype, payload = recv_msg(conn)
+                if msgtype == MSG_COMPLETE:
+                    break
+                resultqueue.put(decode_chunk(msgtype, payload))
+        except (socket.error, EOFError, ValueError) as e:
+            self._drop(idx, e)
+        finally:
+            resultqueue.put(PROCESS_COMPLETE)
+
+
+class _RemoteStopFlag(object):
+    """The process stop flag for collect_waittimes.
+
+    Setting it sends STOP to the workers.
+    """
+
+    def __init__(self, pool, workers):
+        self.pool = pool
+        self.workers = workers
+
+    def set(self):
+        for idx in self.workers:
+            conn = self.pool._conns[idx]
+            if conn is None:
+                continue
+            try:
+                send_msg(conn, MSG_STOP)
+            except socket.error:
+                # The reader will find that it's lost.
+                pass
+
+
+class TransientWorkerServer(SocketServer.ForkingMixIn,
+                            SocketServer.TCPServer):
+    """Runs transient sim tasks for TransientRemotePools.
+
+    Each connection is handled in a forked process, which runs the tasks
+    sent on it till the connection is closed.
+    """
+
+    allow_reuse_address = True
+
+    def __init__(self, address):
+        SocketServer.TCPServer.__init__(self, address, _WorkerHandler)
+
+
+class _WorkerHandler(SocketServer.BaseRequestHandler):
+
+    @logexceptions
+    def handle(self):
+        # The random state is inherited from the server process, so that
+        # the workers would otherwise be the same without a seed.
+        random.seed()
+        conn = self.request
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        logger.info("Remote worker connected: {}".format(self.client_address))
+        try:
+            self._run_tasks(conn)
+        except (EOFError, socket.error) as e:
+            logger.warning("Remote worker connection lost: {}".format(
+                repr(e)))
+        logger.info("Remote worker disconnected: {}".format(
+            self.client_address))
+
+    def _run_tasks(self, conn):
+        """Run the tasks sent on conn till it's closed."""
+        sim = None
+        simversion = None
+        while True:
+            try:
+                msgtype, payload = recv_msg(conn)
+            except EOFError:
+                break
+            if msgtype == MSG_STOP:
+                # For a task which was already stopped.
+                continue
+            if msgtype != MSG_TASK:
+                raise ValueError("Unexpected message type {}.".
+                                 format(msgtype))
+            (newsimversion, simpickle, feepoints, kernelargs, seed,
+             entries) = pickle.loads(payload)
+            if newsimversion != simversion:
+                sim = pickle.loads(simpickle)
+                simversion = newsimversion
+            arrays = []
+            for s in entries:
+                a = array('L')
+                a.fromstring(s)
+                arrays.append(a)
+            init_entries = tuple(arrays)
+            kernel = make_kernel(sim, feepoints, init_entries, seed=seed,
+                                 **kernelargs)
+            run_kernel(kernel, _ResultChannel(conn), _StopChannel(conn))
+
+
+class _ResultChannel(object):
+    """The result queue for run_kernel, on a worker."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def put(self, chunk):
+        if chunk is PROCESS_COMPLETE:
+            send_msg(self.conn, MSG_COMPLETE)
+        else:
+            send_msg(self.conn, *encode_chunk(chunk))
+
+
+class _StopChannel(object):
+    """The stop flag for run_kernel, on a worker.
+
+    It's set once STOP is received.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+        self._isset = False
+
+    def is_set(self):
+        if not self._isset:
+            readable, dum, dum = select.select([self.conn], [], [], 0)
+            if readable:
+                msgtype, payload = recv_msg(self.conn)
+                if msgtype != MSG_STOP:
+                    raise ValueError("Unexpected message type {}.".
+                                     format(msgtype))
+                self._isset = True
+        return self._isset
+
+
+def serve_transient(host='localhost', port=DEFAULT_WORKER_PORT):
+    """Run a TransientWorkerServer till interrupted."""
+    server = TransientWorkerServer((host, port))
+    logger.info("Transient worker server listening on {}.".format(
+        server.server_address))
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+def parse_addresses(s, defaultport=DEFAULT_WORKER_PORT):
+    """Parse a comma separated list of host[:port] into (host, port)s."""
+    addresses = []
+    for address in s.split(","):
+        address = address.strip()
+        if not address:
+            continue
+        if ":" in address:
+            host, port = address.rsplit(":", 1)
+            addresses.append((host, int(port)))
+        else:
+            addresses.append((address, defaultport))
+    return addresses
+
+
+def encode_chunk(chunk):
+    """The message type and payload of a chunk from run_kernel."""
+    if isinstance(chunk, tuple):
+        waits, dense = chunk
+        return MSG_DENSE, DENSE_HEADER.pack(len(waits)) + waits + dense
+    return MSG_RESULT, chunk
+
+
+def decode_chunk(msgtype, payload):
+    """Inverse of encode_chunk."""
+    if msgtype == MSG_RESULT:
+        return payload
+    if msgtype == MSG_DENSE:
+        numbytes, = DENSE_HEADER.unpack_from(payload)
+        start = DENSE_HEADER.size
+        return (payload[start:start+numbytes], payload[start+numbytes:])
+    raise ValueError("Unexpected message type {}.".format(msgtype))
+
+
+def send_msg(conn, msgtype, payload=''):
+    conn.sendall(HEADER.pack(msgtype, len(payload)) + payload)
+
+
+def recv_msg(conn):
+    """Receive a message; returns (msgtype, payload).
+
+    Raises EOFError if the connection is closed.
+    """
+    msgtype, length = HEADER.unpack(_recv_exact(conn, HEADER.size))
+    return msgtype, _recv_exact(conn, length)
+
+
+def _recv_exact(conn, numbytes):
+    parts = []
+    while numbytes:
+        part = conn.recv(min(numbytes, 1 << 20))
+        if not part:
+            raise EOFError("Connection closed.")
+        parts.append(part)
+        numbytes -= len(part)
+    return ''.join(parts)
@@ -1,4 +1,6 @@
+from cpython.array cimport array
 from feemodel.simul.txsources cimport *
+from feemodel.simul.variates cimport Variates
 
 
 cdef struct OrphanTx:
@@ -21,31 +23,179 @@ cdef struct OrphanTxArray:
     int size
 
 
+cdef struct PackageEntry:
+    # Ancestor score of a package tx, as of the version of its ancestor
+    # stats at the time of insertion into the package heap.
+    double score
+    int pkgindex
+    int version
+
+
+cdef struct PackageHeap:
+    PackageEntry *entries
+    int size
+    int maxsize
+
+
+cdef struct BlockStruct:
+    # Drawn by BlockSource
+    double interval
+    unsigned long maxblocksize
+    unsigned long minfeerate
+    int poolidx
+    # Set by SimMempool._process_block
+    unsigned long size
+    unsigned long sfr
+    bint is_sizeltd
+
+
+cdef class BlockSource:
+
+    cdef:
+        readonly double blockrate
+        readonly Variates variates
+        int numpools, numminfeerates
+        unsigned long *maxblocksizes
+        unsigned long *minfeerates
+        # Alias tables over the pools; NULL if the maxblocksize and
+        # minfeerate are drawn independently.
+        double *_prob
+        int *_alias
+        BlockStruct *blocks
+        int blockidx
+        # Antithetic mode: the intervals of alternate realizations are
+        # recorded, and replayed antithetically.
+        public bint antithetic
+        bint _replaying
+        double *_record
+        int _recordsize, _recordcap, _replayidx
+        # The factor on the mean block interval (for importance sampling)
+        readonly double tilt
+
+    cdef void next_block(self, BlockStruct *block)
+    cdef void _refill(self)
+    cdef void _record_interval(self, double interval)
+    cpdef next_realization(self)
+    cpdef set_tilt(self, double tilt)
+
+
 cdef class Simul:
 
     cdef:
-        readonly object cap, pools, txsource
-        public object simtime, stablefeerate
+        readonly object cap, pools, txsource, maxmempoolsize, cpfp
+        public object stablefeerate
+        public double simtime
         public SimMempool mempool
+        readonly Variates variates
         object tx_emitter
+        # The compiled per-block path (see _next_block)
+        TxEmitter _emitter
+        BlockSource _blocksource
+        BlockStruct _block
+        TxPtrArray _blocktxs
+        double _stablefeerate
+
+    cdef int _start(self, init_entries, bint compiled,
+                    unsigned long minfeerate=*) except -1
+    cdef int _step(self, BlockStruct *block, TxPtrArray *blocktxs) except -1
+    cdef double _next_block(self) except -1
 
 
 cdef class SimMempool:
 
     cdef:
         TxArray init_array
-        TxPtrArray txqueue, txqueue_bak, rejected_entries
+        TxPtrArray txqueue, rejected_entries
         OrphanTxPtrArray *orphanmap
         OrphanTxArray orphans
         list txidlist
-
-    cdef void _process_block(self, SimBlock simblock)
+        # Keeps the memory of the emitted txs alive
+        object _txsample_array
+        # The initial txs of the queue, by decreasing feerate. Those
+        # removed (mined or evicted) are flagged in rootremoved, and
+        # rootqueue[roothead:roottail] spans the rest.
+        int numroots
+        TxPtrArray rootqueue
+        char *rootremoved
+        int roothead, roottail
+        # The total size of the txs in the queue (the unremoved roots, and
+        # txqueue), kept up to date for the size limit.
+        unsigned long long queuebytes, initqueuebytes
+        # Stack for the eviction of orphans along with their ancestors
+        int *evictstack
+        # Undo log for SimMempool.reset
+        int *removedroots
+        int numremovedroots
+        OrphanTxPtrArray touchedorphans
+        # Mempool size limit
+        readonly unsigned long long maxsize
+        readonly double minrelayfeerate
+        # Package (CPFP) mode. The package txs are the initial txs which
+        # have dependencies or dependants, and occupy init_array from
+        # pkgstart onwards. Package arrays are indexed by init_array index
+        # minus pkgstart.
+        readonly bint cpfp
+        int pkgstart, numpkgtxs
+        int *ancestors
+        int *ancestors_start
+        int *descendants
+        int *descendants_start
+        double *ancfees
+        double *ancfees_init
+        unsigned long long *ancsizes
+        unsigned long long *ancsizes_init
+        int *versions
+        char *mined
+        int *dirty
+        char *isdirty
+        PackageHeap pkgheap, pkgheap_init, rejected_pkgs
+
+    cdef void _process_block(self, BlockStruct *block, TxPtrArray *blocktxs)
+    cdef void _process_block_packages(self, BlockStruct *block,
+                                      TxPtrArray *blocktxs)
+    cdef int _init_arrays(self, array feerates, array sizes,
+                          array depends_start, array depends, txids,
+                          unsigned long minfeerate) except -1
+    cdef int _init_packages(self, list parents) except -1
+    cdef void _mine_package(self, int pkgindex, TxPtrArray *blocktxs)
+    cdef bint _peek_package(self)
+    cdef void _rebuild_pkgheap(self)
+    cdef void _reset_packages(self)
     cdef void _process_deps(self, TxStruct *newtx)
     cdef void _reset_orphan_deps(self)
+    cdef int _next_root(self, int rootidx)
+    cdef void _remove_root(self, int rootidx)
+    cdef void _evict_descendants(self, TxStruct *tx)
+    cdef void _decay_minrelayfeerate(self, double interval)
+    cdef void _trim(self)
 
 
 cdef class SimBlock:
 
     cdef:
-        public object poolname, pool, size, sfr, is_sizeltd, _txs
+        public object poolname, pool, poolidx, size, sfr, is_sizeltd, _txs
         TxPtrArray _txptrs
+        SimMempool _mempool
+        SimTxArray _txarray
+
+
+cdef class SimTxArray:
+
+    cdef:
+        TxArray txs
+        Py_ssize_t shape[2]
+        Py_ssize_t strides[2]
+
+
+cdef class SimTrace:
+
+    cdef:
+        double *rows
+        readonly int size
+        int maxsize
+        int numexports
+        Py_ssize_t shape[2]
+        Py_ssize_t strides[2]
+
+    cdef int _append(self, double interval, double sfr, double size,
+                     double poolidx) except -1
@@ -1,10 +1,16 @@
 from __future__ import division
 
 from libc.limits cimport ULONG_MAX
+from libc.stdlib cimport qsort
+from libc.math cimport log, expm1
+from libc.string cimport memcpy, memset
+from cpython.buffer cimport PyBUF_WRITABLE
+from cpython.array cimport array
 from cpython.mem cimport (PyMem_Malloc as malloc,
                           PyMem_Realloc as realloc,
                           PyMem_Free as free)
 from feemodel.simul.txsources cimport *
+from feemodel.simul.variates cimport Variates, init_alias_table
 
 from feemodel.simul.stats import Capacity
 from feemodel.simul.txsources import SimTx
@@ -12,6 +18,18 @@ from feemodel.simul.txsources import SimTx
 UTILIZATION_THRESH = 0.9
 cdef unsigned long MAX_FEERATE = ULONG_MAX - 1
 cdef int MAX_QUEUESIZE = 1000000  # Max num of txs in mempool heap
+DEF OVERALLOCATE = 2
+DEF BLOCKBUFSIZE = 1024
+# Lower bound on unit exponential variates, for their antithetic variates
+# to be finite.
+DEF MIN_EXPONENTIAL = 1e-300
+# OrphanTx.numdeps of an orphan evicted along with an ancestor
+DEF ORPHAN_EVICTED = -1
+
+# Min relay feerate policy of a size limited mempool, following
+# Bitcoin Core's rolling minimum fee (CTxMemPool::GetMinFee).
+INCREMENTAL_RELAY_FEERATE = 1000
+ROLLING_FEE_HALFLIFE = 60*60*12
 
 
 class SimEntry(SimTx):
@@ -29,87 +47,772 @@ class SimEntry(SimTx):
 
 cdef class Simul:
 
-    def __init__(self, pools, txsource):
+    def __init__(self, pools, txsource, maxmempoolsize=0, cpfp=False,
+                 cap=None):
+        '''maxmempoolsize is the mempool size limit in bytes.
+
+        If nonzero, the mempool evicts its lowest feerate txs when it grows
+        beyond this size, and its min relay feerate rises accordingly (see
+        SimMempool). Otherwise the mempool is unlimited.
+
+        If cpfp is True, blocks are assembled by ancestor package feerate
+        instead of individual feerate (see SimMempool).
+
+        cap is an optional precomputed Capacity(pools, txsource), e.g. from
+        a previous Simul with the same pools and txsource.
+
+        Besides run, the simulation can be driven block by block from C
+        (see _next_block, as used by TransientKernel). That requires pools
+        to have a get_blocksource method, and doesn't allocate any Python
+        objects per block.
+        '''
         self.pools = pools
         self.txsource = txsource
-        self.cap = Capacity(pools, txsource)
+        self.maxmempoolsize = maxmempoolsize
+        self.cpfp = cpfp
+        if cap is None:
+            cap = Capacity(pools, txsource)
+        self.cap = cap
         self.stablefeerate = self.cap.calc_stablefeerate(UTILIZATION_THRESH)
         self.mempool = None
         self.tx_emitter = None
         self.simtime = 0.
         # Non-zero capacity is guaranteed by SimPools.check
 
-    def run(self, init_entries=None):
+    def __cinit__(self, *args, **kwargs):
+        self._blocktxs.txs = NULL
+
+    def __reduce__(self):
+        # The run state (mempool etc.) is not pickled. stablefeerate is
+        # kept, since it may have been raised from that of cap.
+        return (Simul, (self.pools, self.txsource, self.maxmempoolsize,
+                        self.cpfp, self.cap), self.stablefeerate)
+
+    def __setstate__(self, stablefeerate):
+        self.stablefeerate = stablefeerate
+
+    def run(self, init_entries=None, SimTrace trace=None):
+        '''Generator of simulated blocks.
+
+        init_entries is a dict of SimEntry, or the tuple of arrays
+        (feerates, sizes, depends_start, depends) of packed entries (see
+        pack_entries), which is faster for a large mempool.
+
+        If trace (a SimTrace) is given, a row of (blockinterval, sfr, size,
+        poolidx) is appended to it for each block.
+        '''
+        cdef:
+            BlockStruct block
+            TxPtrArray blocktxs
+            SimBlock simblock
+        self._start(init_entries, False)
+        for simblock, blockinterval in self.pools.blockgen():
+            block.interval = blockinterval
+            block.maxblocksize = simblock.pool.maxblocksize
+            block.minfeerate = min(simblock.pool.minfeerate, MAX_FEERATE)
+            blocktxs = txptrarray_init(self.mempool.txqueue.size)
+            self._step(&block, &blocktxs)
+            simblock.sfr = max(block.sfr, self.stablefeerate)
+            simblock.is_sizeltd = block.is_sizeltd
+            simblock.size = block.size
+            simblock._txptrs = blocktxs
+            simblock._mempool = self.mempool
+            if trace is not None:
+                trace._append(blockinterval, simblock.sfr, simblock.size,
+                              simblock.poolidx)
+            yield simblock
+
+    cdef int _start(self, init_entries, bint compiled,
+                    unsigned long minfeerate=0) except -1:
+        '''Set up the mempool and tx source for a new run.
+
+        If compiled, the blocks are to be drawn by _next_block, from the
+        pools' BlockSource. The initial txs with feerate < minfeerate are
+        excluded, along with their dependants.
+        '''
         if init_entries is None:
             init_entries = {}
-        self.mempool = SimMempool(init_entries)
-        self.tx_emitter = self.txsource.get_emitter(self.mempool, feeratethresh=self.stablefeerate)
+        if isinstance(init_entries, tuple):
+            self.mempool = SimMempool.from_arrays(
+                *init_entries, minfeerate=minfeerate,
+                maxsize=self.maxmempoolsize, cpfp=self.cpfp)
+        else:
+            self.mempool = SimMempool(
+                init_entries, maxsize=self.maxmempoolsize, cpfp=self.cpfp,
+                minfeerate=minfeerate)
+        self.variates = Variates()
+        self.tx_emitter = self.txsource.get_emitter(
+            self.mempool, feeratethresh=self.stablefeerate,
+            variates=self.variates)
+        if isinstance(self.tx_emitter, TxEmitter):
+            self._emitter = self.tx_emitter
+        else:
+            self._emitter = None
         self.simtime = 0.
-        for simblock, blockinterval in self.pools.blockgen():
-            self.simtime += blockinterval
-            # Add new txs from the tx source to the queue
-            self.tx_emitter(blockinterval)
+        self._stablefeerate = self.stablefeerate
+        if compiled:
+            # With its own Variates, as in pools.blockgen, so that the
+            # blocks are the same as those of run for the same random seed.
+            self._blocksource = self.pools.get_blocksource()
+            if self._blocktxs.txs is NULL:
+                self._blocktxs = txptrarray_init(1024)
+        return 0
+
+    cdef int _step(self, BlockStruct *block, TxPtrArray *blocktxs) except -1:
+        '''Advance the simulation by one block.
+
+        The txs arriving in block.interval are emitted, and then the block
+        is processed (setting block.size, block.sfr etc., and putting the
+        block txs in blocktxs).
+        '''
+        self.simtime += block.interval
+        if self.mempool.maxsize:
+            self.mempool._decay_minrelayfeerate(block.interval)
+        # Add new txs from the tx source to the queue
+        if self._emitter is not None:
+            self._emitter.emit(block.interval)
+        else:
+            self.tx_emitter(block.interval)
+        if self.mempool.maxsize:
+            # Memory is bounded by the eviction of low feerate txs.
+            self.mempool._trim()
+        elif self.mempool.txqueue.size > MAX_QUEUESIZE:
             # This is a fail-safe in the event of instability.
-            # This should not normally happen, because of stablefeerate calcs.
-            if self.mempool.txqueue.size > MAX_QUEUESIZE:
-                raise ValueError("Max queuesize reached.")
-            self.mempool._process_block(simblock)
-            simblock.sfr = max(simblock.sfr, self.stablefeerate)
-            yield simblock
+            # This should not normally happen, because of stablefeerate
+            # calcs.
+            raise ValueError("Max queuesize reached.")
+        self.mempool._process_block(block, blocktxs)
+        return 0
+
+    cdef double _next_block(self) except -1:
+        '''Compiled equivalent of one iteration of run.
+
+        Returns the sfr of the block. The block itself is in self._block,
+        and its txs in self._blocktxs (which is reused).
+        '''
+        self._blocksource.next_block(&self._block)
+        self._step(&self._block, &self._blocktxs)
+        if self._block.sfr > self._stablefeerate:
+            return self._block.sfr
+        return self._stablefeerate
 
+    def __dealloc__(self):
+        if self._blocktxs.txs is not NULL:
+            txptrarray_deinit(self._blocktxs)
+
+
+cdef class BlockSource:
+    '''Compiled source of (pool, block interval) draws.
+
+    The block intervals are exponential with rate blockrate. If weights is
+    given, the block is from pool i with probability proportional to
+    weights[i], drawn in O(1) with alias tables, and has maxblocksizes[i]
+    and minfeerates[i]. Otherwise the maxblocksize and minfeerate are drawn
+    independently and uniformly from their lists (as in SimPoolsNP), and
+    the pool index is -1.
+
+    The blocks are drawn in bulk, BLOCKBUFSIZE at a time.
+
+    If antithetic is set, the blocks are drawn in pairs of realizations
+    (as delimited by next_realization): the block intervals of the first
+    are recorded, and the second uses their antithetic variates, i.e. an
+    interval with uniform variate u is replayed with 1-u. Beyond the
+    recorded ones, the intervals are drawn afresh. The pools are always
+    drawn afresh.
+
+    The mean block interval can be scaled by a tilt factor (see set_tilt),
+    i.e. the intervals are drawn with rate blockrate/tilt.
+    '''
+
+    def __cinit__(self, double blockrate, maxblocksizes, minfeerates,
+                  weights=None, Variates variates=None):
+        self.maxblocksizes = NULL
+        self.minfeerates = NULL
+        self._prob = NULL
+        self._alias = NULL
+        self.blocks = NULL
+        self._record = NULL
+        if blockrate <= 0:
+            raise ValueError("blockrate must be positive.")
+        if not maxblocksizes or not minfeerates:
+            raise ValueError("No pools.")
+        if weights is not None and not (
+                len(weights) == len(maxblocksizes) == len(minfeerates)):
+            raise ValueError("Each pool needs a weight, maxblocksize and "
+                             "minfeerate.")
+        if variates is None:
+            variates = Variates()
+        self.blockrate = blockrate
+        self.variates = variates
+        self.numpools = len(maxblocksizes)
+        self.numminfeerates = len(minfeerates)
+        self.maxblocksizes = <unsigned long *>malloc(
+            self.numpools*sizeof(unsigned long))
+        self.minfeerates = <unsigned long *>malloc(
+            self.numminfeerates*sizeof(unsigned long))
+        for i, maxblocksize in enumerate(maxblocksizes):
+            self.maxblocksizes[i] = maxblocksize
+        for i, minfeerate in enumerate(minfeerates):
+            self.minfeerates[i] = min(minfeerate, MAX_FEERATE)
+        if weights is not None:
+            self._prob = <double *>malloc(self.numpools*sizeof(double))
+            self._alias = <int *>malloc(self.numpools*sizeof(int))
+            init_alias_table(weights, self._prob, self._alias)
+        self.blocks = <BlockStruct *>malloc(
+            BLOCKBUFSIZE*sizeof(BlockStruct))
+        self.blockidx = BLOCKBUFSIZE
+        self.antithetic = False
+        self._replaying = False
+        self._recordsize = self._recordcap = self._replayidx = 0
+        self.tilt = 1
+
+    cdef void _refill(self):
+        cdef:
+            int i, idx
+            BlockStruct *block
+        for i in range(BLOCKBUFSIZE):
+            block = &self.blocks[i]
+            block.interval = (self.variates.exponential()*self.tilt /
+                              self.blockrate)
+            if self._prob is NULL:
+                idx = <int>(self.variates.uniform()*self.numpools)
+                block.poolidx = -1
+                block.minfeerate = self.minfeerates[
+                    <int>(self.variates.uniform()*self.numminfeerates)]
+            else:
+                idx = self.variates.alias_index(
+                    self.numpools, self._prob, self._alias)
+                block.poolidx = idx
+                block.minfeerate = self.minfeerates[idx]
+            block.maxblocksize = self.maxblocksizes[idx]
+        self.blockidx = 0
+
+    cdef void next_block(self, BlockStruct *block):
+        '''Set the interval, pool index, maxblocksize and minfeerate of block.
+        '''
+        cdef BlockStruct *nextblock
+        if self.blockidx == BLOCKBUFSIZE:
+            self._refill()
+        nextblock = &self.blocks[self.blockidx]
+        self.blockidx += 1
+        block.interval = nextblock.interval
+        block.poolidx = nextblock.poolidx
+        block.maxblocksize = nextblock.maxblocksize
+        block.minfeerate = nextblock.minfeerate
+        if self.antithetic:
+            if not self._replaying:
+                self._record_interval(block.interval)
+            elif self._replayidx < self._recordsize:
+                block.interval = antithetic_exponential(
+                    self._record[self._replayidx]*self.blockrate/self.tilt
+                ) * self.tilt / self.blockrate
+                self._replayidx += 1
+
+    cdef void _record_interval(self, double interval):
+        cdef double *newrecord
+        if self._recordsize == self._recordcap:
+            newrecord = <double *>realloc(
+                self._record,
+                (2*self._recordcap + BLOCKBUFSIZE)*sizeof(double))
+            if newrecord is NULL:
+                # Out of memory: the rest are drawn afresh on replay.
+                return
+            self._record = newrecord
+            self._recordcap = 2*self._recordcap + BLOCKBUFSIZE
+        self._record[self._recordsize] = interval
+        self._recordsize += 1
+
+    cpdef next_realization(self):
+        '''Mark the start of a new realization (for antithetic mode).'''
+        if self._replaying:
+            self._recordsize = 0
+        self._replaying = not self._replaying
+        self._replayidx = 0
+
+    cpdef set_tilt(self, double tilt):
+        '''Set the factor on the mean block interval.
+
+        The blocks already drawn into the buffer are discarded, and so is
+        the antithetic record.
+        '''
+        if tilt <= 0:
+            raise ValueError("tilt must be positive.")
+        self.tilt = tilt
+        self.blockidx = BLOCKBUFSIZE
+        self._recordsize = self._replayidx = 0
+        self._replaying = False
+
+    def sample(self, int n):
+        '''Draw n blocks.
+
+        Returns a list of (poolidx, blockinterval, maxblocksize, minfeerate)
+        tuples. A minfeerate of MAX_FEERATE (i.e. an infinite one) is
+        returned as float("inf").
+        '''
+        cdef:
+            int i
+            BlockStruct block
+        blocks = []
+        for i in range(n):
+            self.next_block(&block)
+            minfeerate = (block.minfeerate if block.minfeerate < MAX_FEERATE
+                          else float("inf"))
+            blocks.append((block.poolidx, block.interval,
+                           block.maxblocksize, minfeerate))
+        return blocks
 
-cdef class SimMempool:
+    def __dealloc__(self):
+        free(self.maxblocksizes)
+        free(self.minfeerates)
+        free(self._prob)
+        free(self._alias)
+        free(self.blocks)
+        free(self._record)
 
-    def __cinit__(self, init_entries):
-        self.init_array = txarray_init(len(init_entries))
-        self.txqueue = txqueue_init(len(init_entries)+1)
-        self.txqueue_bak = txqueue_init(len(init_entries)+1)
-        self.rejected_entries = txptrarray_init(len(init_entries))
 
-        self.orphans.otxs = NULL
-        self.orphanmap = <OrphanTxPtrArray *>malloc(len(init_entries)*sizeof(OrphanTxPtrArray))
-        for i in range(len(init_entries)):
-            self.orphanmap[i].otxptrs = NULL
+cdef inline double antithetic_exponential(double e):
+    '''The antithetic variate of a unit exponential variate e.
 
-    def __init__(self, init_entries):
-        cdef:
-            TxStruct tx
-            OrphanTxPtrArray otxptrarray
-
-        txidmap = {}
-        self.txidlist = [None]*len(init_entries)
-        py_orphans = []
-        for idx, (txid, entry) in enumerate(init_entries.items()):
-            txidmap[txid] = idx
-            self.txidlist[idx] = txid
-            tx.feerate = min(entry.feerate, MAX_FEERATE)
-            tx.size = entry.size
-            txarray_append(&self.init_array, tx)
-            if not entry.depends:
-                txptrarray_append(&self.txqueue, &self.init_array.txs[idx])
-            else:
-                py_orphans.append((idx, entry.depends))
+    If e = -log(1-u) with u uniform, this is -log(u).
+    '''
+    if e < MIN_EXPONENTIAL:
+        e = MIN_EXPONENTIAL
+    return -log(-expm1(-e))
 
-        for idx, depends in py_orphans:
-            if any([dep not in txidmap for dep in depends]):
-                raise ValueError("There are hanging dependencies.")
 
-        self.orphans = otxarray_init(len(py_orphans))
-        py_orphanmap = [[] for i in range(len(init_entries))]
-        for oidx, (idx, depends) in enumerate(py_orphans):
-            depends = map(lambda txid: txidmap[txid], depends)
-            self.orphans.otxs[oidx] = orphantx_init(idx, depends)
-            for depidx in depends:
-                py_orphanmap[depidx].append(oidx)
+cdef class SimMempool:
+    '''The simulated mempool.
+
+    If maxsize (in bytes) is nonzero, the mempool size is limited in the same
+    way as Bitcoin Core's: when the total size of the txs in the queue
+    exceeds maxsize, the lowest feerate txs are evicted, and the min relay
+    feerate rises to the highest evicted feerate plus
+    INCREMENTAL_RELAY_FEERATE. Txs with feerate below the min relay feerate
+    are not accepted. The min relay feerate then decays with a halflife of
+    ROLLING_FEE_HALFLIFE (shorter if the mempool is relatively empty).
+
+    Orphans, i.e. txs with dependencies, are only counted towards the mempool
+    size after being released into the queue. As in Bitcoin Core, evicting
+    a tx also evicts its descendants.
+
+    If cpfp is True, blocks are assembled as by Bitcoin Core's miner: the
+    initial txs which have dependencies or dependants (the package txs) are
+    selected by ancestor score, i.e. the feerate of the tx together with its
+    unmined ancestors, and are mined along with those ancestors. So a low
+    feerate tx can be pulled in by a high feerate child. The ancestor
+    scores are kept in a lazily updated heap: when a tx is mined, the
+    ancestor stats of its descendants are updated and they are pushed anew,
+    and outdated heap entries are discarded when they reach the top. The
+    package txs are held apart from the tx queue, and are not subject to
+    eviction by maxsize.
+
+    The initial txs of the queue (the roots) are also held apart, in
+    rootqueue, which is sorted by feerate once and then never reordered;
+    txqueue is a heap of the txs added since (the emitted txs and the
+    released orphans). Blocks are assembled by merging the two.
+    '''
+
+    def __cinit__(self, *args, **kwargs):
+        self.init_array.txs = NULL
+        self.init_array.size = 0
+        self.txqueue.txs = NULL
+        self.rejected_entries.txs = NULL
+        self.rootqueue.txs = NULL
+        self.rootremoved = NULL
+        self.removedroots = NULL
+        self.evictstack = NULL
+        self.touchedorphans.otxptrs = NULL
+        self.ancestors = NULL
+        self.ancestors_start = NULL
+        self.descendants = NULL
+        self.descendants_start = NULL
+        self.ancfees = NULL
+        self.ancfees_init = NULL
+        self.ancsizes = NULL
+        self.ancsizes_init = NULL
+        self.versions = NULL
+        self.mined = NULL
+        self.dirty = NULL
+        self.isdirty = NULL
+        self.pkgheap.entries = NULL
+        self.pkgheap_init.entries = NULL
+        self.rejected_pkgs.entries = NULL
 
-        for idx, dependants in enumerate(py_orphanmap):
-            otxptrarray = otxptrarray_init(len(dependants))
-            for optridx, oidx in enumerate(dependants):
-                otxptrarray.otxptrs[optridx] = &self.orphans.otxs[oidx]
-            self.orphanmap[idx] = otxptrarray
+        self.orphans.otxs = NULL
+        self.orphans.size = 0
+        self.orphanmap = NULL
+
+    def __init__(self, init_entries, maxsize=0, cpfp=False, minfeerate=0):
+        '''init_entries is a dict of SimEntry, keyed by txid.
+
+        minfeerate is as in from_arrays.
+        '''
+        txids, feerates, sizes, depends_start, depends = pack_entries(
+            init_entries)
+        self.maxsize = maxsize
+        self.minrelayfeerate = 0
+        self.cpfp = cpfp
+        self._init_arrays(feerates, sizes, depends_start, depends, txids,
+                          minfeerate)
+
+    @classmethod
+    def from_arrays(cls, feerates, sizes, depends_start, depends,
+                    txids=None, minfeerate=0, maxsize=0, cpfp=False):
+        '''Make a SimMempool from the packed entries (see pack_entries).
+
+        This skips the per-entry Python objects: apart from the list of
+        txids for get_entries (the entry indices, if txids is None), it's
+        all done on the arrays. The txs with feerate < minfeerate are
+        excluded, along with their dependants.
+        '''
+        cdef SimMempool mempool = cls.__new__(cls)
+        mempool.maxsize = maxsize
+        mempool.minrelayfeerate = 0
+        mempool.cpfp = cpfp
+        mempool._init_arrays(
+            _ulong_array(feerates), _ulong_array(sizes),
+            _ulong_array(depends_start), _ulong_array(depends),
+            txids, minfeerate)
+        return mempool
+
+    cdef int _init_arrays(self, array feerates, array sizes,
+                          array depends_start, array depends, txids,
+                          unsigned long minfeerate) except -1:
+        '''Set up the initial mempool from the packed entries.
+
+        The roots (txs without dependencies) are placed at the front of
+        init_array, followed by the orphans. Of the roots, those with
+        dependants come last, so that the package txs are contiguous. In
+        cpfp mode, the orphans are placed in topological order.
+
+        The entries are first checked, and ordered, in scratch arrays, so
+        that the mempool is only built once nothing can fail.
+        '''
+        cdef:
+            int n, numdepends, numkept, numorphans, i, j, k, pos, dep
+            int oidx, idx, numqueued
+            unsigned long *dstart
+            unsigned long *deps
+            int *children_start = NULL
+            int *children = NULL
+            int *numparents = NULL
+            int *order = NULL
+            int *newindex = NULL
+            char *removed = NULL
+            char *hasdeps = NULL
+            char *haschildren = NULL
+            TxStruct tx
+            OrphanTx *orphan
+
+        n = len(feerates)
+        numdepends = len(depends)
+        if len(sizes) != n or len(depends_start) != n + 1:
+            raise ValueError("Inconsistent entry array lengths.")
+        dstart = depends_start.data.as_ulongs
+        deps = depends.data.as_ulongs
+        if dstart[0] != 0 or dstart[n] != <unsigned long>numdepends:
+            raise ValueError("Inconsistent entry array lengths.")
+        for i in range(n):
+            if dstart[i] > dstart[i+1]:
+                raise ValueError("Inconsistent entry array lengths.")
+        for k in range(numdepends):
+            if deps[k] >= <unsigned long>n:
+                raise ValueError("There are hanging dependencies.")
 
-        # For resetting the mempool to initial state.
-        txptrarray_copy(self.txqueue, &self.txqueue_bak)
+        try:
+            children_start = <int *>malloc((n+1)*sizeof(int))
+            children = <int *>malloc((numdepends+1)*sizeof(int))
+            numparents = <int *>malloc((n+1)*sizeof(int))
+            order = <int *>malloc((n+1)*sizeof(int))
+            newindex = <int *>malloc((n+1)*sizeof(int))
+            removed = <char *>malloc(n+1)
+            hasdeps = <char *>malloc(n+1)
+            haschildren = <char *>malloc(n+1)
+
+            # The dependants of each entry, as children[children_start[i]:
+            # children_start[i+1]], in increasing order.
+            memset(children_start, 0, (n+1)*sizeof(int))
+            for k in range(numdepends):
+                children_start[deps[k]+1] += 1
+            for i in range(n):
+                children_start[i+1] += children_start[i]
+            memcpy(numparents, children_start, n*sizeof(int))
+            for i in range(n):
+                for k in range(dstart[i], dstart[i+1]):
+                    dep = deps[k]
+                    children[numparents[dep]] = i
+                    numparents[dep] += 1
+
+            # Remove the low fee txs and their dependants, using order as
+            # the stack.
+            memset(removed, 0, n)
+            for i in range(n):
+                if feerates.data.as_ulongs[i] >= minfeerate or removed[i]:
+                    continue
+                removed[i] = 1
+                pos = 0
+                order[pos] = i
+                pos += 1
+                while pos:
+                    pos -= 1
+                    idx = order[pos]
+                    for k in range(children_start[idx],
+                                   children_start[idx+1]):
+                        if not removed[children[k]]:
+                            removed[children[k]] = 1
+                            order[pos] = children[k]
+                            pos += 1
+
+            # The dependencies of a kept tx are all kept.
+            numkept = 0
+            for i in range(n):
+                hasdeps[i] = dstart[i+1] > dstart[i]
+                haschildren[i] = 0
+                if removed[i]:
+                    continue
+                numkept += 1
+                for k in range(children_start[i], children_start[i+1]):
+                    if not removed[children[k]]:
+                        haschildren[i] = 1
+                        break
+
+            # order maps the new indices to the entry indices.
+            pos = 0
+            for i in range(n):
+                if not removed[i] and not hasdeps[i] and not haschildren[i]:
+                    order[pos] = i
+                    pos += 1
+            self.pkgstart = pos
+            for i in range(n):
+                if not removed[i] and not hasdeps[i] and haschildren[i]:
+                    order[pos] = i
+                    pos += 1
+            self.numroots = pos
+            numorphans = numkept - self.numroots
+            if not self.cpfp:
+                for i in range(n):
+                    if not removed[i] and hasdeps[i]:
+                        order[pos] = i
+                        pos += 1
+            else:
+                # Kahn's algorithm, with order as the queue. Only the
+                # orphan parents are counted, as the roots come first.
+                for i in range(n):
+                    numparents[i] = 0
+                    if removed[i] or not hasdeps[i]:
+                        continue
+                    for k in range(dstart[i], dstart[i+1]):
+                        if hasdeps[deps[k]]:
+                            numparents[i] += 1
+                    if not numparents[i]:
+                        order[pos] = i
+                        pos += 1
+                j = self.numroots
+                while j < pos:
+                    idx = order[j]
+                    j += 1
+                    for k in range(children_start[idx],
+                                   children_start[idx+1]):
+                        i = children[k]
+                        if removed[i]:
+                            continue
+                        numparents[i] -= 1
+                        if not numparents[i]:
+                            order[pos] = i
+                            pos += 1
+                if pos < numkept:
+                    raise ValueError("There are cyclic dependencies.")
+            for j in range(numkept):
+                newindex[order[j]] = j
+
+            # Now build the mempool.
+            if txids is None:
+                self.txidlist = [order[j] for j in range(numkept)]
+            else:
+                self.txidlist = [txids[order[j]] for j in range(numkept)]
+            self.init_array = txarray_init(numkept)
+            for j in range(numkept):
+                i = order[j]
+                tx.feerate = min(feerates.data.as_ulongs[i], MAX_FEERATE)
+                tx.size = sizes.data.as_ulongs[i]
+                txarray_append(&self.init_array, tx)
+            # In cpfp mode, the roots with dependants are package txs.
+            numqueued = self.pkgstart if self.cpfp else self.numroots
+            self.rootqueue = txptrarray_init(numqueued)
+            self.initqueuebytes = 0
+            for j in range(numqueued):
+                txptrarray_append(&self.rootqueue, &self.init_array.txs[j])
+                self.initqueuebytes += self.init_array.txs[j].size
+            self.queuebytes = self.initqueuebytes
+            qsort(self.rootqueue.txs, numqueued, sizeof(TxStruct *),
+                  _cmp_feerate_desc)
+            self.roothead = 0
+            self.roottail = numqueued
+            self.rootremoved = <char *>malloc(numqueued+1)
+            memset(self.rootremoved, 0, numqueued)
+            self.txqueue = txqueue_init(numkept-numqueued+1)
+            self.rejected_entries = txptrarray_init(numkept-numqueued+1)
+
+            # The orphans, and the orphans dependent on each tx, with
+            # numparents reused for the counts of the latter.
+            self.orphans = otxarray_init(numorphans)
+            memset(numparents, 0, numkept*sizeof(int))
+            for oidx in range(numorphans):
+                i = order[self.numroots+oidx]
+                orphan = &self.orphans.otxs[oidx]
+                orphan.txindex = self.numroots + oidx
+                orphan.numdeps = orphan.maxdeps = dstart[i+1] - dstart[i]
+                orphan.depends = <int *>malloc(orphan.maxdeps*sizeof(int))
+                orphan.removed = <int *>malloc(orphan.maxdeps*sizeof(int))
+                for k in range(orphan.maxdeps):
+                    dep = newindex[deps[dstart[i]+k]]
+                    orphan.depends[k] = dep
+                    orphan.removed[k] = 0
+                    numparents[dep] += 1
+            self.orphanmap = <OrphanTxPtrArray *>malloc(
+                numkept*sizeof(OrphanTxPtrArray))
+            for j in range(numkept):
+                self.orphanmap[j] = otxptrarray_init(numparents[j])
+                self.orphanmap[j].size = 0
+            for oidx in range(numorphans):
+                orphan = &self.orphans.otxs[oidx]
+                for k in range(orphan.maxdeps):
+                    dep = orphan.depends[k]
+                    self.orphanmap[dep].otxptrs[
+                        self.orphanmap[dep].size] = orphan
+                    self.orphanmap[dep].size += 1
+        finally:
+            free(children_start)
+            free(children)
+            free(numparents)
+            free(order)
+            free(newindex)
+            free(removed)
+            free(hasdeps)
+            free(haschildren)
+
+        # Undo logs for resetting the mempool to initial state. Each root
+        # can be removed from the queue, and each orphan first touched,
+        # at most once per realization, so these never need resizing.
+        self.removedroots = <int *>malloc(
+            (self.rootqueue.size+1)*sizeof(int))
+        self.numremovedroots = 0
+        self.touchedorphans = otxptrarray_init(self.orphans.size)
+        self.touchedorphans.size = 0
+        self.evictstack = <int *>malloc((self.orphans.size+1)*sizeof(int))
+
+        if self.cpfp:
+            self._init_packages([
+                [self.orphans.otxs[idx-self.numroots].depends[k] -
+                 self.pkgstart
+                 for k in range(
+                     self.orphans.otxs[idx-self.numroots].maxdeps)]
+                if idx >= self.numroots else []
+                for idx in range(self.pkgstart, numkept)])
+        return 0
+
+    cdef int _init_packages(self, list parents) except -1:
+        '''Build the ancestor index of the package txs.
+
+        parents[j] is the list of package indices of the dependencies of
+        package tx j; the package txs are in topological order, i.e. each
+        parent index is less than j. The ancestors of each tx (including
+        itself) are then also stored in topological order, so that a
+        package can be mined in a single pass.
+        '''
+        cdef:
+            int n, j, k, i, pos, maxpos, anc
+            int *stamp
+            TxStruct *tx
+            PackageEntry entry
+
+        n = len(parents)
+        self.numpkgtxs = n
+        self.ancestors_start = <int *>malloc((n+1)*sizeof(int))
+        self.descendants_start = <int *>malloc((n+1)*sizeof(int))
+        stamp = <int *>malloc(n*sizeof(int))
+        for j in range(n):
+            stamp[j] = -1
+            self.descendants_start[j] = 0
+        # The ancestors of tx j are the union of its parents' ancestors,
+        # which are already in topological order, plus j itself.
+        maxpos = n
+        self.ancestors = <int *>malloc(maxpos*sizeof(int))
+        pos = 0
+        for j in range(n):
+            self.ancestors_start[j] = pos
+            for k in parents[j]:
+                for i in range(self.ancestors_start[k],
+                               self.ancestors_start[k+1]):
+                    anc = self.ancestors[i]
+                    if stamp[anc] == j:
+                        continue
+                    stamp[anc] = j
+                    if pos == maxpos:
+                        maxpos *= OVERALLOCATE
+                        self.ancestors = <int *>realloc(
+                            self.ancestors, maxpos*sizeof(int))
+                    self.ancestors[pos] = anc
+                    pos += 1
+                    self.descendants_start[anc] += 1
+            if pos == maxpos:
+                maxpos *= OVERALLOCATE
+                self.ancestors = <int *>realloc(
+                    self.ancestors, maxpos*sizeof(int))
+            self.ancestors[pos] = j
+            pos += 1
+        self.ancestors_start[n] = pos
+        free(stamp)
+
+        # Invert the ancestor lists; descendants_start[j] currently holds
+        # the number of descendants of j.
+        pos = 0
+        for j in range(n):
+            k = self.descendants_start[j]
+            self.descendants_start[j] = pos
+            pos += k
+        self.descendants_start[n] = pos
+        self.descendants = <int *>malloc((pos+1)*sizeof(int))
+        stamp = <int *>malloc(n*sizeof(int))
+        for j in range(n):
+            stamp[j] = self.descendants_start[j]
+        for j in range(n):
+            for i in range(self.ancestors_start[j],
+                           self.ancestors_start[j+1]-1):
+                anc = self.ancestors[i]
+                self.descendants[stamp[anc]] = j
+                stamp[anc] += 1
+        free(stamp)
+
+        self.ancfees = <double *>malloc(n*sizeof(double))
+        self.ancfees_init = <double *>malloc(n*sizeof(double))
+        self.ancsizes = <unsigned long long *>malloc(
+            n*sizeof(unsigned long long))
+        self.ancsizes_init = <unsigned long long *>malloc(
+            n*sizeof(unsigned long long))
+        self.versions = <int *>malloc(n*sizeof(int))
+        self.mined = <char *>malloc(n*sizeof(char))
+        self.dirty = <int *>malloc(n*sizeof(int))
+        self.isdirty = <char *>malloc(n*sizeof(char))
+        self.pkgheap_init = pkgheap_init(n)
+        self.rejected_pkgs = pkgheap_init(n)
+        for j in range(n):
+            self.ancfees_init[j] = 0
+            self.ancsizes_init[j] = 0
+            for i in range(self.ancestors_start[j],
+                           self.ancestors_start[j+1]):
+                tx = &self.init_array.txs[self.pkgstart+self.ancestors[i]]
+                self.ancfees_init[j] += <double>tx.feerate*tx.size
+                self.ancsizes_init[j] += tx.size
+            self.isdirty[j] = 0
+            entry.score = self.ancfees_init[j] / self.ancsizes_init[j]
+            entry.pkgindex = j
+            entry.version = 0
+            pkgheap_append(&self.pkgheap_init, entry)
+        pkgheap_heapify(self.pkgheap_init)
+        self.pkgheap = pkgheap_init(n)
+        self._reset_packages()
+        return 0
 
     def get_entries(self):
         cdef:
@@ -117,6 +820,12 @@ cdef class SimMempool:
             TxStruct tx
             OrphanTx orphan
         entries = {}
+        for idx in range(self.roothead, self.roottail):
+            if self.rootremoved[idx]:
+                continue
+            txptr = self.rootqueue.txs[idx]
+            txid = self.txidlist[txptr - self.init_array.txs]
+            entries[txid] = SimEntry(txptr.feerate, txptr.size)
         for idx in range(1, self.txqueue.size):
             txptr = self.txqueue.txs[idx]
             init_idx = txptr - self.init_array.txs
@@ -126,9 +835,28 @@ cdef class SimMempool:
                 txid = '_' + str(idx)
             entries[txid] = SimEntry(txptr.feerate, txptr.size)
 
+        if self.cpfp:
+            for j in range(self.numpkgtxs):
+                if self.mined[j]:
+                    continue
+                idx = self.pkgstart + j
+                tx = self.init_array.txs[idx]
+                txid = self.txidlist[idx]
+                depends = []
+                if idx >= self.numroots:
+                    orphan = self.orphans.otxs[idx - self.numroots]
+                    depends = [
+                        self.txidlist[orphan.depends[i]]
+                        for i in range(orphan.maxdeps)
+                        if not self.mined[orphan.depends[i] - self.pkgstart]
+                    ]
+                entries[txid] = SimEntry(tx.feerate, tx.size, depends=depends)
+            return entries
+
         for idx in range(self.orphans.size):
             orphan = self.orphans.otxs[idx]
-            if orphan.numdeps == 0:
+            if orphan.numdeps <= 0:
+                # Released, or evicted
                 continue
             tx = self.init_array.txs[orphan.txindex]
             txid = self.txidlist[orphan.txindex]
@@ -140,30 +868,120 @@ cdef class SimMempool:
 
         return entries
 
+    def get_txarray(self):
+        '''Get the txs in the mempool as a SimTxArray.
+
+        The txs are the same as those in get_entries (without the depends),
+        but with no per-tx Python objects created. They're copied into the
+        SimTxArray, which is a snapshot: the mempool holds its txs as
+        pointers into several arrays, so there's no contiguous storage to
+        expose directly.
+        '''
+        cdef:
+            SimTxArray txarray = SimTxArray()
+            int i
+
+        for i in range(self.roothead, self.roottail):
+            if not self.rootremoved[i]:
+                txarray_append(&txarray.txs, self.rootqueue.txs[i][0])
+        for i in range(1, self.txqueue.size):
+            txarray_append(&txarray.txs, self.txqueue.txs[i][0])
+        if self.cpfp:
+            for i in range(self.numpkgtxs):
+                if not self.mined[i]:
+                    txarray_append(
+                        &txarray.txs, self.init_array.txs[self.pkgstart+i])
+        else:
+            for i in range(self.orphans.size):
+                if self.orphans.otxs[i].numdeps > 0:
+                    txarray_append(
+                        &txarray.txs,
+                        self.init_array.txs[self.orphans.otxs[i].txindex])
+        return txarray
+
     def reset(self):
-        txptrarray_copy(self.txqueue_bak, &self.txqueue)
+        '''Reset the mempool to its initial state.
+
+        Instead of restoring a full copy of the initial queue, we roll back
+        the undo logs: txqueue, which only has the txs added since (emitted
+        txs and released orphans), is emptied, the roots that were removed
+        (mined or evicted) are unflagged, and the orphans whose depends
+        were modified are reset. The untouched roots aren't visited, so the
+        cost scales with the work done since the last reset, rather than
+        with the initial mempool size.
+
+        In cpfp mode, the package index is restored wholesale, which is
+        linear in the number of package txs only.
+        '''
+        cdef int i
+        self.txqueue.size = 1
+        for i in range(self.numremovedroots):
+            self.rootremoved[self.removedroots[i]] = 0
+        self.numremovedroots = 0
+        self.queuebytes = self.initqueuebytes
+        self.roothead = 0
+        self.roottail = self.rootqueue.size
         self._reset_orphan_deps()
-
-    cdef void _process_block(self, SimBlock simblock):
+        if self.cpfp:
+            self._reset_packages()
+        self.minrelayfeerate = 0
+
+    cdef void _reset_packages(self):
+        """Reset the package index to its initial state."""
+        cdef int n = self.numpkgtxs
+        memcpy(self.ancfees, self.ancfees_init, n*sizeof(double))
+        memcpy(self.ancsizes, self.ancsizes_init,
+               n*sizeof(unsigned long long))
+        memset(self.versions, 0, n*sizeof(int))
+        memset(self.mined, 0, n*sizeof(char))
+        pkgheap_copy(self.pkgheap_init, &self.pkgheap)
+
+    cdef void _process_block(self, BlockStruct *block, TxPtrArray *blocktxs):
+        '''Mine a block with block.maxblocksize and block.minfeerate.
+
+        The block txs are put in blocktxs (which must be initialized), and
+        block.size, block.sfr and block.is_sizeltd are set.
+        '''
         cdef:
             unsigned long newblocksize, maxblocksize, blocksize, blocksize_ltd
             unsigned long minfeerate, sfr
+            int rootidx, numtxs
+            bint isroot
             TxStruct *newtx
             OrphanTx orphantx
-            TxPtrArray blocktxs
 
-        minfeerate = min(simblock.pool.minfeerate, MAX_FEERATE)
-        maxblocksize = simblock.pool.maxblocksize
+        if self.cpfp:
+            self._process_block_packages(block, blocktxs)
+            return
+        minfeerate = block.minfeerate
+        maxblocksize = block.maxblocksize
         sfr = MAX_FEERATE
         blocksize = 0
         blocksize_ltd = 0
-        blocktxs = txptrarray_init(self.txqueue.size)
+        blocktxs.size = 0
+        numtxs = self.txqueue.size + self.roottail - self.roothead
+        if blocktxs.maxsize < numtxs:
+            txptrarray_resize(blocktxs, numtxs)
 
         txqueue_heapify(self.txqueue)
         self.rejected_entries.size = 0
 
-        while self.txqueue.size > 1:
-            newtx = txqueue_heappop(&self.txqueue)
+        # Merge the root queue and the tx queue, by feerate. The roots
+        # which don't go in the block are simply left in place.
+        rootidx = self.roothead
+        while True:
+            rootidx = self._next_root(rootidx)
+            if rootidx < self.roottail and (
+                    self.txqueue.size == 1 or
+                    self.rootqueue.txs[rootidx].feerate >=
+                    self.txqueue.txs[1].feerate):
+                newtx = self.rootqueue.txs[rootidx]
+                isroot = True
+            elif self.txqueue.size > 1:
+                newtx = txqueue_heappop(&self.txqueue)
+                isroot = False
+            else:
+                break
             if newtx.feerate >= minfeerate:
                 newblocksize = newtx.size + blocksize
                 if newblocksize <= maxblocksize:
@@ -172,21 +990,209 @@ cdef class SimMempool:
                     elif newtx.feerate < sfr:
                         sfr = newtx.feerate
 
-                    txptrarray_append(&blocktxs, newtx)
+                    txptrarray_append(blocktxs, newtx)
                     blocksize = newblocksize
+                    self.queuebytes -= newtx.size
+                    if isroot:
+                        self._remove_root(rootidx)
                     self._process_deps(newtx)
                 else:
-                    txptrarray_append(&self.rejected_entries, newtx)
+                    if not isroot:
+                        txptrarray_append(&self.rejected_entries, newtx)
                     blocksize_ltd += 1
             else:
-                txptrarray_append(&self.rejected_entries, newtx)
+                if not isroot:
+                    txptrarray_append(&self.rejected_entries, newtx)
                 break
+            if isroot:
+                rootidx += 1
         txptrarray_extend(&self.txqueue, self.rejected_entries)
 
-        simblock.sfr = sfr + 1 if blocksize_ltd else minfeerate
-        simblock.is_sizeltd = bool(blocksize_ltd)
-        simblock.size = blocksize
-        simblock._txptrs = blocktxs
+        block.sfr = sfr + 1 if blocksize_ltd else minfeerate
+        block.is_sizeltd = blocksize_ltd > 0
+        block.size = blocksize
+
+    cdef void _process_block_packages(self, BlockStruct *block,
+                                      TxPtrArray *blocktxs):
+        """Package-aware version of _process_block.
+
+        The best candidate is either the top of the tx queue (txs without
+        dependencies or dependants, whose ancestor score is their feerate),
+        or the top of the package heap. A package counts as a single unit
+        for the purposes of the size-limited sfr calculation.
+        """
+        cdef:
+            unsigned long newblocksize, maxblocksize, blocksize, blocksize_ltd
+            unsigned long minfeerate, sfr
+            unsigned long long pkgsize
+            int rootidx, numtxs
+            bint haspackage, isroot
+            TxStruct *newtx
+            PackageEntry entry
+
+        minfeerate = block.minfeerate
+        maxblocksize = block.maxblocksize
+        sfr = MAX_FEERATE
+        blocksize = 0
+        blocksize_ltd = 0
+        blocktxs.size = 0
+        numtxs = (self.txqueue.size + self.roottail - self.roothead +
+                  self.numpkgtxs)
+        if blocktxs.maxsize < numtxs:
+            txptrarray_resize(blocktxs, numtxs)
+
+        txqueue_heapify(self.txqueue)
+        self.rejected_entries.size = 0
+        self.rejected_pkgs.size = 0
+        if self.pkgheap.size > 2*self.numpkgtxs:
+            # Too many outdated entries; compact the heap.
+            self._rebuild_pkgheap()
+
+        rootidx = self.roothead
+        while True:
+            haspackage = self._peek_package()
+            # The best tx of the root queue and the tx queue
+            rootidx = self._next_root(rootidx)
+            if rootidx < self.roottail and (
+                    self.txqueue.size == 1 or
+                    self.rootqueue.txs[rootidx].feerate >=
+                    self.txqueue.txs[1].feerate):
+                newtx = self.rootqueue.txs[rootidx]
+                isroot = True
+            elif self.txqueue.size > 1:
+                newtx = self.txqueue.txs[1]
+                isroot = False
+            else:
+                newtx = NULL
+            if newtx is not NULL and (
+                    not haspackage or
+                    newtx.feerate >= self.pkgheap.entries[0].score):
+                if isroot:
+                    rootidx += 1
+                else:
+                    txqueue_heappop(&self.txqueue)
+                if newtx.feerate >= minfeerate:
+                    newblocksize = newtx.size + blocksize
+                    if newblocksize <= maxblocksize:
+                        if blocksize_ltd > 0:
+                            blocksize_ltd -= 1
+                        elif newtx.feerate < sfr:
+                            sfr = newtx.feerate
+
+                        txptrarray_append(blocktxs, newtx)
+                        blocksize = newblocksize
+                        self.queuebytes -= newtx.size
+                        if isroot:
+                            self._remove_root(rootidx-1)
+                    else:
+                        if not isroot:
+                            txptrarray_append(&self.rejected_entries, newtx)
+                        blocksize_ltd += 1
+                else:
+                    if not isroot:
+                        txptrarray_append(&self.rejected_entries, newtx)
+                    break
+            elif haspackage:
+                entry = pkgheap_pop(&self.pkgheap)
+                if entry.score >= minfeerate:
+                    pkgsize = self.ancsizes[entry.pkgindex]
+                    if pkgsize + blocksize <= maxblocksize:
+                        if blocksize_ltd > 0:
+                            blocksize_ltd -= 1
+                        elif entry.score < sfr:
+                            sfr = <unsigned long>entry.score
+
+                        self._mine_package(entry.pkgindex, blocktxs)
+                        blocksize += pkgsize
+                    else:
+                        pkgheap_append(&self.rejected_pkgs, entry)
+                        blocksize_ltd += 1
+                else:
+                    pkgheap_append(&self.rejected_pkgs, entry)
+                    break
+            else:
+                break
+        txptrarray_extend(&self.txqueue, self.rejected_entries)
+        for i in range(self.rejected_pkgs.size):
+            pkgheap_push(&self.pkgheap, self.rejected_pkgs.entries[i])
+
+        block.sfr = sfr + 1 if blocksize_ltd else minfeerate
+        block.is_sizeltd = blocksize_ltd > 0
+        block.size = blocksize
+
+    cdef void _mine_package(self, int pkgindex, TxPtrArray *blocktxs):
+        """Add package tx pkgindex and its unmined ancestors to the block.
+
+        The ancestor stats of the descendants of each newly mined tx are
+        updated, and the descendants are pushed onto the package heap with
+        their new scores.
+        """
+        cdef:
+            int i, k, anc, desc, numdirty
+            double fee
+            TxStruct *tx
+            PackageEntry entry
+
+        numdirty = 0
+        for i in range(self.ancestors_start[pkgindex],
+                       self.ancestors_start[pkgindex+1]):
+            anc = self.ancestors[i]
+            if self.mined[anc]:
+                continue
+            self.mined[anc] = 1
+            tx = &self.init_array.txs[self.pkgstart+anc]
+            txptrarray_append(blocktxs, tx)
+            fee = <double>tx.feerate*tx.size
+            for k in range(self.descendants_start[anc],
+                           self.descendants_start[anc+1]):
+                desc = self.descendants[k]
+                if self.mined[desc]:
+                    continue
+                self.ancfees[desc] -= fee
+                self.ancsizes[desc] -= tx.size
+                self.versions[desc] += 1
+                if not self.isdirty[desc]:
+                    self.isdirty[desc] = 1
+                    self.dirty[numdirty] = desc
+                    numdirty += 1
+
+        for i in range(numdirty):
+            desc = self.dirty[i]
+            self.isdirty[desc] = 0
+            if self.mined[desc]:
+                continue
+            entry.score = self.ancfees[desc] / self.ancsizes[desc]
+            entry.pkgindex = desc
+            entry.version = self.versions[desc]
+            pkgheap_push(&self.pkgheap, entry)
+
+    cdef bint _peek_package(self):
+        """Discard outdated entries at the top of the package heap.
+
+        Returns whether there's a valid package at the top.
+        """
+        cdef PackageEntry entry
+        while self.pkgheap.size:
+            entry = self.pkgheap.entries[0]
+            if (self.mined[entry.pkgindex] or
+                    entry.version != self.versions[entry.pkgindex]):
+                pkgheap_pop(&self.pkgheap)
+            else:
+                return True
+        return False
+
+    cdef void _rebuild_pkgheap(self):
+        """Rebuild the package heap from the current ancestor stats."""
+        cdef PackageEntry entry
+        self.pkgheap.size = 0
+        for j in range(self.numpkgtxs):
+            if self.mined[j]:
+                continue
+            entry.score = self.ancfees[j] / self.ancsizes[j]
+            entry.pkgindex = j
+            entry.version = self.versions[j]
+            pkgheap_append(&self.pkgheap, entry)
+        pkgheap_heapify(self.pkgheap)
 
     cdef void _process_deps(self, TxStruct *newtx):
         """Process dependants of tx newly added to a block.
@@ -198,6 +1204,7 @@ cdef class SimMempool:
         cdef:
             int depidx, txindex
             OrphanTxPtrArray dependants
+            OrphanTx *orphan
 
         if self.init_array.txs <= newtx < self.init_array.txs + self.init_array.size:
             # Then newtx points to a transaction within self.init_array,
@@ -207,35 +1214,168 @@ cdef class SimMempool:
             depidx = newtx - self.init_array.txs
             dependants = self.orphanmap[depidx]
             for i in range(dependants.size):
-                txindex = orphantx_removedep(dependants.otxptrs[i], depidx)
+                orphan = dependants.otxptrs[i]
+                if orphan.numdeps == ORPHAN_EVICTED:
+                    continue
+                if orphan.numdeps == orphan.maxdeps:
+                    # First modification since the last reset; log it.
+                    self.touchedorphans.otxptrs[self.touchedorphans.size] = (
+                        orphan)
+                    self.touchedorphans.size += 1
+                txindex = orphantx_removedep(orphan, depidx)
                 if txindex >= 0:
                     txqueue_heappush(&self.txqueue, &self.init_array.txs[txindex])
+                    self.queuebytes += self.init_array.txs[txindex].size
 
     cdef void _reset_orphan_deps(self):
-        """Reset the depends list of orphans."""
-        for i in range(self.orphans.size):
-            orphantx_resetdeps(&self.orphans.otxs[i])
+        """Reset the depends list of orphans modified since the last reset."""
+        for i in range(self.touchedorphans.size):
+            orphantx_resetdeps(self.touchedorphans.otxptrs[i])
+        self.touchedorphans.size = 0
+
+    cdef void _decay_minrelayfeerate(self, double interval):
+        """Decay the min relay feerate over a time interval in seconds."""
+        cdef double halflife
+
+        if self.minrelayfeerate == 0:
+            return
+        halflife = ROLLING_FEE_HALFLIFE
+        if self.queuebytes < self.maxsize // 4:
+            halflife /= 4
+        elif self.queuebytes < self.maxsize // 2:
+            halflife /= 2
+        self.minrelayfeerate *= 0.5**(interval / halflife)
+        if self.minrelayfeerate < INCREMENTAL_RELAY_FEERATE / 2:
+            self.minrelayfeerate = 0
+
+    cdef void _trim(self):
+        """Evict the lowest feerate txs until the size is <= maxsize.
+
+        The descendants of each evicted tx are evicted along with it.
+        """
+        cdef:
+            unsigned long maxevicted
+            TxStruct *tx
+
+        if self.queuebytes <= self.maxsize:
+            return
+        maxevicted = 0
+        # The queue is re-heapified in _process_block, so we're free to
+        # rearrange it as a min-heap here.
+        txqueue_minheapify(self.txqueue)
+        while self.queuebytes > self.maxsize and (
+                self.txqueue.size > 1 or self.roottail > self.roothead):
+            # The lowest feerate root is at roottail-1.
+            if self.roottail > self.roothead and (
+                    self.txqueue.size == 1 or
+                    self.rootqueue.txs[self.roottail-1].feerate <=
+                    self.txqueue.txs[1].feerate):
+                tx = self.rootqueue.txs[self.roottail-1]
+                self._remove_root(self.roottail-1)
+            else:
+                tx = txqueue_minheappop(&self.txqueue)
+            self.queuebytes -= tx.size
+            self._evict_descendants(tx)
+            if tx.feerate > maxevicted:
+                maxevicted = tx.feerate
+        self.minrelayfeerate = max(
+            self.minrelayfeerate, maxevicted + INCREMENTAL_RELAY_FEERATE)
+
+    cdef int _next_root(self, int rootidx):
+        """The index of the first unremoved root from rootidx on."""
+        while rootidx < self.roottail and self.rootremoved[rootidx]:
+            rootidx += 1
+        return rootidx
+
+    cdef void _remove_root(self, int rootidx):
+        """Remove root rootidx from the root queue, logging it for reset.
+
+        roothead and roottail are kept at unremoved roots (if any).
+        """
+        self.rootremoved[rootidx] = 1
+        self.removedroots[self.numremovedroots] = rootidx
+        self.numremovedroots += 1
+        while (self.roothead < self.roottail and
+               self.rootremoved[self.roothead]):
+            self.roothead += 1
+        while (self.roottail > self.roothead and
+               self.rootremoved[self.roottail-1]):
+            self.roottail -= 1
+
+    cdef void _evict_descendants(self, TxStruct *tx):
+        """Evict the orphans which descend from tx.
+
+        They can't have been released, as tx wasn't mined, so they're
+        simply marked as evicted (and logged for reset).
+        """
+        cdef:
+            int txindex, numstack
+            OrphanTxPtrArray dependants
+            OrphanTx *orphan
+
+        if not (self.init_array.txs <= tx <
+                self.init_array.txs + self.init_array.size):
+            return
+        self.evictstack[0] = tx - self.init_array.txs
+        numstack = 1
+        while numstack:
+            numstack -= 1
+            dependants = self.orphanmap[self.evictstack[numstack]]
+            for i in range(dependants.size):
+                orphan = dependants.otxptrs[i]
+                if orphan.numdeps == ORPHAN_EVICTED:
+                    continue
+                if orphan.numdeps == orphan.maxdeps:
+                    self.touchedorphans.otxptrs[self.touchedorphans.size] = (
+                        orphan)
+                    self.touchedorphans.size += 1
+                orphan.numdeps = ORPHAN_EVICTED
+                self.evictstack[numstack] = orphan.txindex
+                numstack += 1
 
     def __dealloc__(self):
         txarray_deinit(self.init_array)
         txptrarray_deinit(self.txqueue)
-        txptrarray_deinit(self.txqueue_bak)
         txptrarray_deinit(self.rejected_entries)
+        txptrarray_deinit(self.rootqueue)
+        free(self.rootremoved)
+        free(self.removedroots)
+        free(self.evictstack)
+        otxptrarray_deinit(self.touchedorphans)
 
         otxarray_deinit(self.orphans)
-        for i in range(self.init_array.size):
-            otxptrarray_deinit(self.orphanmap[i])
+        if self.orphanmap != NULL:
+            for i in range(self.init_array.size):
+                otxptrarray_deinit(self.orphanmap[i])
         free(self.orphanmap)
 
+        free(self.ancestors)
+        free(self.ancestors_start)
+        free(self.descendants)
+        free(self.descendants_start)
+        free(self.ancfees)
+        free(self.ancfees_init)
+        free(self.ancsizes)
+        free(self.ancsizes_init)
+        free(self.versions)
+        free(self.mined)
+        free(self.dirty)
+        free(self.isdirty)
+        pkgheap_deinit(self.pkgheap)
+        pkgheap_deinit(self.pkgheap_init)
+        pkgheap_deinit(self.rejected_pkgs)
+
 
 cdef class SimBlock(object):
 
-    def __cinit__(self, poolname, pool):
+    def __cinit__(self, *args, **kwargs):
         self._txptrs.txs = NULL
 
-    def __init__(self, poolname, pool):
+    def __init__(self, poolname, pool, poolidx=-1):
+        '''poolidx is the index of the pool in its SimPools, if any.'''
         self.poolname = poolname
         self.pool = pool
+        self.poolidx = poolidx
         self.size = 0
         self.sfr = float("inf")
         self.is_sizeltd = None
@@ -248,15 +1388,10 @@ cdef class SimBlock(object):
 
             For efficiency, we keep the txs as a TxPtrArray (as assigned in
             SimMempool._process_block), and only instantiate the SimTxs
-            the first time you access it.
+            the first time you access it. The SimBlock keeps a reference to
+            the SimMempool which owns the tx memory.
 
-            Take note that if the Simul instance that produced this SimBlock
-            becomes unreferenced, the tx memory to which self._txptrs.txs
-            points will become deallocated, and bad things will happen.
-
-            TL;DR - if you want to access this property, make sure you keep a
-            reference to the Simul instance, at least up until the first time
-            you access this property.
+            If you don't need the SimTx objects, use self.txarray instead.
             '''
             if self._txs is None:
                 if self._txptrs.txs is NULL:
@@ -267,6 +1402,21 @@ cdef class SimBlock(object):
                     for i in range(self._txptrs.size)]
             return self._txs
 
+    property txarray:
+
+        def __get__(self):
+            '''Get the block transactions as a SimTxArray.
+
+            The txs are copied into it (once, the first time you access
+            it), since the block only holds pointers to them.
+            '''
+            cdef int i
+            if self._txarray is None:
+                self._txarray = SimTxArray()
+                for i in range(self._txptrs.size):
+                    txarray_append(&self._txarray.txs, self._txptrs.txs[i][0])
+            return self._txarray
+
     def __repr__(self):
         return "SimBlock(pool: {}, numtxs: {}, size: {}, sfr: {})".format(
             self.poolname, len(self.txs), self.size, self.sfr)
@@ -275,6 +1425,163 @@ cdef class SimBlock(object):
         txptrarray_deinit(self._txptrs)
 
 
+cdef class SimTxArray:
+    '''Contiguous array of txs, exposed through the buffer protocol.
+
+    The buffer is read-only, of shape (numtxs, 2) and C-ulong format, with
+    each row being (feerate, size). So e.g. numpy.asarray(txarray) is a
+    view of the txs, which holds a reference to this object.
+    '''
+
+    def __cinit__(self):
+        self.txs = txarray_init(0)
+
+    def __len__(self):
+        return self.txs.size
+
+    def __getbuffer__(self, Py_buffer *buffer, int flags):
+        if flags & PyBUF_WRITABLE:
+            raise BufferError("SimTxArray is read-only.")
+        self.shape[0] = self.txs.size
+        self.shape[1] = 2
+        self.strides[0] = sizeof(TxStruct)
+        self.strides[1] = sizeof(unsigned long)
+        buffer.buf = <char *>self.txs.txs
+        buffer.obj = self
+        buffer.len = self.txs.size*sizeof(TxStruct)
+        buffer.readonly = 1
+        buffer.itemsize = sizeof(unsigned long)
+        buffer.format = 'L'
+        buffer.ndim = 2
+        buffer.shape = self.shape
+        buffer.strides = self.strides
+        buffer.suboffsets = NULL
+        buffer.internal = NULL
+
+    def __releasebuffer__(self, Py_buffer *buffer):
+        pass
+
+    def __dealloc__(self):
+        txarray_deinit(self.txs)
+
+
+cdef class SimTrace:
+    '''Per-block record of a simulation run.
+
+    Pass to Simul.run to record one row of (blockinterval, sfr, size,
+    poolidx) per block. Exposed through the buffer protocol as a read-only
+    C-double array of shape (numblocks, 4), so that e.g.
+    numpy.asarray(trace) is a view of the rows.
+
+    The trace cannot grow while such views exist (a BufferError is raised
+    in Simul.run); preallocate with maxsize, or clear() the trace, if you
+    need to view it while it is being recorded.
+    '''
+
+    def __cinit__(self, int maxsize=1024):
+        self.maxsize = max(maxsize, 1)
+        self.rows = <double *>malloc(4*self.maxsize*sizeof(double))
+        self.size = 0
+        self.numexports = 0
+
+    def clear(self):
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    cdef int _append(self, double interval, double sfr, double size,
+                     double poolidx) except -1:
+        cdef double *row
+        if self.size == self.maxsize:
+            if self.numexports:
+                raise BufferError(
+                    "SimTrace is full and cannot be resized while viewed.")
+            self.maxsize *= OVERALLOCATE
+            self.rows = <double *>realloc(
+                self.rows, 4*self.maxsize*sizeof(double))
+        row = self.rows + 4*self.size
+        row[0] = interval
+        row[1] = sfr
+        row[2] = size
+        row[3] = poolidx
+        self.size += 1
+        return 0
+
+    def __getbuffer__(self, Py_buffer *buffer, int flags):
+        if flags & PyBUF_WRITABLE:
+            raise BufferError("SimTrace is read-only.")
+        self.shape[0] = self.size
+        self.shape[1] = 4
+        self.strides[0] = 4*sizeof(double)
+        self.strides[1] = sizeof(double)
+        buffer.buf = <char *>self.rows
+        buffer.obj = self
+        buffer.len = 4*self.size*sizeof(double)
+        buffer.readonly = 1
+        buffer.itemsize = sizeof(double)
+        buffer.format = 'd'
+        buffer.ndim = 2
+        buffer.shape = self.shape
+        buffer.strides = self.strides
+        buffer.suboffsets = NULL
+        buffer.internal = NULL
+        self.numexports += 1
+
+    def __releasebuffer__(self, Py_buffer *buffer):
+        self.numexports -= 1
+
+    def __dealloc__(self):
+        free(self.rows)
+
+
+def pack_entries(entries):
+    """Pack mempool entries into arrays.
+
+    Returns (txids, feerates, sizes, depends_start, depends). The entries
+    are indexed in the order of txids. feerates and sizes are array('L'),
+    with the feerates capped at MAX_FEERATE; the dependencies of entry i
+    are the indices depends[depends_start[i]:depends_start[i+1]], also
+    array('L').
+    """
+    txids = list(entries)
+    txidmap = {txid: idx for idx, txid in enumerate(txids)}
+    feerates = array('L')
+    sizes = array('L')
+    depends_start = array('L', [0])
+    depends = array('L')
+    for txid in txids:
+        entry = entries[txid]
+        feerates.append(min(entry.feerate, MAX_FEERATE))
+        sizes.append(entry.size)
+        try:
+            depends.extend([txidmap[dep] for dep in entry.depends])
+        except KeyError:
+            raise ValueError("There are hanging dependencies.")
+        depends_start.append(len(depends))
+    return txids, feerates, sizes, depends_start, depends
+
+
+cdef int _cmp_feerate_desc(const void *a, const void *b) nogil:
+    """qsort comparison of TxStruct pointers, by decreasing feerate.
+
+    Ties are broken by address, so that the order is deterministic.
+    """
+    cdef:
+        TxStruct *tx_a = (<TxStruct **>a)[0]
+        TxStruct *tx_b = (<TxStruct **>b)[0]
+    if tx_a.feerate != tx_b.feerate:
+        return -1 if tx_a.feerate > tx_b.feerate else 1
+    return (tx_a > tx_b) - (tx_a < tx_b)
+
+
+cdef array _ulong_array(a):
+    """a as an array('L'), copied only if it isn't one already."""
+    if isinstance(a, array) and (<object>a).typecode == 'L':
+        return a
+    return array('L', a)
+
+
 # =============
 # OrphanTxPtrArray
 # =============
@@ -303,21 +1610,6 @@ cdef void otxarray_deinit(OrphanTxArray otxarray):
 # =============
 # OrphanTx
 # =============
-cdef OrphanTx orphantx_init(int txindex, list depends):
-    cdef:
-        OrphanTx orphan
-        int n
-    orphan.txindex = txindex
-    n = len(depends)
-    orphan.depends = <int *>malloc(n*sizeof(int))
-    orphan.removed = <int *>malloc(n*sizeof(int))
-    orphan.numdeps = n
-    orphan.maxdeps = n
-    for i in range(n):
-        orphan.depends[i] = depends[i]
-        orphan.removed[i] = 0
-    return orphan
-
 cdef void orphantx_deinit(OrphanTx orphan):
     free(orphan.depends)
     free(orphan.removed)
@@ -342,6 +1634,93 @@ cdef void orphantx_resetdeps(OrphanTx *orphan):
     orphan.numdeps = orphan.maxdeps
 
 
+# =============
+# PackageHeap
+# =============
+cdef PackageHeap pkgheap_init(int maxsize):
+    cdef PackageHeap heap
+    heap.size = 0
+    heap.maxsize = maxsize
+    heap.entries = <PackageEntry *>malloc(maxsize*sizeof(PackageEntry))
+    return heap
+
+cdef void pkgheap_deinit(PackageHeap heap):
+    free(heap.entries)
+
+cdef void pkgheap_resize(PackageHeap *heap, int newmaxsize):
+    heap.maxsize = newmaxsize
+    if heap.size > newmaxsize:
+        heap.size = newmaxsize
+    heap.entries = <PackageEntry *>realloc(
+        heap.entries, newmaxsize*sizeof(PackageEntry))
+
+cdef void pkgheap_append(PackageHeap *heap, PackageEntry entry):
+    if heap.size == heap.maxsize:
+        pkgheap_resize(heap, <int>((heap.size+1)*OVERALLOCATE))
+    heap.entries[heap.size] = entry
+    heap.size += 1
+
+cdef void pkgheap_copy(PackageHeap source, PackageHeap *dest):
+    if dest.maxsize < source.size:
+        pkgheap_resize(dest, source.size)
+    dest.size = source.size
+    memcpy(dest.entries, source.entries, source.size*sizeof(PackageEntry))
+
+cdef void pkgheap_push(PackageHeap *heap, PackageEntry entry):
+    '''Push entry onto the (max-)heap, which is zero-indexed.'''
+    cdef:
+        int idx, parent
+        PackageEntry tmp
+    pkgheap_append(heap, entry)
+
+    idx = heap.size - 1
+    while idx > 0:
+        parent = (idx - 1) // 2
+        if heap.entries[idx].score > heap.entries[parent].score:
+            tmp = heap.entries[idx]
+            heap.entries[idx] = heap.entries[parent]
+            heap.entries[parent] = tmp
+            idx = parent
+        else:
+            break
+
+cdef PackageEntry pkgheap_pop(PackageHeap *heap):
+    """Extract the max. The heap must be non-empty."""
+    cdef PackageEntry best
+    best = heap.entries[0]
+    heap.size -= 1
+    heap.entries[0] = heap.entries[heap.size]
+    pkgheap_siftdown(heap[0], 0)
+    return best
+
+cdef void pkgheap_heapify(PackageHeap heap):
+    for idx in range(heap.size // 2 - 1, -1, -1):
+        pkgheap_siftdown(heap, idx)
+
+cdef void pkgheap_siftdown(PackageHeap heap, int idx):
+    cdef:
+        int left, right, largerchild
+        PackageEntry tmp
+
+    while True:
+        left = 2*idx + 1
+        if left < heap.size:
+            right = left + 1
+            if (right < heap.size and
+                    heap.entries[right].score > heap.entries[left].score):
+                largerchild = right
+            else:
+                largerchild = left
+            if heap.entries[largerchild].score > heap.entries[idx].score:
+                tmp = heap.entries[idx]
+                heap.entries[idx] = heap.entries[largerchild]
+                heap.entries[largerchild] = tmp
+                idx = largerchild
+                continue
+            break
+        break
+
+
 # =============
 # Heap stuff
 # =============
@@ -378,6 +1757,45 @@ cdef TxStruct* txqueue_heappop(TxPtrArray *txqueue):
         return besttx
     return NULL
 
+cdef TxStruct* txqueue_minheappop(TxPtrArray *txqueue):
+    """Extract the min, from a queue heapified with txqueue_minheapify."""
+    cdef TxStruct *worsttx
+    if txqueue.size > 1:
+        worsttx = txqueue.txs[1]
+        txqueue.txs[1] = txqueue.txs[txqueue.size-1]
+        txqueue.size -= 1
+        txqueue_minsiftdown(txqueue[0], 1)
+        return worsttx
+    return NULL
+
+cdef void txqueue_minheapify(TxPtrArray txqueue):
+    cdef int startidx
+    startidx = txqueue.size // 2
+    for idx in range(startidx, 0, -1):
+        txqueue_minsiftdown(txqueue, idx)
+
+cdef void txqueue_minsiftdown(TxPtrArray txqueue, int idx):
+    cdef:
+        int left, right, smallerchild
+        TxStruct *tmp
+
+    while True:
+        left = 2*idx
+        if left < txqueue.size:
+            right = left + 1
+            if right < txqueue.size and txqueue.txs[right].feerate < txqueue.txs[left].feerate:
+                smallerchild = right
+            else:
+                smallerchild = left
+            if txqueue.txs[smallerchild].feerate < txqueue.txs[idx].feerate:
+                tmp = txqueue.txs[idx]
+                txqueue.txs[idx] = txqueue.txs[smallerchild]
+                txqueue.txs[smallerchild] = tmp
+                idx = smallerchild
+                continue
+            break
+        break
+
 cdef void txqueue_heapify(TxPtrArray txqueue):
     cdef int startidx
     startidx = txqueue.size // 2
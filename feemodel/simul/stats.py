@@ -2,7 +2,7 @@ from __future__ import division
 
 from tabulate import tabulate
 
-from feemodel.util import Function, DiscreteFunction
+from feemodel.util import Function, DiscreteFunction, merge_grids
 
 
 class WaitFn(Function):
@@ -56,14 +56,47 @@ class WaitFn(Function):
 #          consistently fail to fit into blocks. We still need a robust way
 #          of determining the stable feerate.
 class Capacity(object):
+    '''Capacity and tx byterate functions of a (pools, txsource) pair.
+
+    The stable feerates and the utilization function are memoized, so that
+    a Capacity can be reused by all the Simul instances of the same pools
+    and txsource (see the cap arg of Simul).
+    '''
 
     def __init__(self, pools, txsource):
         self.txbyteratefn = txsource.get_byteratefn()
         self.hashratefn = pools.get_hashratefn()
         self.capfn = pools.get_capacityfn()
         self.procratesfn = None
+        # utilization_thresh: (stablefeerate, procratesfn)
+        self._stablefeerates = {}
+        self._utilization = None
 
     def calc_stablefeerate(self, utilization_thresh):
+        try:
+            stablefeerate, self.procratesfn = (
+                self._stablefeerates[utilization_thresh])
+        except KeyError:
+            stablefeerate = self._calc_stablefeerate(utilization_thresh)
+            self._stablefeerates[utilization_thresh] = (
+                stablefeerate, self.procratesfn)
+        return stablefeerate
+
+    def for_txsource(self, txsource):
+        '''Get the Capacity of the same pools with another txsource.
+
+        The pools' hashrate and capacity functions are reused.
+        '''
+        cap = Capacity.__new__(Capacity)
+        cap.txbyteratefn = txsource.get_byteratefn()
+        cap.hashratefn = self.hashratefn
+        cap.capfn = self.capfn
+        cap.procratesfn = None
+        cap._stablefeerates = {}
+        cap._utilization = None
+        return cap
+
+    def _calc_stablefeerate(self, utilization_thresh):
         # Start from the point where tx byterate is zero.
         laststablefeerate, dummy = self.txbyteratefn[-1]
         allocatedbyterate = 0.
@@ -71,9 +104,19 @@ class Capacity(object):
         feerates = []
         procbyterates = []
 
-        for feerate, cap in reversed(list(self.capfn)):
+        # Evaluate the functions on the capacity grid, and on the grid
+        # shifted by -1, in one pass each.
+        capfeerates = self.capfn._x
+        prevfeerates = [feerate - 1 for feerate in capfeerates]
+        txbyterates = self.txbyteratefn.evaluate(capfeerates)
+        hashrates = self.hashratefn.evaluate(capfeerates)
+        prevhashrates = self.hashratefn.evaluate(prevfeerates)
+        prevcaps = self.capfn.evaluate(prevfeerates)
+
+        for idx in reversed(range(len(capfeerates))):
+            feerate, cap = self.capfn[idx]
             capthresh = cap*utilization_thresh
-            txbyterate = self.txbyteratefn(feerate)
+            txbyterate = txbyterates[idx]
             # TODO: remove after debug
             assert round(txbyterate) >= round(allocatedbyterate)
             # Ensure that it doesn't go below 0 due to rounding errors.
@@ -81,8 +124,9 @@ class Capacity(object):
             if capthresh <= residual_byterate:
                 break
             laststablefeerate = feerate
-            procbyterate = self._allocate_byterate(feerate,
-                                                   residual_byterate)
+            procbyterate = self._allocate_byterate(
+                hashrates[idx], prevhashrates[idx], cap, prevcaps[idx],
+                residual_byterate)
             feerates.append(feerate)
             procbyterates.append(procbyterate)
             allocatedbyterate += procbyterate
@@ -100,14 +144,16 @@ class Capacity(object):
         self.procratesfn = DiscreteFunction(feerates, procbyterates)
         return laststablefeerate
 
-    def _allocate_byterate(self, feerate, txbyterate):
-        hashrate = self.hashratefn(feerate)
-        next_hashrate = self.hashratefn(feerate - 1)
+    def _allocate_byterate(self, hashrate, next_hashrate, caprate,
+                           next_caprate, txbyterate):
+        '''Allocate txbyterate to the pools with minfeerate == feerate.
+
+        hashrate and caprate are the hashrate and capacity functions at
+        feerate, and next_* are their values at feerate - 1.
+        '''
         hashrate_delta = hashrate - next_hashrate
         hashrate_prop = hashrate_delta / hashrate
 
-        caprate = self.capfn(feerate)
-        next_caprate = self.capfn(feerate - 1)
         caprate_delta = caprate - next_caprate
         caprate_prop = caprate_delta / caprate
 
@@ -120,12 +166,16 @@ class Capacity(object):
         Returns the lowest feerate at which self.txbyteratefn(feerate) /
         self.capfn(feerate) <= utilization_target.
         """
-        feerates = sorted(set(self.capfn._x + self.txbyteratefn._x))
-        for feerate in feerates:
-            try:
-                utilization = self.txbyteratefn(feerate) / self.capfn(feerate)
-            except ZeroDivisionError:
-                continue
+        if self._utilization is None:
+            feerates = merge_grids(self.capfn, self.txbyteratefn)
+            self._utilization = [
+                (feerate, txbyterate / cap)
+                for feerate, txbyterate, cap in zip(
+                    feerates,
+                    self.txbyteratefn.evaluate(feerates),
+                    self.capfn.evaluate(feerates))
+                if cap]
+        for feerate, utilization in self._utilization:
             if utilization <= utilization_target:
                 return feerate
 
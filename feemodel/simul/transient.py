@@ -1,25 +1,60 @@
 from __future__ import division
 
+import os
+import random
 import threading
 import multiprocessing
 import logging
+import mmap
+import struct
+import cPickle as pickle
+import Queue
+from array import array
+from tempfile import mkstemp
 from time import time
 from bisect import bisect_left
+from math import sqrt
 
-from feemodel.util import logexceptions
+from feemodel.util import logexceptions, DataSketch, WeightedDataSketch
+from feemodel.simul.simul import pack_entries
+from feemodel.simul.kernel import TransientKernel
 
 ITERSCHUNK = 100
-PROCESS_COMPLETE = 'process_complete'
+# Sent by a sim process after its last chunk of wait times.
+PROCESS_COMPLETE = None
+# Where TransientWorkerPool publishes the sim inputs; tmpfs on Linux.
+SHM_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else None
+WORKER_EXIT_TIMEOUT = 5
+# How often TransientWorkerPool checks that its workers are alive, while
+# waiting for their results.
+WORKER_POLL_INTERVAL = 1
+DOUBLE_SIZE = array('d').itemsize
+# With a stopping rule, the precision is checked each time the number of
+# iterations has grown by this fraction.
+PRECISION_CHECK_GROWTH = 0.1
+# Safeguard on the number of steps in fluid_waits; each one normally
+# empties a bin.
+FLUID_MAX_EVENTS = 10000
 
 logger = logging.getLogger(__name__)
 
 
+class SimProcessError(Exception):
+    """A sim process failed.
+
+    It's sent by the process in place of PROCESS_COMPLETE.
+    """
+
+
 def transientsim_core(sim, init_entries, feepoints):
     """Transient wait time generator.
 
     Each iteration yields one realization of the wait time random vector.
     feepoints should be sorted, and should not include any feerates lower than
     sim.stablefeerate.
+
+    This is the pure Python reference; transientsim uses the compiled
+    equivalent, kernel.TransientKernel.
     """
     if min(feepoints) < sim.stablefeerate:
         raise ValueError("All feepoints must be >= sim.stablefeerate.")
@@ -40,9 +75,60 @@ def transientsim_core(sim, init_entries, feepoints):
 
 def transientsim(sim, feepoints=None, init_entries=None,
                  miniters=1000, maxiters=10000, maxtime=60,
-                 numprocesses=None, stopflag=None):
-    """A multiprocessing wrapper for transientsim_core."""
-    starttime = time()
+                 numprocesses=None, stopflag=None, workerpool=None,
+                 accumulate=False, stoppingrule=None, antithetic=False,
+                 control=False, seed=None, prior=None,
+                 densefeerates=None, tilt=None, minfeerate=0):
+    """A multiprocessing wrapper for transientsim_core.
+
+    Returns (feepoints, waittimes), where waittimes is a list of the wait
+    time samples (array('d')) at each feepoint. If accumulate is True,
+    the wait times are instead added to a WaitAccumulator as they arrive,
+    which is returned in place of waittimes.
+
+    init_entries is a dict of SimEntry, or packed entries (see
+    pack_entries), as in Simul.run. The entries with feerate < minfeerate
+    (e.g. sim.stablefeerate) are excluded, along with their dependants;
+    this is done by each process on the packed arrays.
+
+    The sim stops after maxiters iterations, or after maxtime seconds
+    and miniters iterations. If stoppingrule (a PrecisionTarget) is given,
+    it also stops once the rule is met, after miniters iterations; this
+    requires accumulate to be True.
+
+    If workerpool (a TransientWorkerPool) is given, the sim is run on its
+    processes, and numprocesses is ignored. Otherwise numprocesses new
+    processes are started for this call only.
+
+    Variance reduction (these require accumulate to be True):
+        antithetic - run the realizations in antithetic pairs of block
+                     intervals (see TransientKernel)
+        control - use the control variate of the block intervals in the
+                  estimate of the expected waits
+        tilt - importance sample the realizations, with the tilt
+               factors (intervaltilt, arrivaltilt) on the mean block
+               interval and the tx arrival rate (see TransientKernel).
+               This is for the tail percentiles: congested realizations
+               are sampled more often, and weighted down accordingly
+               (see WaitAccumulator). The likelihood ratio is over all
+               the tx arrivals of a realization, so arrivaltilt should
+               be very close to 1.
+    If seed is given, the random streams of the processes are seeded from
+    it, so that calls with the same seed use common random numbers; the
+    difference between their estimates is then mostly due to the
+    difference in their inputs, rather than to sampling noise.
+
+    If prior (a WaitAccumulator from a previous run with the same
+    feepoints and variance reduction options) is given, the new wait times
+    are added to it, and it is returned; this also requires accumulate.
+    miniters and maxiters count only the new iterations, but the stopping
+    rule applies to all of them.
+
+    If densefeerates (e.g. from get_dense_feerates) is given, the mean
+    and variance of the wait times are also estimated at each of them, in
+    the same pass (see WaitAccumulator.get_dense); this requires
+    accumulate. With a prior, its densefeerates are used instead.
+    """
     if init_entries is None:
         init_entries = {}
     if not feepoints:
@@ -52,66 +138,1019 @@ def transientsim(sim, feepoints=None, init_entries=None,
                            sorted(set(feepoints)))
         if not feepoints:
             raise ValueError("No feepoints >= stablefeerate.")
+    if stoppingrule is not None and not accumulate:
+        raise ValueError("stoppingrule requires accumulate.")
+    if (antithetic or control) and not accumulate:
+        raise ValueError("Variance reduction requires accumulate.")
+    if prior is not None:
+        if not accumulate:
+            raise ValueError("prior requires accumulate.")
+        if len(prior.samples) != len(feepoints):
+            raise ValueError("Wrong number of feepoints in prior.")
+        if (prior.antithetic, prior.control, prior.tilt) != (
+                antithetic, control, _get_tilt(tilt)):
+            raise ValueError("Different variance reduction options.")
+        accumulator = prior
+    elif accumulate:
+        if densefeerates is not None:
+            densefeerates = filter(
+                lambda feerate: feerate >= sim.stablefeerate,
+                sorted(set(densefeerates)))
+        accumulator = WaitAccumulator(len(feepoints), antithetic=antithetic,
+                                      control=control,
+                                      densefeerates=densefeerates,
+                                      tilt=tilt)
+    elif densefeerates is not None:
+        raise ValueError("densefeerates requires accumulate.")
+    elif tilt is not None:
+        raise ValueError("Variance reduction requires accumulate.")
+    else:
+        accumulator = None
+    if workerpool is not None:
+        waittimes = workerpool.run(
+            sim, feepoints, init_entries, miniters=miniters,
+            maxiters=maxiters, maxtime=maxtime, stopflag=stopflag,
+            accumulator=accumulator, stoppingrule=stoppingrule, seed=seed,
+            minfeerate=minfeerate)
+        return feepoints, waittimes
     if numprocesses is None:
         numprocesses = multiprocessing.cpu_count()
 
     resultqueue = multiprocessing.Queue()
     process_stopflag = multiprocessing.Event()
     target = transientsim_process
-    args = (sim, init_entries, feepoints, resultqueue, process_stopflag)
+    kernelargs = _get_kernelargs(accumulator, minfeerate)
+    args = [(sim, init_entries, feepoints, resultqueue, process_stopflag,
+             kernelargs, _process_seed(seed, i))
+            for i in range(numprocesses)]
     if numprocesses > 1:
-        processes = [multiprocessing.Process(target=target, args=args)
+        processes = [multiprocessing.Process(target=target, args=args[i])
                      for i in range(numprocesses)]
     else:
         # Use a thread instead
-        processes = [threading.Thread(target=target, args=args)]
+        processes = [threading.Thread(target=target, args=args[0])]
     for process in processes:
         process.start()
     logger.debug("Subprocesses started ({} total)".format(numprocesses))
 
+    waittimes = collect_waittimes(
+        resultqueue, len(feepoints), numprocesses, process_stopflag,
+        miniters, maxiters, maxtime, stopflag, accumulator=accumulator,
+        stoppingrule=stoppingrule)
+
+    for process in processes:
+        process.join()
+    if stopflag and stopflag.is_set():
+        raise StopIteration
+    logger.debug("Subprocesses joined and completed.")
+
+    return feepoints, waittimes
+
+
+def collect_waittimes(resultqueue, numfeepoints, numprocesses,
+                      process_stopflag, miniters, maxiters, maxtime,
+                      stopflag, accumulator=None, stoppingrule=None,
+                      numdead=None):
+    """Collect the wait times sent by the sim processes.
+
+    Once enough have been collected, process_stopflag is set, and we
+    wait for each of the processes to send PROCESS_COMPLETE. A process
+    can also send it before then (e.g. a remote worker which is lost, see
+    remote.TransientRemotePool); if they all have, we return what has been
+    collected.
+
+    A process which fails sends a SimProcessError instead; the others are
+    then stopped, and once they have all completed or failed, the first
+    error is raised. If numdead is given, it's a function returning the
+    number of processes which have died, which is polled while waiting
+    for results; if any have, a SimProcessError is raised at once, since
+    the rest might be blocked on the lock of the resultqueue.
+
+    The processes send chunks of wait vectors as packed doubles (see
+    run_kernel), which are appended to a single array('d'). Returns a
+    list of array('d'), one for each feepoint.
+
+    If accumulator (a WaitAccumulator) is given, the chunks are instead
+    added to it as they arrive, and it is returned. In that case, a
+    stoppingrule (PrecisionTarget) can also be given, which is checked
+    every time the number of iterations has grown by
+    PRECISION_CHECK_GROWTH, once there are at least miniters.
+    """
     starttime = time()
     elapsedtime = 0
-    waitvectors = []
-    while len(waitvectors) < maxiters and (
-            len(waitvectors) < miniters or elapsedtime <= maxtime) and (
+    aggtime = 0
+    numiters = 0
+    nextcheck = miniters
+    waits = array('d')
+    rowsize = accumulator.rowsize if accumulator else numfeepoints
+    num_process_complete = 0
+    errors = []
+    getchunk = _ChunkGetter(resultqueue, numdead)
+    while numiters < maxiters and (
+            numiters < miniters or elapsedtime <= maxtime) and (
             stopflag is None or not stopflag.is_set()):
-        waitvectors.extend(resultqueue.get())
+        chunk = getchunk()
+        if isinstance(chunk, SimProcessError):
+            errors.append(chunk)
+            num_process_complete += 1
+            break
+        if chunk is PROCESS_COMPLETE:
+            num_process_complete += 1
+            if num_process_complete == numprocesses:
+                logger.warning("All sim processes completed early, "
+                               "at {} iters.".format(numiters))
+                break
+            continue
+        aggtime += _add_chunk(chunk, waits, accumulator)
+        numiters += _chunk_numbytes(chunk) // (DOUBLE_SIZE*rowsize)
         elapsedtime = time() - starttime
+        if stoppingrule is not None and numiters >= nextcheck:
+            if stoppingrule.is_met(accumulator):
+                logger.debug("Precision target met at {} iters.".format(
+                    numiters))
+                break
+            nextcheck = numiters*(1 + PRECISION_CHECK_GROWTH)
     process_stopflag.set()
     logger.debug("Subprocesses sent stop signal.")
 
-    num_process_complete = 0
     while num_process_complete < numprocesses:
-        res = resultqueue.get()
-        if res == PROCESS_COMPLETE:
+        res = getchunk()
+        if isinstance(res, SimProcessError):
+            errors.append(res)
+            num_process_complete += 1
+        elif res is PROCESS_COMPLETE:
             num_process_complete += 1
         else:
-            waitvectors.extend(res)
+            aggtime += _add_chunk(res, waits, accumulator)
+            numiters += _chunk_numbytes(res) // (DOUBLE_SIZE*rowsize)
     logger.debug("Received PROCESS_COMPLETE from all subprocesses.")
+    if errors:
+        raise errors[0]
 
-    for process in processes:
-        process.join()
-    if stopflag and stopflag.is_set():
-        raise StopIteration
-    logger.debug("Subprocesses joined and completed.")
+    aggstarttime = time()
+    if accumulator is None:
+        waittimes = [waits[i::numfeepoints] for i in range(numfeepoints)]
+    else:
+        waittimes = accumulator
+    aggtime += time() - aggstarttime
+    logger.debug("Collected {} wait vectors ({} bytes) in {:.4f}s.".format(
+        numiters, numiters*numfeepoints*DOUBLE_SIZE, aggtime))
+    return waittimes
 
-    waittimes = zip(*waitvectors)
-    return feepoints, waittimes
+
+class _ChunkGetter(object):
+    """Gets the next chunk from a result queue, for collect_waittimes.
+
+    If numdead is given, it's checked every WORKER_POLL_INTERVAL seconds,
+    and SimProcessError is raised if any process has died.
+    """
+
+    def __init__(self, resultqueue, numdead=None):
+        self.resultqueue = resultqueue
+        self.numdead = numdead
+        self.lastcheck = time()
+
+    def __call__(self):
+        if self.numdead is None:
+            return self.resultqueue.get()
+        while True:
+            if time() - self.lastcheck > WORKER_POLL_INTERVAL:
+                if self.numdead():
+                    raise SimProcessError("Sim process died.")
+                self.lastcheck = time()
+            try:
+                return self.resultqueue.get(timeout=WORKER_POLL_INTERVAL)
+            except Queue.Empty:
+                pass
+
+
+def _add_chunk(chunk, waits, accumulator):
+    """Add a chunk of packed wait vectors; returns the time taken."""
+    starttime = time()
+    if accumulator is None:
+        waits.fromstring(chunk)
+    else:
+        if isinstance(chunk, tuple):
+            chunk, densechunk = chunk
+            densestats = array('d')
+            densestats.fromstring(densechunk)
+            accumulator.add_dense(densestats)
+        chunkwaits = array('d')
+        chunkwaits.fromstring(chunk)
+        accumulator.add(chunkwaits)
+    return time() - starttime
+
+
+def _chunk_numbytes(chunk):
+    """The number of bytes of the wait vectors in a chunk."""
+    return len(chunk[0]) if isinstance(chunk, tuple) else len(chunk)
+
+
+def _get_kernelargs(accumulator, minfeerate=0):
+    """The TransientKernel options for the accumulator and minfeerate."""
+    kernelargs = {'minfeerate': minfeerate}
+    if accumulator is not None:
+        kernelargs.update({'antithetic': accumulator.antithetic,
+                           'control': accumulator.control,
+                           'densefeerates': accumulator.densefeerates,
+                           'tilt': accumulator.tilt})
+    return kernelargs
+
+
+def _get_packed(init_entries):
+    """init_entries as a tuple of packed arrays (see pack_entries).
+
+    They're packed if they're a dict; the txids are dropped.
+    """
+    if isinstance(init_entries, tuple):
+        return init_entries
+    return tuple(pack_entries(init_entries)[1:])
+
+
+def _get_tilt(tilt):
+    """The tilt factors as a tuple of floats, or None if no tilt."""
+    if tilt is None:
+        return None
+    return tuple(map(float, tilt))
 
 
-@logexceptions
 def transientsim_process(sim, init_entries, feepoints, resultqueue,
-                         stopflag):
-    waitvectors = []
-    for waitvector in transientsim_core(sim, init_entries, feepoints):
-        waitvectors.append(waitvector)
+                         stopflag, kernelargs=None, seed=None):
+    try:
+        kernel = make_kernel(sim, feepoints, init_entries, seed=seed,
+                             **(kernelargs or {}))
+        run_kernel(kernel, resultqueue, stopflag)
+    except Exception as e:
+        _send_error(e, resultqueue)
+
+
+def _send_error(e, resultqueue):
+    """Log an exception in a sim process, and send it as an error."""
+    logger.exception("{} in sim process.".format(e.__class__.__name__))
+    resultqueue.put(SimProcessError(repr(e)))
+
+
+def make_kernel(sim, feepoints, init_entries, seed=None, **kwargs):
+    """Make a TransientKernel, with its random streams seeded from seed.
+
+    The kernel's streams are all seeded from the random module when it is
+    made, so we just need to seed that; its state is restored after.
+    kwargs are passed to TransientKernel.
+    """
+    if seed is None:
+        return TransientKernel(sim, feepoints, init_entries=init_entries,
+                               **kwargs)
+    state = random.getstate()
+    random.seed(seed)
+    try:
+        return TransientKernel(sim, feepoints, init_entries=init_entries,
+                               **kwargs)
+    finally:
+        random.setstate(state)
+
+
+def _process_seed(seed, processidx):
+    """The seed of each sim process, so they have distinct streams."""
+    if seed is None:
+        return None
+    return hash((seed, processidx))
+
+
+def run_kernel(kernel, resultqueue, stopflag):
+    """Send chunks of wait vectors to resultqueue till stopflag is set.
+
+    Each chunk is sent as the packed doubles of the array returned by
+    TransientKernel.run, i.e. a str which is pickled as is. If the kernel
+    has densefeerates, the chunk is a tuple of that, and the packed
+    doubles of TransientKernel.pop_dense.
+    """
+    while True:
+        waits = kernel.run(ITERSCHUNK, stopflag=stopflag)
+        if kernel.dense:
+            resultqueue.put((waits.tostring(),
+                             kernel.pop_dense().tostring()))
+        else:
+            resultqueue.put(waits.tostring())
         if stopflag.is_set():
-            resultqueue.put(waitvectors)
             resultqueue.put(PROCESS_COMPLETE)
             break
-        if len(waitvectors) == ITERSCHUNK:
-            resultqueue.put(waitvectors)
-            waitvectors = []
+
+
+class TransientWorkerPool(object):
+    """A long-lived pool of transient sim processes.
+
+    transientsim otherwise starts new processes on each call, which are
+    torn down at the end. With a worker pool, the processes are started
+    once, and are reused across calls.
+
+    The Simul is pickled to a shared memory file, one per version of its
+    inputs: it is only republished, and unpickled by the workers, if it
+    has changed since the last call, i.e. if its pools, tx source or
+    capacity are not the same objects as before, or its stablefeerate is
+    different. The initial mempool entries are published on each call, as
+    packed arrays (see pack_entries) in another shared memory file.
+
+    The workers still copy the entry arrays out of the file, and make a
+    new kernel (with its SimMempool) for each call, since the entries and
+    feepoints normally differ from one call to the next.
+
+    The kernel options (antithetic, control, densefeerates, tilt) are
+    taken from the accumulator, and the seed is as in transientsim.
+
+    If the sim fails in the workers, SimProcessError is raised; if a
+    worker has died, the pool is restarted, so it can still be used.
+    """
+
+    def __init__(self, numprocesses=None):
+        if numprocesses is None:
+            numprocesses = multiprocessing.cpu_count()
+        self.numprocesses = numprocesses
+        self._simversion = 0
+        self._simpath = None
+        self._start()
+        logger.debug("Worker pool started ({} total)".format(numprocesses))
+
+    def run(self, sim, feepoints, init_entries, miniters=1000,
+            maxiters=10000, maxtime=60, stopflag=None, accumulator=None,
+            stoppingrule=None, seed=None, minfeerate=0):
+        """Run the transient sim.
+
+        Returns a list of array('d') of the wait times, one for each
+        feepoint; or if accumulator (a WaitAccumulator) is given, the
+        wait times are added to it, and it is returned. init_entries,
+        stoppingrule and minfeerate are as in transientsim.
+
+        feepoints should be sorted, and >= sim.stablefeerate.
+        """
+        if self.processes is None:
+            raise ValueError("Worker pool is closed.")
+        self._restart_dead()
+        siminputs = get_siminputs(sim)
+        if siminputs_changed(siminputs, self._siminputs):
+            self._publish_sim(sim)
+            self._siminputs = siminputs
+        fd, path = mkstemp(prefix='feemodel', dir=SHM_DIR)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                write_arrays(f, _get_packed(init_entries))
+            self.stopflag.clear()
+            kernelargs = _get_kernelargs(accumulator, minfeerate)
+            for i, cmdqueue in enumerate(self.cmdqueues):
+                cmdqueue.put((self._simpath, self._simversion, path,
+                              list(feepoints), kernelargs,
+                              _process_seed(seed, i)))
+            waittimes = collect_waittimes(
+                self.resultqueue, len(feepoints), self.numprocesses,
+                self.stopflag, miniters, maxiters, maxtime, stopflag,
+                accumulator=accumulator, stoppingrule=stoppingrule,
+                numdead=self._numdead)
+        except SimProcessError:
+            self._restart_dead()
+            raise
+        finally:
+            os.remove(path)
+        if stopflag and stopflag.is_set():
+            raise StopIteration
+        return waittimes
+
+    def close(self):
+        """Stop the worker processes.
+
+        They are terminated if they don't exit in time, e.g. if they are
+        blocked on sending results which will not be collected.
+        """
+        if self.processes is None:
+            return
+        self.stopflag.set()
+        for cmdqueue in self.cmdqueues:
+            cmdqueue.put(None)
+        for process in self.processes:
+            process.join(WORKER_EXIT_TIMEOUT)
+            if process.is_alive():
+                process.terminate()
+        self.processes = None
+        self._remove_sim()
+        logger.debug("Worker pool closed.")
+
+    def _publish_sim(self, sim):
+        """Pickle sim to a new shared memory file, as the next version."""
+        simversion = self._simversion + 1
+        fd, simpath = mkstemp(
+            prefix='feemodel-sim{}-'.format(simversion), dir=SHM_DIR)
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(sim, f, 2)
+        self._remove_sim()
+        self._simpath = simpath
+        self._simversion = simversion
+
+    def _remove_sim(self):
+        if self._simpath is not None:
+            os.remove(self._simpath)
+            self._simpath = None
+
+    def _start(self):
+        """Start the worker processes, with new queues."""
+        self.resultqueue = multiprocessing.Queue()
+        self.stopflag = multiprocessing.Event()
+        self.cmdqueues = [multiprocessing.Queue()
+                          for i in range(self.numprocesses)]
+        self.processes = [
+            multiprocessing.Process(
+                target=transientpool_process,
+                args=(cmdqueue, self.resultqueue, self.stopflag))
+            for cmdqueue in self.cmdqueues]
+        for process in self.processes:
+            process.daemon = True
+            process.start()
+        self._siminputs = None
+
+    def _numdead(self):
+        return sum([not process.is_alive() for process in self.processes])
+
+    def _restart_dead(self):
+        """Restart the pool if any worker process has died.
+
+        A process which dies might hold the lock of any of the queues, or
+        the stopflag, so they are all replaced, and the other workers are
+        terminated.
+        """
+        if not self._numdead():
+            return
+        logger.warning("Sim worker died; restarting the worker pool.")
+        for process in self.processes:
+            if process.is_alive():
+                process.terminate()
+        self._start()
+
+
+def get_siminputs(sim):
+    """The inputs of a Simul, for checking if it has changed."""
+    return (sim.pools, sim.txsource, sim.cap,
+            sim.maxmempoolsize, sim.cpfp, sim.stablefeerate)
+
+
+def siminputs_changed(siminputs, prev):
+    """Whether the Simul inputs have changed from prev.
+
+    The pools, tx source and capacity are compared by identity, and the
+    stablefeerate by value.
+    """
+    return prev is None or any([
+        a is not b for a, b in zip(siminputs[:-1], prev[:-1])]) or (
+        siminputs[-1] != prev[-1])
+
+
+@logexceptions
+def transientpool_process(cmdqueue, resultqueue, stopflag):
+    """Worker process of TransientWorkerPool.
+
+    A task which fails sends a SimProcessError, and the worker carries on
+    with the next one.
+    """
+    simversion = None
+    while True:
+        cmd = cmdqueue.get()
+        if cmd is None:
+            break
+        simpath, newsimversion, path, feepoints, kernelargs, seed = cmd
+        try:
+            if newsimversion != simversion:
+                simversion = None
+                with open(simpath, 'rb') as f:
+                    sim = pickle.load(f)
+                simversion = newsimversion
+            with open(path, 'rb') as f:
+                buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                init_entries = tuple(read_arrays(buf, ['L']*4))
+            finally:
+                buf.close()
+            kernel = make_kernel(sim, feepoints, init_entries, seed=seed,
+                                 **kernelargs)
+            run_kernel(kernel, resultqueue, stopflag)
+        except Exception as e:
+            _send_error(e, resultqueue)
+
+
+class WaitAccumulator(object):
+    """Running statistics of the wait times at each feepoint.
+
+    samples is a list of DataSketch, one for each feepoint, so the memory
+    used grows only logarithmically with the number of iterations.
+    Accumulators are mergeable, e.g. those of separate runs.
+
+    The expected waits are estimated separately, by means (one for each
+    feepoint) of a WaitMean, which does the variance reduction. If
+    antithetic is True, the wait vectors are taken to be in antithetic
+    pairs, and if control is True, to have the control variates appended
+    (see TransientKernel).
+
+    If densefeerates is given, the dense wait time stats (see
+    TransientKernel.pop_dense) are also accumulated, as densestats.
+
+    If tilt is given, the wait vectors are taken to be importance sampled,
+    with their weights appended (see TransientKernel). The samples are
+    then WeightedDataSketches, and the means are of the weighted waits;
+    get_ess gives the effective sample size.
+    """
+
+    def __init__(self, numfeepoints, antithetic=False, control=False,
+                 densefeerates=None, tilt=None):
+        self.tilt = _get_tilt(tilt)
+        if self.tilt is None:
+            self.samples = [DataSketch() for i in range(numfeepoints)]
+        else:
+            self.samples = [WeightedDataSketch()
+                            for i in range(numfeepoints)]
+        self.means = [WaitMean() for i in range(numfeepoints)]
+        self.antithetic = antithetic
+        self.control = control
+        # The length of each row of TransientKernel.run
+        self.rowsize = (numfeepoints*(2 if control else 1) +
+                        (1 if self.tilt else 0))
+        self.numiters = 0
+        self.densefeerates = densefeerates or None
+        self.densestats = (array('d', [0.]*(1 + 2*len(densefeerates)))
+                           if self.densefeerates else None)
+
+    def add(self, waits):
+        """Add wait vectors.
+
+        waits is a flat sequence of wait vectors in row-major order, as
+        returned by TransientKernel.run. With antithetic pairs, waits
+        should start with the first of a pair; an unpaired last vector is
+        left out of the expected wait estimates.
+        """
+        numfeepoints = len(self.samples)
+        rowsize = self.rowsize
+        if self.tilt:
+            weights = waits[rowsize-1::rowsize]
+        for i, (sample, mean) in enumerate(zip(self.samples, self.means)):
+            ys = waits[i::rowsize]
+            cs = waits[numfeepoints+i::rowsize] if self.control else None
+            if self.tilt:
+                sample.add_datapoints(ys, weights)
+                ys = [w*y for w, y in zip(weights, ys)]
+            else:
+                sample.add_datapoints(ys)
+            if self.antithetic:
+                ys = _pair_averages(ys)
+                cs = _pair_averages(cs) if self.control else None
+            mean.add(ys, cs)
+        self.numiters += len(waits) // rowsize
+
+    def add_dense(self, densestats):
+        """Add the dense wait time stats, as from TransientKernel.pop_dense.
+        """
+        if self.densestats is None:
+            raise ValueError("No densefeerates.")
+        if len(densestats) != len(self.densestats):
+            raise ValueError("Wrong number of densefeerates.")
+        for i, stat in enumerate(densestats):
+            self.densestats[i] += stat
+
+    def get_dense(self):
+        """Get the dense wait time estimates.
+
+        Returns (densefeerates, expectedwaits, stds), where stds are the
+        sample standard deviations of the wait times.
+        """
+        if self.densestats is None:
+            raise ValueError("No densefeerates.")
+        numdense = len(self.densefeerates)
+        n = self.densestats[0]
+        if n < 2:
+            raise ValueError("Need at least 2 iterations.")
+        sums = self.densestats[1:1+numdense]
+        sumsqs = self.densestats[1+numdense:]
+        expectedwaits = [s / n for s in sums]
+        stds = [sqrt(max(sumsq - s*s/n, 0) / (n - 1))
+                for s, sumsq in zip(sums, sumsqs)]
+        return self.densefeerates, expectedwaits, stds
+
+    def add_waittimes(self, waittimes):
+        """Add the wait times, given as a sample for each feepoint.
+
+        No variance reduction is done on these.
+        """
+        if len(waittimes) != len(self.samples):
+            raise ValueError("Wrong number of feepoints.")
+        if self.antithetic or self.control or self.tilt:
+            raise ValueError("Wait times have no variance reduction info.")
+        for sample, mean, waitsample in zip(
+                self.samples, self.means, waittimes):
+            sample.add_datapoints(waitsample)
+            mean.add(waitsample)
+        self.numiters += len(waittimes[0])
+
+    def merge(self, other):
+        """Merge in the wait times of another WaitAccumulator."""
+        if len(other.samples) != len(self.samples):
+            raise ValueError("Wrong number of feepoints.")
+        if (other.antithetic, other.control, other.tilt) != (
+                self.antithetic, self.control, self.tilt):
+            raise ValueError("Different variance reduction options.")
+        for sample, othersample in zip(self.samples, other.samples):
+            sample.merge(othersample)
+        for mean, othermean in zip(self.means, other.means):
+            mean.merge(othermean)
+        self.numiters += other.numiters
+        if other.densestats is not None:
+            if self.densefeerates != other.densefeerates:
+                raise ValueError("Different densefeerates.")
+            self.add_dense(other.densestats)
+
+    def downweight(self, weight):
+        """Scale down the weight of the wait times so far.
+
+        The sketches keep a random subsample, of fraction weight, and the
+        expected wait estimates count each unit as weight units. This is
+        for reusing the wait times, e.g. of a previous run, in proportion
+        to their age.
+        """
+        for sample, mean in zip(self.samples, self.means):
+            sample.downsample(weight)
+            mean.downweight(weight)
+        self.numiters = int(round(self.numiters*weight))
+        if self.densestats is not None:
+            for i in range(len(self.densestats)):
+                self.densestats[i] *= weight
+
+    def get_ess(self):
+        """The effective sample size of the samples.
+
+        This is just numiters, if not importance sampled.
+        """
+        if self.tilt is None:
+            return self.numiters
+        return self.samples[0].ess
+
+    def get_expectedwaits(self):
+        """Returns (expectedwaits, stderrs), lists over the feepoints."""
+        estimates = [mean.get_estimate(self.control) for mean in self.means]
+        return [e[0] for e in estimates], [e[1] for e in estimates]
+
+    def get_reduction_factors(self):
+        """Returns the variance reduction factor at each feepoint.
+
+        This is the variance of the plain sample mean of the waits,
+        divided by that of the estimate from get_expectedwaits.
+        """
+        factors = []
+        dum, stderrs = self.get_expectedwaits()
+        for sample, stderr in zip(self.samples, stderrs):
+            if self.numiters < 2 or stderr == float("inf"):
+                factors.append(None)
+                continue
+            sample.calc_stats()
+            naive_var = sample.std**2 / self.numiters
+            if stderr == 0:
+                factors.append(1. if naive_var == 0 else float("inf"))
+            else:
+                factors.append(naive_var / stderr**2)
+        return factors
+
+
+class WaitMean(object):
+    """Running estimate of the expected wait, with a control variate.
+
+    Each unit added is an independent, identically distributed wait
+    estimate y (a single wait, or the average of an antithetic pair),
+    with a control variate c of zero mean. The estimate of E[y] is the
+    regression estimator ymean - beta*cmean, with beta = cov(y, c) /
+    var(c).
+
+    The sample moments are updated in batches (Chan et al.), so that
+    WaitMeans are mergeable.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.ymean = 0.
+        self.cmean = 0.
+        # The sums of squared deviations, and cross deviations
+        self.yy = 0.
+        self.cc = 0.
+        self.yc = 0.
+
+    def add(self, ys, cs=None):
+        """Add units ys, with their control variates cs (if any)."""
+        if not len(ys):
+            return
+        if cs is None:
+            cs = [0.]*len(ys)
+        batch = WaitMean()
+        batch.n = len(ys)
+        batch.ymean = sum(ys) / batch.n
+        batch.cmean = sum(cs) / batch.n
+        for y, c in zip(ys, cs):
+            dy = y - batch.ymean
+            dc = c - batch.cmean
+            batch.yy += dy*dy
+            batch.cc += dc*dc
+            batch.yc += dy*dc
+        self.merge(batch)
+
+    def merge(self, other):
+        if not other.n:
+            return
+        n = self.n + other.n
+        dy = other.ymean - self.ymean
+        dc = other.cmean - self.cmean
+        w = self.n*other.n / n
+        self.yy += other.yy + dy*dy*w
+        self.cc += other.cc + dc*dc*w
+        self.yc += other.yc + dy*dc*w
+        self.ymean += dy*other.n / n
+        self.cmean += dc*other.n / n
+        self.n = n
+
+    def downweight(self, weight):
+        """Count each unit as weight units."""
+        if not 0 <= weight <= 1:
+            raise ValueError("weight must be in [0, 1].")
+        self.n *= weight
+        self.yy *= weight
+        self.cc *= weight
+        self.yc *= weight
+
+    def get_estimate(self, control=False):
+        """Returns (mean, stderr) of the expected wait estimate.
+
+        If control is False, or the control variates have zero variance,
+        this is just the sample mean.
+        """
+        if control and self.cc > 0 and self.n > 2:
+            beta = self.yc / self.cc
+            mean = self.ymean - beta*self.cmean
+            variance = max(self.yy - beta*self.yc, 0) / (self.n - 2)
+        elif self.n > 1:
+            mean = self.ymean
+            variance = self.yy / (self.n - 1)
+        else:
+            return self.ymean if self.n else None, float("inf")
+        return mean, sqrt(variance / self.n)
+
+
+def _pair_averages(a):
+    """Average of each consecutive pair in a; an unpaired last is left out.
+    """
+    return [(x + y) / 2 for x, y in zip(a[0::2], a[1::2])]
+
+
+class PrecisionTarget(object):
+    """A stopping rule for transientsim, by the precision of the estimates.
+
+    The target is met when, at every feepoint, the relative standard
+    error of the mean wait time, and of each of the wait time percentiles
+    in percentiles, is at most rse.
+
+    The precision (see get_precision) at the last check is kept in
+    self.precision; if the target was met, it's the precision at the
+    stopping point. The wait times which arrive after that are still
+    added, so the final precision can differ slightly.
+    """
+
+    def __init__(self, rse, percentiles=()):
+        if rse <= 0:
+            raise ValueError("rse must be positive.")
+        self.rse = rse
+        self.percentiles = sorted(percentiles)
+        self.precision = None
+
+    @classmethod
+    def from_ci_width(cls, width, percentiles=(), z=1.96):
+        """Target the relative width of the (by default) 95% CIs.
+
+        width is the full width of the confidence interval, divided by
+        the estimate.
+        """
+        return cls(width / (2*z), percentiles=percentiles)
+
+    def is_met(self, accumulator):
+        self.precision = get_precision(accumulator, self.percentiles)
+        return max(self.precision['maxrse']) <= self.rse
+
+    def __repr__(self):
+        return "PrecisionTarget(rse: {}, percentiles: {})".format(
+            self.rse, self.percentiles)
+
+
+def get_precision(accumulator, percentiles=(), z=1.96):
+    """Get the relative standard errors of the wait time estimates.
+
+    Returns a dict with, for each feepoint,
+        expectedwaits - the relative standard error of the expected wait
+                        estimate (see WaitAccumulator.get_expectedwaits)
+        percentiles - a list, for each p in percentiles, of the relative
+                      standard error of the pth percentile
+        maxrse - the max of the above
+
+    The standard error of a percentile is estimated from the spread of
+    the order statistics: (q(p+d) - q(p-d)) / (2*z), with
+    d = z*sqrt(p*(1-p)/n), i.e. the normal approximation of its
+    distribution-free CI. With importance sampling, n is the effective
+    sample size.
+    """
+    n = accumulator.get_ess()
+    percentiles = sorted(percentiles)
+    precision = {
+        'expectedwaits': [],
+        'percentiles': [[] for p in percentiles],
+        'maxrse': []
+    }
+    expectedwaits, stderrs = accumulator.get_expectedwaits()
+    for sample, expectedwait, stderr in zip(
+            accumulator.samples, expectedwaits, stderrs):
+        if n < 2:
+            precision['expectedwaits'].append(float("inf"))
+            for rses in precision['percentiles']:
+                rses.append(float("inf"))
+            precision['maxrse'].append(float("inf"))
+            continue
+        sample.calc_stats()
+        rses = [_relative(stderr, expectedwait)]
+        ps = []
+        for p in percentiles:
+            d = z*sqrt(p*(1-p)/n)
+            ps.append((max(p-d, 0), p, min(p+d, 1)))
+        allps = sorted(set(sum(ps, ())))
+        qs = dict(zip(allps, sample.get_percentiles(allps)))
+        for i, (p_lo, p, p_hi) in enumerate(ps):
+            rses.append(_relative((qs[p_hi] - qs[p_lo]) / (2*z), qs[p]))
+            precision['percentiles'][i].append(rses[-1])
+        precision['expectedwaits'].append(rses[0])
+        precision['maxrse'].append(max(rses))
+    return precision
+
+
+def _relative(error, estimate):
+    if error == 0:
+        return 0.
+    if estimate == 0:
+        return float("inf")
+    return error / abs(estimate)
+
+
+def write_arrays(f, arrays):
+    """Write a list of arrays to file f, for reading with read_arrays."""
+    f.write(struct.pack('<Q', len(arrays)))
+    for a in arrays:
+        f.write(struct.pack('<Q', len(a)))
+    for a in arrays:
+        a.tofile(f)
+
+
+def read_arrays(buf, typecodes):
+    """Read the arrays written by write_arrays from buffer buf.
+
+    The arrays are copies, so buf can be closed after.
+    """
+    numarrays, = struct.unpack_from('<Q', buf, 0)
+    if numarrays != len(typecodes):
+        raise ValueError("Wrong number of arrays.")
+    lengths = struct.unpack_from('<{}Q'.format(numarrays), buf, 8)
+    offset = 8*(numarrays+1)
+    arrays = []
+    for typecode, length in zip(typecodes, lengths):
+        a = array(typecode)
+        nbytes = length*a.itemsize
+        a.fromstring(buf[offset:offset+nbytes])
+        arrays.append(a)
+        offset += nbytes
+    return arrays
+
+
+def get_dense_feerates(sim, init_entries):
+    """Returns all the feerates >= sim.stablefeerate at which the wait
+    time can change.
+
+    The wait time at feerate f is the time till the first block with
+    sfr <= f, so, as a function of f, it only changes at the values
+    which the sfr can take: a tx feerate (of the initial mempool or the
+    tx source) plus one, or a pool minfeerate (and stablefeerate, which
+    is the floor of the sfr). This is exact except for CPFP, where the
+    sfr can also be a package feerate plus one.
+
+    init_entries can be packed entries, as in transientsim.
+    """
+    stablefeerate = sim.stablefeerate
+    if isinstance(init_entries, tuple):
+        entry_feerates = init_entries[0]
+    else:
+        entry_feerates = [entry.feerate for entry in init_entries.values()]
+    feerates = set([stablefeerate])
+    feerates.update([feerate + 1 for feerate in entry_feerates])
+    feerates.update([feerate + 1 for feerate in sim.cap.txbyteratefn._x])
+    feerates.update(sim.cap.capfn._x)
+    return sorted([feerate for feerate in feerates
+                   if stablefeerate <= feerate < float("inf")])
+
+
+def fluid_waits(sim, mempool_sizefn, feepoints=None):
+    """Approximate expected waits, from a deterministic fluid model.
+
+    This takes milliseconds, so it can be used while the sim runs. The tx
+    arrivals and the block capacity are taken as continuous flows at
+    their mean rates (sim.cap.txbyteratefn and capfn). The capacity goes
+    to the highest feerates first, with each pool's capacity only going
+    to those at least its minfeerate, and the mempool backlog
+    (mempool_sizefn, as from MempoolState.get_sizefn) drains accordingly.
+    The wait at each feepoint is then the time till the backlog at or
+    above it is cleared, plus the mean time to the next block from a pool
+    which accepts it.
+
+    Returns (feepoints, waits, stds). The std is that of the time to the
+    next block, i.e. the clearing time is taken as deterministic. Entries
+    below sim.stablefeerate are ignored, as in transientsim; feepoints
+    defaults to get_default_feepoints(sim), and those at which the
+    backlog doesn't clear are left out.
+    """
+    if not feepoints:
+        feepoints = get_default_feepoints(sim)
+    feepoints = filter(lambda feerate: feerate >= sim.stablefeerate,
+                       sorted(set(feepoints)))
+    capfn = sim.cap.capfn
+    # Each bin is from a grid feerate up to the next higher one. The pools'
+    # minfeerates are included, so that each pool accepts all or none of
+    # each bin.
+    grid = sorted(set(feepoints) | set(
+        [feerate for feerate in capfn._x if feerate > feepoints[0]]))
+    txbyterates = sim.cap.txbyteratefn.evaluate(grid)
+    sizes = mempool_sizefn.evaluate(grid)
+    # From here, the bins are in descending order of feerate.
+    grid.reverse()
+    txbyterates.reverse()
+    sizes.reverse()
+    numbins = len(grid)
+    arrivals = [txbyterates[0]] + [
+        txbyterates[i] - txbyterates[i-1] for i in range(1, numbins)]
+    backlogs = [sizes[0]] + [
+        sizes[i] - sizes[i-1] for i in range(1, numbins)]
+    # (minfeerate, capacity) of each group of pools, in descending order
+    poolcaps = [
+        (capfn._x[i], capfn._y[i] - capfn._y[i-1])
+        for i in reversed(range(1, len(capfn)))
+        if capfn._y[i] > capfn._y[i-1]]
+
+    cleartimes = [None]*numbins
+    simtime = 0.
+    numcleared = 0
+    for numevents in xrange(FLUID_MAX_EVENTS):
+        while numcleared < numbins and not backlogs[numcleared]:
+            cleartimes[numcleared] = simtime
+            numcleared += 1
+        if numcleared == numbins:
+            break
+        # The net inflow of each bin, with the capacity allocated from
+        # the highest feerate down; each bin is served first by the pools
+        # with the highest minfeerate, since they can't serve lower bins.
+        netrates = []
+        availcaps = []
+        poolidx = 0
+        for feerate, arrival, backlog in zip(grid, arrivals, backlogs):
+            while (poolidx < len(poolcaps) and
+                   poolcaps[poolidx][0] <= feerate):
+                availcaps.append(poolcaps[poolidx][1])
+                poolidx += 1
+            demand = float("inf") if backlog else arrival
+            served = 0.
+            while availcaps and served < demand:
+                allocated = min(availcaps[-1], demand - served)
+                served += allocated
+                availcaps[-1] -= allocated
+                if not availcaps[-1]:
+                    availcaps.pop()
+            netrates.append(arrival - served)
+        # Advance to the next time a bin is emptied.
+        draining = [(backlog / -netrate, idx)
+                    for idx, (backlog, netrate) in enumerate(
+                        zip(backlogs, netrates))
+                    if backlog and netrate < 0]
+        if not draining:
+            break
+        timedelta, emptyidx = min(draining)
+        simtime += timedelta
+        backlogs = [max(backlog + netrate*timedelta, 0)
+                    for backlog, netrate in zip(backlogs, netrates)]
+        backlogs[emptyidx] = 0
+
+    cleartimes.reverse()
+    grid.reverse()
+    hashrates = sim.cap.hashratefn.evaluate(feepoints)
+    blockrate = sim.pools.blockrate / sim.pools.calc_totalhashrate()
+    waits = []
+    stds = []
+    clearedfeepoints = []
+    for feepoint, hashrate in zip(feepoints, hashrates):
+        cleartime = cleartimes[bisect_left(grid, feepoint)]
+        if cleartime is None or not hashrate:
+            continue
+        blockinterval = 1 / (blockrate*hashrate)
+        clearedfeepoints.append(feepoint)
+        waits.append(cleartime + blockinterval)
+        stds.append(blockinterval)
+    return clearedfeepoints, waits, stds
 
 
 def get_default_feepoints(sim, numpoints=20):
@@ -1,3 +1,6 @@
+from feemodel.simul.variates cimport Variates
+
+
 cdef struct TxStruct:
     unsigned long feerate
     unsigned long size
@@ -19,9 +22,28 @@ cdef class TxSampleArray:
 
     cdef:
         TxArray txsample
-        int _randlimit
+        # Alias tables for weighted sampling; NULL if unweighted.
+        double *_prob
+        int *_alias
+
+    cdef unsigned long long sample(self, TxPtrArray *txs, int l,
+                                   Variates variates, double minfeerate=*)
+
+
+cdef class TxEmitter:
+
+    cdef:
+        # The SimMempool; typed as object to avoid a circular cimport.
+        object mempool
+        TxSampleArray txsample_array
+        Variates variates
+        readonly double txrate
+        # The factor on txrate (for importance sampling), and the number
+        # of txs emitted, including those rejected by the mempool.
+        public double tilt
+        public long numemitted
 
-    cdef void sample(self, TxPtrArray *txs, int l)
+    cdef void emit(self, double time_interval)
 
 
 # ====================
@@ -39,5 +61,4 @@ cdef TxPtrArray txptrarray_init(int maxsize)
 cdef void txptrarray_append(TxPtrArray *a, TxStruct *tx)
 cdef void txptrarray_extend(TxPtrArray *a, TxPtrArray b)
 cdef void txptrarray_resize(TxPtrArray *a, int newmaxsize)
-cdef void txptrarray_copy(TxPtrArray source, TxPtrArray *dest)
 cdef void txptrarray_deinit(TxPtrArray a)
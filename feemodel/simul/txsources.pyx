@@ -1,22 +1,21 @@
 from __future__ import division
 
-from libc.stdlib cimport rand, srand, RAND_MAX
 from libc.time cimport time
 from libc.limits cimport ULONG_MAX
 from cpython.mem cimport (PyMem_Malloc as malloc,
                           PyMem_Realloc as realloc,
                           PyMem_Free as free)
 from feemodel.simul.simul cimport SimMempool
+from feemodel.simul.variates cimport Variates, init_alias_table
 
-from math import exp
-from random import random, normalvariate, getrandbits
+from random import random
+from collections import defaultdict
+from itertools import repeat
 from bisect import bisect_left
-from itertools import groupby
-from operator import attrgetter
 
 from tabulate import tabulate
 
-from feemodel.util import DataSample, cumsum_gen, StepFunction, round_random
+from feemodel.util import DataSample, cumsum_gen, StepFunction
 
 DEF OVERALLOCATE = 2  # This better be > 1.
 
@@ -37,22 +36,60 @@ class SimTx(object):
 
 class SimTxSource(object):
 
-    def __init__(self, txsample, txrate):
+    # For compatibility with instances pickled before weights were added.
+    weights = None
+
+    def __init__(self, txsample, txrate, weights=None):
+        '''Tx source with arrivals at txrate, drawn from txsample.
+
+        weights is an optional list of non-negative weights, one per tx in
+        txsample, specifying the relative probability of each tx being
+        drawn. If None, the txs are drawn uniformly. The weights are
+        frequency weights: a tx with weight 2 counts as two txs in the
+        sample, for the purpose of the standard error in
+        calc_mean_byterate. So a histogram of the txs by (feerate, size),
+        i.e. the unique txs weighted by their counts, is equivalent to the
+        full sample (see compress).
+        '''
         self.txsample = txsample
         self.txrate = txrate
+        self.weights = weights
 
     def check(self):
         if not self.txrate or not self.txsample:
             raise ValueError("Null source.")
-
-    def get_emitter(self, SimMempool mempool not None, feeratethresh=0):
+        if self.weights is not None:
+            if len(self.weights) != len(self.txsample):
+                raise ValueError("Number of weights must equal samplesize.")
+            if any([w < 0 for w in self.weights]) or not sum(self.weights):
+                raise ValueError("Bad weights.")
+
+    def get_emitter(self, SimMempool mempool not None, feeratethresh=0,
+                    Variates variates=None):
+        '''Get a TxEmitter, which emits txs into mempool.
+
+        variates is the Variates stream from which the number of arrivals,
+        and the txs, are drawn; if None, a new one is used.
+        '''
         cdef int i
         self.check()
-        txsample_filtered = filter(lambda tx: tx.feerate >= feeratethresh,
-                                   self.txsample)
-        txsample_array = TxSampleArray(txsample_filtered)
+        if variates is None:
+            variates = Variates()
+        weights = self._get_weights()
+        filtered = [
+            (tx, w) for tx, w in zip(self.txsample, weights)
+            if tx.feerate >= feeratethresh]
+        if filtered:
+            txsample_filtered, weights_filtered = zip(*filtered)
+        else:
+            txsample_filtered, weights_filtered = [], []
+        if self.weights is None:
+            txsample_array = TxSampleArray(txsample_filtered)
+        else:
+            txsample_array = TxSampleArray(
+                txsample_filtered, weights=weights_filtered)
         if self.txrate:
-            filtered_txrate = (len(txsample_filtered) / len(self.txsample) *
+            filtered_txrate = (sum(weights_filtered) / sum(weights) *
                                self.txrate)
         else:
             filtered_txrate = 0
@@ -64,38 +101,27 @@ class SimTxSource(object):
                         txsample_array.txsample.txs + i <
                         mempool.init_array.txs + mempool.init_array.size)
 
-        srand(getrandbits(8*sizeof(unsigned int)))
-
-        def tx_emitter(time_interval):
-            """Emit new txs into mempool.
-
-            Number of new txs is a Poisson R.V. with expected value equal to
-            filtered_txrate * time_interval.
-
-            This is called in Simul.run once per simblock; time_interval is
-            thus the block interval.
-            """
-            numtxs = poissonvariate(filtered_txrate*time_interval)
-            txsample_array.sample(&mempool.txqueue, numtxs)
-
-        return tx_emitter
+        # The mempool will hold pointers into txsample_array.
+        mempool._txsample_array = txsample_array
+        return TxEmitter(mempool, txsample_array, variates, filtered_txrate)
 
     def get_byteratefn(self):
         # FIXME: doesn't work with samplesize = 1 (DataSample requirement).
         self.check()
-        n = len(self.txsample)
-
-        def byterate_groupsum(grouptuple):
-            """Sum all tx sizes in a feerate group.
-
-            A feerate group is all the txs which have the same feerate.
-            """
-            return sum([tx.size for tx in grouptuple[1]])*self.txrate/n
-
-        txsample = sorted(self.txsample, key=attrgetter("feerate"), reverse=True)
-        feerates = sorted(set(map(attrgetter("feerate"), txsample)))
+        weights = self._get_weights()
+        totalweight = sum(weights)
+
+        # Sum the (weighted) tx sizes in each feerate group, i.e. all the
+        # txs which have the same feerate. This is linear in the sample
+        # size; only the distinct feerates need to be sorted.
+        groupbytes = defaultdict(int)
+        for tx, w in zip(self.txsample, weights):
+            groupbytes[tx.feerate] += tx.size*w
+        feerates = sorted(groupbytes)
         byterates = list(cumsum_gen(
-            groupby(txsample, attrgetter("feerate")), mapfn=byterate_groupsum))
+            reversed(feerates),
+            mapfn=lambda feerate: (
+                groupbytes[feerate]*self.txrate/totalweight)))
         byterates.reverse()
 
         feerates.append(feerates[-1] + 1)
@@ -111,9 +137,37 @@ class SimTxSource(object):
         '''
         self.check()
 
-        d = DataSample([tx.size*self.txrate for tx in self.txsample])
-        d.calc_stats()
-        return d.mean, d.std / len(self.txsample)**0.5
+        if self.weights is None:
+            d = DataSample([tx.size*self.txrate for tx in self.txsample])
+            d.calc_stats()
+            return d.mean, d.std / len(self.txsample)**0.5
+
+        # Weighted mean and standard error, with frequency weights.
+        n = sum(self.weights)
+        if n <= 1:
+            raise ValueError("Need at least 2 datapoints.")
+        byterates = [tx.size*self.txrate for tx in self.txsample]
+        mean = sum([b*w for b, w in zip(byterates, self.weights)]) / n
+        variance = sum([
+            w*(b - mean)**2 for b, w in zip(byterates, self.weights)
+        ]) / (n - 1)
+        return mean, (variance / n)**0.5
+
+    def compress(self):
+        '''Get the equivalent source with txsample as a histogram.
+
+        Returns a SimTxSource whose txsample is the unique txs by
+        (feerate, size), with weights the (weighted) count of each.
+        '''
+        hist = TxHistogram()
+        hist.add(self.txsample, self.weights)
+        txsample, weights = hist.get_sample()
+        return SimTxSource(txsample, self.txrate, weights=weights)
+
+    def _get_weights(self):
+        if self.weights is None:
+            return [1]*len(self.txsample)
+        return self.weights
 
     def __str__(self):
         if not self:
@@ -134,38 +188,185 @@ class SimTxSource(object):
         return self.txrate is not None
 
 
+class TxHistogram(object):
+    '''Histogram of txs by (feerate, size), with real-valued weights.
+
+    The weights are stored relative to a common scale factor, so that all
+    of them can be rescaled (e.g. decayed) in O(1).
+    '''
+
+    def __init__(self):
+        self.bins = {}
+        self.scale = 1.
+        self._rawtotal = 0.
+
+    def add(self, txs, weights=None):
+        '''Add txs, each with weight 1 (or as specified in weights).'''
+        bins = self.bins
+        if weights is None:
+            weights = repeat(1., len(txs))
+        for tx, w in zip(txs, weights):
+            key = (tx.feerate, tx.size)
+            rawweight = w / self.scale
+            bins[key] = bins.get(key, 0.) + rawweight
+            self._rawtotal += rawweight
+
+    def rescale(self, factor):
+        '''Multiply all weights by factor.'''
+        self.scale *= factor
+        if self.scale < 1e-100:
+            # Renormalize to scale 1 before the raw weights overflow.
+            for key in self.bins:
+                self.bins[key] *= self.scale
+            self._rawtotal *= self.scale
+            self.scale = 1.
+
+    def thin(self, minweight):
+        '''Randomly thin out the bins with weight < minweight.
+
+        Each such bin is kept with probability weight / minweight, and if
+        kept, its weight is set to minweight; so the expected weight of
+        each bin is unchanged. The weights are renormalized to scale 1.
+        '''
+        bins = {}
+        for key, rawweight in self.bins.iteritems():
+            w = rawweight*self.scale
+            if w >= minweight:
+                bins[key] = w
+            elif random()*minweight < w:
+                bins[key] = minweight
+        self.bins = bins
+        self.scale = 1.
+        self._rawtotal = sum(bins.values())
+
+    def get_totalweight(self):
+        return self._rawtotal*self.scale
+
+    def get_sample(self):
+        '''Get the histogram as (txsample, weights) lists.'''
+        txsample = []
+        weights = []
+        for (feerate, size), rawweight in self.bins.iteritems():
+            txsample.append(SimTx(feerate, size))
+            weights.append(rawweight*self.scale)
+        return txsample, weights
+
+    def copy(self):
+        hist = TxHistogram()
+        hist.bins = self.bins.copy()
+        hist.scale = self.scale
+        hist._rawtotal = self._rawtotal
+        return hist
+
+    def __len__(self):
+        return len(self.bins)
+
+
+cdef class TxEmitter:
+    '''Emits txs into a SimMempool (see SimTxSource.get_emitter).
+
+    Calling it with a time interval emits the txs arriving in that interval;
+    Simul calls the C-level emit method directly, once per block.
+    '''
+
+    def __init__(self, SimMempool mempool not None,
+                 TxSampleArray txsample_array not None,
+                 Variates variates not None, double txrate):
+        self.mempool = mempool
+        self.txsample_array = txsample_array
+        self.variates = variates
+        self.txrate = txrate
+        self.tilt = 1
+        self.numemitted = 0
+
+    cdef void emit(self, double time_interval):
+        '''Emit new txs into mempool.
+
+        Number of new txs is a Poisson R.V. with expected value equal to
+        txrate * tilt * time_interval.
+        '''
+        cdef:
+            SimMempool mempool = <SimMempool>self.mempool
+            long numtxs
+        numtxs = self.variates.poisson(self.txrate*self.tilt*time_interval)
+        self.numemitted += numtxs
+        mempool.queuebytes += self.txsample_array.sample(
+            &mempool.txqueue, numtxs, self.variates,
+            minfeerate=mempool.minrelayfeerate)
+
+    def __call__(self, time_interval):
+        self.emit(time_interval)
+
+
 cdef class TxSampleArray:
 
-    def __cinit__(self, txsample):
-        cdef TxStruct tx
+    def __cinit__(self, txsample, weights=None):
+        '''If weights is not None, txs are drawn with probability
+        proportional to weights, using Walker's alias method (see
+        init_alias_table).
+        '''
+        cdef:
+            TxStruct tx
+            int n
+
+        self._prob = NULL
+        self._alias = NULL
         self.txsample = txarray_init(len(txsample))
         for idx, simtx in enumerate(txsample):
             tx.feerate = min(simtx.feerate, MAX_FEERATE)
             tx.size = simtx.size
             txarray_append(&self.txsample, tx)
-        if self.txsample.size:
-            self._randlimit = RAND_MAX - (RAND_MAX % self.txsample.size)
-        else:
-            self._randlimit = RAND_MAX
+        n = self.txsample.size
+        if weights is None or not n:
+            return
+        if len(weights) != n:
+            raise ValueError("Number of weights must equal samplesize.")
+        self._prob = <double *>malloc(n*sizeof(double))
+        self._alias = <int *>malloc(n*sizeof(int))
+        init_alias_table(weights, self._prob, self._alias)
+
+    cdef unsigned long long sample(self, TxPtrArray *txs, int num,
+                                   Variates variates, double minfeerate=0):
+        '''Append num randomly sampled txs to txs.
+
+        Returns the total size of the appended txs.
 
-    cdef void sample(self, TxPtrArray *txs, int num):
+        The txs are drawn from variates, uniformly, or with probability
+        proportional to their weights (if weighted) in O(1) time using the
+        alias tables.
+
+        Sampled txs with feerate < minfeerate are drawn but not appended;
+        this models the rejection of txs by a mempool whose min relay
+        feerate has risen.
+        '''
         cdef int newarraysize
         cdef int samplesize
+        cdef int ridx
+        cdef unsigned long long numbytes = 0
         samplesize = self.txsample.size
         if not samplesize:
-            return
+            return 0
         newarraysize = txs.size + num
         if newarraysize > txs.maxsize:
             txptrarray_resize(txs, newarraysize)
         for idx in range(num):
-            ridx = randindex(samplesize, self._randlimit)
-            txptrarray_append(txs, &self.txsample.txs[ridx])
+            if self._prob is NULL:
+                ridx = <int>(variates.uniform()*samplesize)
+            else:
+                ridx = variates.alias_index(samplesize, self._prob,
+                                            self._alias)
+            if self.txsample.txs[ridx].feerate >= minfeerate:
+                txptrarray_append(txs, &self.txsample.txs[ridx])
+                numbytes += self.txsample.txs[ridx].size
+        return numbytes
 
     def __len__(self):
         return self.txsample.size
 
     def __dealloc__(self):
         txarray_deinit(self.txsample)
+        free(self._prob)
+        free(self._alias)
 
 
 # ====================
@@ -233,50 +434,5 @@ cdef void txptrarray_resize(TxPtrArray *a, int newmaxsize):
     a.txs = <TxStruct **>realloc(a.txs, newmaxsize*sizeof(TxStruct *))
 
 
-cdef void txptrarray_copy(TxPtrArray source, TxPtrArray *dest):
-    if dest.maxsize < source.size:
-        txptrarray_resize(dest, source.size)
-    dest.size = source.size
-    for i in range(source.size):
-        dest.txs[i] = source.txs[i]
-
-
 cdef void txptrarray_deinit(TxPtrArray a):
     free(a.txs)
-
-
-cdef int randindex(int N, int randlimit):
-    '''Get a random index in the range [0, N-1].'''
-    cdef int r
-    r = RAND_MAX
-    # randlimit is always RAND_MAX - (RAND_MAX % N); we however pass it as an
-    # argument to avoid having to recompute it every time. Its purpose is to
-    # ensure the resulting R.V. has a uniform distribution over
-    # {0, 1, ..., N-1}.
-    while r >= randlimit:
-        r = rand()
-    return r % N
-
-
-cdef poissonvariate(l):
-    # http://en.wikipedia.org/wiki/Poisson_distribution
-    # #Generating_Poisson-distributed_random_variables
-    cdef:
-        float p
-        int k
-        float L
-
-    if l > 30:
-        return _normal_approx(l)
-    L = exp(-l)
-    k = 0
-    p = 1
-    while p > L:
-        k += 1
-        p *= random()
-    return int(k - 1)
-
-
-cdef _normal_approx(l):
-    '''Normal approximation of the Poisson distribution.'''
-    return round_random(normalvariate(l, l**0.5))
@@ -0,0 +1,21 @@
+from libc.stdint cimport uint64_t
+
+
+cdef class Variates:
+
+    cdef:
+        uint64_t state[4]
+        double *uniforms
+        double *exponentials
+        int uniform_idx, exponential_idx
+
+    cdef double uniform(self)
+    cdef double exponential(self)
+    cdef long poisson(self, double lam)
+    cdef int alias_index(self, int n, double *prob, int *alias)
+    cdef void _refill_uniforms(self)
+    cdef void _refill_exponentials(self)
+    cdef uint64_t _next(self)
+
+
+cdef int init_alias_table(weights, double *prob, int *alias) except -1
@@ -0,0 +1,221 @@
+'''Buffered random variate streams for the simulator.
+
+The per-block draws in the simulation (block intervals, pool selection
+and the number of tx arrivals) are taken from a Variates instance, which
+generates uniform and exponential variates in blocks of BUFSIZE, using
+the xoshiro256** generator. This keeps Python's random module out of the
+per-block path.
+
+Each Variates instance is seeded from Python's random module (unless a
+seed is given), so random.seed still makes the simulation reproducible.
+'''
+from __future__ import division
+
+from libc.math cimport exp, log, sqrt, floor, fabs, lgamma
+from libc.stdint cimport uint64_t
+from cpython.mem cimport (PyMem_Malloc as malloc,
+                          PyMem_Free as free)
+
+from random import getrandbits
+
+DEF BUFSIZE = 4096
+# Below this mean, Poisson variates are generated by inversion; above it,
+# by PTRS.
+DEF POISSON_INVERSION_MAX = 10
+
+
+cdef class Variates:
+    '''Buffered stream of uniform, exponential and Poisson variates.'''
+
+    def __cinit__(self, seed=None):
+        cdef:
+            uint64_t z
+            int i
+        self.uniforms = <double *>malloc(BUFSIZE*sizeof(double))
+        self.exponentials = <double *>malloc(BUFSIZE*sizeof(double))
+        if seed is None:
+            seed = getrandbits(64)
+        # Seed the state with splitmix64, as recommended for xoshiro.
+        z = <uint64_t>(seed & 0xFFFFFFFFFFFFFFFF)
+        for i in range(4):
+            z += 0x9E3779B97F4A7C15ULL
+            self.state[i] = splitmix64(z)
+        self.uniform_idx = BUFSIZE
+        self.exponential_idx = BUFSIZE
+
+    cdef uint64_t _next(self):
+        '''xoshiro256** (Blackman and Vigna).'''
+        cdef uint64_t result, t
+        result = rotl(self.state[1]*5, 7)*9
+        t = self.state[1] << 17
+        self.state[2] ^= self.state[0]
+        self.state[3] ^= self.state[1]
+        self.state[1] ^= self.state[2]
+        self.state[0] ^= self.state[3]
+        self.state[2] ^= t
+        self.state[3] = rotl(self.state[3], 45)
+        return result
+
+    cdef void _refill_uniforms(self):
+        cdef int i
+        for i in range(BUFSIZE):
+            # Uniform in [0, 1) with 53 bits of precision.
+            self.uniforms[i] = (self._next() >> 11) * (1. / 9007199254740992.)
+        self.uniform_idx = 0
+
+    cdef void _refill_exponentials(self):
+        cdef int i
+        for i in range(BUFSIZE):
+            self.exponentials[i] = -log(
+                1 - (self._next() >> 11) * (1. / 9007199254740992.))
+        self.exponential_idx = 0
+
+    cdef double uniform(self):
+        '''Uniform variate in [0, 1).'''
+        if self.uniform_idx == BUFSIZE:
+            self._refill_uniforms()
+        self.uniform_idx += 1
+        return self.uniforms[self.uniform_idx-1]
+
+    cdef double exponential(self):
+        '''Exponential variate with unit rate.'''
+        if self.exponential_idx == BUFSIZE:
+            self._refill_exponentials()
+        self.exponential_idx += 1
+        return self.exponentials[self.exponential_idx-1]
+
+    cdef long poisson(self, double lam):
+        '''Poisson variate with mean lam.
+
+        Uses inversion by sequential search for small lam, and the PTRS
+        transformed rejection method (Hormann, 1993) otherwise; both are
+        exact.
+        '''
+        cdef:
+            long k
+            double p, s, u, v, us
+            double slam, loglam, a, b, invalpha, vr
+
+        if lam <= 0:
+            return 0
+        if lam < POISSON_INVERSION_MAX:
+            k = 0
+            p = exp(-lam)
+            s = p
+            u = self.uniform()
+            while u > s:
+                k += 1
+                p *= lam / k
+                s += p
+                if p == 0:
+                    # Guard against rounding error in the cumulative sum.
+                    break
+            return k
+
+        slam = sqrt(lam)
+        loglam = log(lam)
+        b = 0.931 + 2.53*slam
+        a = -0.059 + 0.02483*b
+        invalpha = 1.1239 + 1.1328/(b - 3.4)
+        vr = 0.9277 - 3.6224/(b - 2)
+        while True:
+            u = self.uniform() - 0.5
+            v = self.uniform()
+            us = 0.5 - fabs(u)
+            k = <long>floor((2*a/us + b)*u + lam + 0.43)
+            if us >= 0.07 and v <= vr:
+                return k
+            if k < 0 or (us < 0.013 and v > us):
+                continue
+            if (log(v) + log(invalpha) - log(a/(us*us) + b) <=
+                    -lam + k*loglam - lgamma(k + 1)):
+                return k
+
+    cdef int alias_index(self, int n, double *prob, int *alias):
+        '''Random index in [0, n), drawn using the alias tables.
+
+        prob and alias are as set by init_alias_table. A single uniform
+        variate is used: its integer part (scaled by n) picks the column,
+        and its fractional part decides between the column and its alias.
+        '''
+        cdef:
+            double u
+            int idx
+        u = self.uniform()*n
+        idx = <int>u
+        if u - idx >= prob[idx]:
+            idx = alias[idx]
+        return idx
+
+    def random(self):
+        '''Like random.random.'''
+        return self.uniform()
+
+    def expovariate(self, double rate):
+        '''Like random.expovariate.'''
+        return self.exponential() / rate
+
+    def poissonvariate(self, double lam):
+        return self.poisson(lam)
+
+    def __dealloc__(self):
+        free(self.uniforms)
+        free(self.exponentials)
+
+
+cdef int init_alias_table(weights, double *prob, int *alias) except -1:
+    '''Set up the alias tables for drawing indices in proportion to weights.
+
+    Walker's alias method (Vose's construction): O(n) setup, and O(1) per
+    draw. prob and alias must be arrays of length n = len(weights).
+    '''
+    cdef:
+        int n, numsmall, numlarge, s, l, idx
+        int *small
+        int *large
+        double totalweight
+
+    n = len(weights)
+    totalweight = sum(weights)
+    if totalweight <= 0:
+        raise ValueError("Bad weights.")
+    small = <int *>malloc(n*sizeof(int))
+    large = <int *>malloc(n*sizeof(int))
+    numsmall = numlarge = 0
+    for idx, w in enumerate(weights):
+        prob[idx] = w*n/totalweight
+        alias[idx] = idx
+        if prob[idx] < 1:
+            small[numsmall] = idx
+            numsmall += 1
+        else:
+            large[numlarge] = idx
+            numlarge += 1
+    while numsmall and numlarge:
+        numsmall -= 1
+        s = small[numsmall]
+        l = large[numlarge-1]
+        alias[s] = l
+        prob[l] -= 1 - prob[s]
+        if prob[l] < 1:
+            numlarge -= 1
+            small[numsmall] = l
+            numsmall += 1
+    # Whatever remains has prob 1, up to rounding error.
+    for idx in range(numsmall):
+        prob[small[idx]] = 1
+    for idx in range(numlarge):
+        prob[large[idx]] = 1
+    free(small)
+    free(large)
+    return 0
+
+
+cdef inline uint64_t rotl(uint64_t x, int k):
+    return (x << k) | (x >> (64 - k))
+
+
+cdef inline uint64_t splitmix64(uint64_t z):
+    z = (z ^ (z >> 30)) * 0xBF58476D1CE4E5B9ULL
+    z = (z ^ (z >> 27)) * 0x94D049BB133111EBULL
+    return z ^ (z >> 31)
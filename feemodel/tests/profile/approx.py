@@ -0,0 +1,109 @@
+'''Benchmark StepFunction.approx against the previous implementation.
+
+The previous implementation is kept here (approx_quadratic) for comparison;
+it copies and re-sorts the approximating function for each candidate knot,
+and re-checks all the points since the last knot.
+'''
+import operator
+from copy import copy
+from time import time
+from feemodel.txmempool import MemBlock, MempoolState
+from feemodel.util import Function
+from feemodel.tests.config import test_memblock_dbfile as dbfile
+
+# flake8: noqa
+
+HEIGHTS = range(333931, 333954)
+
+
+def approx_quadratic(self, percenterror=0.05, percentstep=0.05):
+    def addpoint(f, xi, yi):
+        if xi in f._x:
+            return
+        f._x, f._y = map(list, zip(*sorted(list(f) + [(xi, yi)])))
+
+    def get_maxerror(previdx, curridx, f):
+        maxerror = 0
+        for idx in range(previdx, curridx+1):
+            x, y = selfcopy[idx]
+            curr_error = abs(y - f(x))
+            curr_error_back = abs(selfcopy(x-1) - f(x-1, use_lower=True))
+            maxerror = max(curr_error, curr_error_back, maxerror)
+        return maxerror
+
+    selfcopy = copy(self)
+    reverse = False
+    if selfcopy[-1][1] < selfcopy[0][1]:
+        reverse = True
+        selfcopy._x = map(operator.neg, reversed(selfcopy._x))
+        selfcopy._y.reverse()
+
+    selfmax = selfcopy._y[-1]
+    error_thresh = percenterror*selfmax
+    step = percentstep*selfmax
+    f = Function([selfcopy._x[0]], [selfcopy._y[0]])
+    previdx = 0
+    prev_cand_idx = None
+    idx = 0
+    while idx < len(selfcopy):
+        cand = selfcopy[idx]
+        _f = copy(f)
+        addpoint(_f, *cand)
+        maxerror = get_maxerror(previdx, idx, _f)
+        if maxerror > error_thresh:
+            if prev_cand_idx is not None:
+                addpoint(f, *selfcopy[prev_cand_idx])
+                previdx = prev_cand_idx
+            else:
+                x, y = selfcopy[idx]
+                addpoint(f, x-1, selfcopy(x-1))
+            prev_cand_idx = None
+        elif cand[1] - selfcopy[previdx][1] > step:
+            addpoint(f, *cand)
+            previdx = idx
+            prev_cand_idx = None
+            idx += 1
+        else:
+            prev_cand_idx = idx
+            idx += 1
+    if prev_cand_idx:
+        addpoint(f, *selfcopy[prev_cand_idx])
+    if reverse:
+        f._x = map(operator.neg, reversed(f._x))
+        f._y = list(reversed(f._y))
+    return f
+
+
+def get_sizefns():
+    sizefns = []
+    allentries = MempoolState(0, {})
+    for height in HEIGHTS:
+        block = MemBlock.read(height, dbfile=dbfile)
+        if block is None:
+            continue
+        sizefns.append(block.get_sizefn())
+        allentries.entries.update(block.entries)
+    # The union of all the mempools, for a larger function.
+    sizefns.append(allentries.get_sizefn())
+    return sizefns
+
+
+def timeit(approxfn, sizefns, percenterror):
+    starttime = time()
+    approxfns = [approxfn(sizefn, percenterror=percenterror)
+                 for sizefn in sizefns]
+    return approxfns, time() - starttime
+
+
+sizefns = get_sizefns()
+print("{} size functions, with {} to {} points.".format(
+    len(sizefns), min(map(len, sizefns)), max(map(len, sizefns))))
+print("percenterror\tquadratic (s)\tlinear (s)\tsame output")
+for percenterror in [0.05, 0.01, 0.001]:
+    ref, reftime = timeit(approx_quadratic, sizefns, percenterror)
+    new, newtime = timeit(
+        lambda sizefn, **kwargs: sizefn.approx(**kwargs),
+        sizefns, percenterror)
+    same = all(list(f) == list(g) for f, g in zip(ref, new))
+    print("{}\t\t{:.3f}\t\t{:.3f}\t\t{}".format(
+        percenterror, reftime, newtime, same))
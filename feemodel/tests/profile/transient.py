@@ -1,19 +1,45 @@
 import cProfile
+import pstats
 from feemodel.txmempool import MemBlock
-from feemodel.simul.transient import transientsim
+from feemodel.simul.transient import transientsim_core, get_default_feepoints
+from feemodel.simul.kernel import TransientKernel
 from feemodel.simul import Simul
 from feemodel.util import DataSample
 from feemodel.tests.config import test_memblock_dbfile as dbfile, poolsref, txref
 
 # flake8: noqa
 
+NUMITERS = 2000
+
 print(poolsref)
 init_entries = MemBlock.read(333931, dbfile=dbfile).entries
 sim = Simul(poolsref, txref)
+feepoints = get_default_feepoints(sim)
+
+
+def run_core():
+    waitvectors = []
+    for waitvector in transientsim_core(sim, init_entries, feepoints):
+        waitvectors.append(waitvector)
+        if len(waitvectors) == NUMITERS:
+            break
+    return zip(*waitvectors)
+
+
+def run_kernel():
+    kernel = TransientKernel(sim, feepoints, init_entries=init_entries)
+    waits = kernel.run(NUMITERS)
+    n = len(feepoints)
+    return [waits[i::n] for i in range(n)]
+
+
+print("Starting pure Python transientsim_core.")
+cProfile.run("waittimes = run_core()", "transient.prof")
+pstats.Stats("transient.prof").sort_stats("tottime").print_stats(10)
 
-print("Starting transientsim.")
-cProfile.run("feepoints, waittimes = transientsim("
-             "sim, init_entries=init_entries, numprocesses=1)")
+print("Starting compiled TransientKernel.")
+cProfile.run("waittimes = run_kernel()", "transient.prof")
+pstats.Stats("transient.prof").sort_stats("tottime").print_stats(10)
 print("Completed with {} iters.".format(len(waittimes[0])))
 
 print("Feerate\tMean wait")
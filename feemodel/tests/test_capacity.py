@@ -82,6 +82,26 @@ class CapacityTests(unittest.TestCase):
         print("===============")
         checkcaps(sim)
 
+    def test_reuse(self):
+        """Reusing a Capacity across Simul instances."""
+        sim = Simul(self.poolsref, self.txref)
+        inv_util = sim.cap.inv_util(0.05)
+        sim_reuse = Simul(self.poolsref, self.txref, cap=sim.cap)
+        self.assertIs(sim_reuse.cap, sim.cap)
+        self.assertEqual(sim_reuse.stablefeerate, sim.stablefeerate)
+        self.assertEqual(sim.cap.inv_util(0.05), inv_util)
+
+        # Reuse the pools' functions with a different txsource.
+        self.txref.txrate = 1.8
+        cap = sim.cap.for_txsource(self.txref)
+        self.assertIs(cap.capfn, sim.cap.capfn)
+        sim_ref = Simul(self.poolsref, self.txref)
+        sim_new = Simul(self.poolsref, self.txref, cap=cap)
+        self.assertEqual(sim_new.stablefeerate, sim_ref.stablefeerate)
+        self.assertEqual(list(sim_new.cap.procratesfn),
+                         list(sim_ref.cap.procratesfn))
+        self.assertEqual(cap.inv_util(0.05), sim_ref.cap.inv_util(0.05))
+
 
 if __name__ == '__main__':
     unittest.main()
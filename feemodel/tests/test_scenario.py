@@ -0,0 +1,152 @@
+'''Test app.scenario.'''
+import unittest
+from time import sleep
+
+from feemodel.txmempool import MempoolState
+from feemodel.app.scenario import (ScenarioEngine, expand_grid,
+                                   apply_overrides)
+from feemodel.tests.config import (poolsref, txref,
+                                   test_memblock_dbfile as dbfile)
+from feemodel.tests.test_simul import init_entries
+
+
+class FakeTransient(object):
+
+    def __init__(self):
+        mempoolstate = MempoolState.__new__(MempoolState)
+        mempoolstate.height = 333930
+        mempoolstate.entries = init_entries
+        self.resources = (poolsref, txref, mempoolstate)
+
+    def get_lastresources(self):
+        return self.resources
+
+
+class ScenarioTests(unittest.TestCase):
+
+    def setUp(self):
+        self.transient = FakeTransient()
+
+    def test_expand_grid(self):
+        overrides = expand_grid({
+            'maxblocksize': [1000000, 2000000],
+            'txrate': [0.5, 1, 1.5],
+            'mempoolheight': 333931})
+        self.assertEqual(len(overrides), 6)
+        self.assertEqual(overrides[0], {'maxblocksize': 1000000,
+                                        'mempoolheight': 333931,
+                                        'txrate': 0.5})
+        self.assertEqual(overrides[-1], {'maxblocksize': 2000000,
+                                         'mempoolheight': 333931,
+                                         'txrate': 1.5})
+        # Values are coerced to the param types.
+        overrides = expand_grid({'maxblocksize': 1e6})
+        self.assertIsInstance(overrides[0]['maxblocksize'], int)
+
+        with self.assertRaises(ValueError):
+            expand_grid({})
+        with self.assertRaises(ValueError):
+            expand_grid({'blocksize': 1000000})
+        with self.assertRaises(ValueError):
+            expand_grid({'txrate': []})
+        with self.assertRaises(ValueError):
+            expand_grid({'txrate': [1, 0]})
+        with self.assertRaises(ValueError):
+            expand_grid({'txrate': 'fast'})
+
+    def test_apply_overrides(self):
+        resources = self.transient.get_lastresources()
+        pools, tx_source, entries = apply_overrides(
+            resources, {'maxblocksize': 2000000, 'hashrate': 2,
+                        'txrate': 1.5})
+        self.assertEqual(set(pools.pools), set(poolsref.pools))
+        for name, pool in pools.pools.items():
+            self.assertEqual(pool.maxblocksize, 2000000)
+            self.assertEqual(pool.minfeerate,
+                             poolsref.pools[name].minfeerate)
+        self.assertAlmostEqual(pools.blockrate, poolsref.blockrate*2)
+        self.assertAlmostEqual(tx_source.txrate, txref.txrate*1.5)
+        self.assertIs(entries, init_entries)
+        # The resources are unchanged.
+        self.assertNotEqual(poolsref.blockrate, pools.blockrate)
+        self.assertNotEqual(txref.txrate, tx_source.txrate)
+
+        pools, tx_source, entries = apply_overrides(
+            resources, {'mempoolheight': 333931}, dbfile=dbfile)
+        self.assertEqual(set(entries), set(init_entries))
+        with self.assertRaises(ValueError):
+            apply_overrides(resources, {'mempoolheight': 1}, dbfile=dbfile)
+
+    def test_get_key(self):
+        engine = ScenarioEngine(self.transient)
+        resources = self.transient.get_lastresources()
+        key = engine.get_key(resources, {'txrate': 1.5})
+        self.assertEqual(key, engine.get_key(resources, {'txrate': 1.5}))
+        self.assertNotEqual(key, engine.get_key(resources, {'txrate': 2}))
+        mempoolstate = MempoolState.__new__(MempoolState)
+        mempoolstate.entries = dict(init_entries)
+        mempoolstate.entries.popitem()
+        self.assertNotEqual(key, engine.get_key(
+            (poolsref, txref, mempoolstate), {'txrate': 1.5}))
+
+    def test_lanes(self):
+        # By default, a single process.
+        engine = ScenarioEngine(self.transient)
+        self.assertEqual(
+            [lane.numprocesses for lane in engine._get_lanes()], [1])
+        engine = ScenarioEngine(self.transient, numprocesses=5,
+                                maxconcurrent=2)
+        self.assertEqual(
+            [lane.numprocesses for lane in engine._get_lanes()], [3, 2])
+        engine = ScenarioEngine(self.transient, numprocesses=1,
+                                maxconcurrent=2)
+        self.assertEqual(
+            [lane.numprocesses for lane in engine._get_lanes()], [1])
+        engine = ScenarioEngine(
+            self.transient, remoteworkers=[('a', 1), ('b', 1), ('c', 1)],
+            maxconcurrent=2)
+        self.assertEqual(
+            [lane.remoteworkers for lane in engine._get_lanes()],
+            [[('a', 1), ('c', 1)], [('b', 1)]])
+
+    def test_engine(self):
+        # Two lanes of one process each, so the scenarios run side by side.
+        engine = ScenarioEngine(self.transient, miniters=200, maxiters=200,
+                                cachesize=2, numprocesses=2,
+                                maxconcurrent=2, dbfile=dbfile)
+        with engine.context_start():
+            scenarios = engine.submit({'txrate': [1, 1.5]})
+            self.assertEqual(len(scenarios), 2)
+            self.assertTrue(all([s['status'] == 'pending'
+                                 for s in scenarios]))
+            for scenario in scenarios:
+                while engine.get_scenario(
+                        scenario['key'])['status'] == 'pending':
+                    sleep(0.1)
+            stats = [engine.get_scenario(s['key'])['stats']
+                     for s in scenarios]
+            for stat in stats:
+                self.assertGreaterEqual(stat['numiters'], 200)
+            # More tx arrivals, longer waits.
+            self.assertGreater(sum(stats[1]['expectedwaits']),
+                               sum(stats[0]['expectedwaits']))
+
+            # Resubmits are served from the cache.
+            resubmitted = engine.submit({'txrate': 1.5})
+            self.assertEqual(resubmitted[0]['key'], scenarios[1]['key'])
+            self.assertEqual(resubmitted[0]['status'], 'done')
+
+            # The least recently accessed is evicted.
+            engine.submit({'txrate': 2})
+            self.assertIsNone(engine.get_scenario(scenarios[0]['key']))
+            self.assertIsNotNone(engine.get_scenario(scenarios[1]['key']))
+
+            errored = engine.submit({'mempoolheight': 1})[0]
+            while engine.get_scenario(errored['key'])['status'] == 'pending':
+                sleep(0.1)
+            self.assertEqual(engine.get_scenario(errored['key'])['status'],
+                             'error')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,18 +5,24 @@ import threading
 import multiprocessing
 from time import time
 from random import seed, expovariate
-from math import log
+from math import log, exp, lgamma
 from pprint import pprint
 from collections import Counter
 from copy import deepcopy, copy
+from array import array
 
 from feemodel.txmempool import MemBlock
 from feemodel.simul import (SimPool, SimPools, Simul, SimTx, SimTxSource,
                             SimEntry)
-from feemodel.simul.pools import SimBlock
+from feemodel.simul.pools import SimBlock, SimPoolsNP
 from feemodel.tests.config import test_memblock_dbfile as dbfile
-from feemodel.simul.simul import SimMempool
-from feemodel.simul.transient import transientsim_core, transientsim
+from feemodel.simul.simul import (SimMempool, SimTrace, BlockSource,
+                                  pack_entries)
+from feemodel.simul.transient import (transientsim_core, transientsim,
+                                      make_kernel)
+from feemodel.simul.kernel import TransientKernel
+from feemodel.simul.variates import Variates
+from feemodel.simul.txsources import TxHistogram
 from feemodel.util import cumsum_gen
 from feemodel.tests.config import txref
 
@@ -51,7 +57,9 @@ class PoolSimTests(unittest.TestCase):
 
     def test_blockgen(self):
         """Test the convergence of the random gen."""
-        seed(1)
+        # The 0.01 tolerances are about one standard error at this size, so
+        # the test depends on the seed.
+        seed(3)
         ref_blockrate = 1/400
         simpools = SimPools(ref_pools, blockrate=ref_blockrate)
         numiters = 10000
@@ -78,6 +86,62 @@ class PoolSimTests(unittest.TestCase):
         diff = abs(log(blockinterval_samplemean * ref_blockrate))
         self.assertLess(diff, 0.01)
 
+    def test_blocksource(self):
+        simpools = SimPools(ref_pools)
+        poolnames = sorted(ref_pools)
+        blocks = simpools.get_blocksource(Variates(1)).sample(100000)
+        c = Counter([poolidx for poolidx, _0, _1, _2 in blocks])
+        totalhashrate = simpools.calc_totalhashrate()
+        for poolidx, name in enumerate(poolnames):
+            expected_relfreq = ref_pools[name].hashrate / totalhashrate
+            self.assertLess(abs(c[poolidx]/100000 - expected_relfreq), 0.01)
+        for poolidx, blockinterval, maxblocksize, minfeerate in blocks[:100]:
+            pool = ref_pools[poolnames[poolidx]]
+            self.assertEqual(maxblocksize, pool.maxblocksize)
+            self.assertEqual(minfeerate, pool.minfeerate)
+        # blockgen draws from the same blocks.
+        for (simblock, blockinterval), block in zip(
+                simpools.blockgen(Variates(1)), blocks[:100]):
+            self.assertEqual((simblock.poolidx, blockinterval), block[:2])
+            self.assertEqual(simblock.poolname, poolnames[simblock.poolidx])
+
+        # Independent draws of maxblocksize and minfeerate
+        simpoolsnp = SimPoolsNP([1000000, 2000000], [1000, float("inf")])
+        blocks = simpoolsnp.get_blocksource(Variates(1)).sample(10000)
+        c = Counter([block[2:] for block in blocks])
+        self.assertEqual(len(c), 4)
+        self.assertEqual(set([block[0] for block in blocks]), set([-1]))
+        self.assertIn((2000000, float("inf")), c)
+
+        with self.assertRaises(ValueError):
+            BlockSource(0, [1000000], [1000])
+        with self.assertRaises(ValueError):
+            BlockSource(1/600, [1000000], [1000], weights=[1, 1])
+
+    def test_blocksource_antithetic(self):
+        simpools = SimPools(ref_pools)
+        blockrate = simpools.blockrate
+        blocksource = simpools.get_blocksource(Variates(1))
+        blocksource.antithetic = True
+        for i in range(3):
+            blocks = blocksource.sample(1000)
+            blocksource.next_realization()
+            # The antithetic pair runs longer than the recorded one.
+            antiblocks = blocksource.sample(1100)
+            blocksource.next_realization()
+            for block, antiblock in zip(blocks, antiblocks):
+                # u and 1-u
+                self.assertAlmostEqual(
+                    exp(-block[1]*blockrate) + exp(-antiblock[1]*blockrate),
+                    1)
+            self.assertNotEqual(
+                [block[0] for block in blocks],
+                [block[0] for block in antiblocks[:1000]])
+            # The block intervals are still exponential.
+            intervals = [block[1] for block in blocks + antiblocks]
+            meaninterval = sum(intervals) / len(intervals)
+            self.assertLess(abs(meaninterval*blockrate - 1), 0.1)
+
     def test_caps(self):
         simpools = SimPools(ref_pools)
         ref_feerates = (999, 1000, 10000, 20000)
@@ -191,7 +255,89 @@ class TxSourceTests(unittest.TestCase):
             diff = abs(log(byteratefn(feerate)) - log(refrate))
             self.assertLess(diff, 0.02)
 
+    def test_emitter_seed(self):
+        # The txs are drawn from the emitter's Variates, so they're the
+        # same for the same seed.
+        def emit(tx_source, variates_seed):
+            mempool = SimMempool({})
+            tx_emitter = tx_source.get_emitter(
+                mempool, variates=Variates(seed=variates_seed))
+            tx_emitter(10000)
+            return list(memoryview(mempool.get_txarray()).tobytes())
+
+        weighted = SimTxSource(ref_txsample, ref_txrate,
+                               weights=[1, 2, 3])
+        for tx_source in [self.tx_source, weighted]:
+            txs = emit(tx_source, 1)
+            self.assertTrue(txs)
+            self.assertEqual(emit(tx_source, 1), txs)
+            self.assertNotEqual(emit(tx_source, 2), txs)
+
+    def test_weights(self):
+        # Equivalent to ref_txsample, with a tx split into two halves.
+        tx_source = SimTxSource(
+            ref_txsample[:2] + [SimTx(2000, 500), SimTx(2000, 500)],
+            ref_txrate, weights=[2, 2, 1, 1])
+        byteratefn = tx_source.get_byteratefn()
+        for feerate, refrate in zip(self.feerates, self.ref_byterates):
+            self.assertAlmostEqual(refrate, byteratefn(feerate))
+        self.assertAlmostEqual(tx_source.calc_mean_byterate()[0],
+                               ref_mean_byterate)
+
+        mempool = SimMempool({})
+        tx_emitter = tx_source.get_emitter(mempool, feeratethresh=2000)
+        t = 0
+        maxtime = 10000.
+        while t < maxtime:
+            interval = expovariate(1/600)
+            tx_emitter(interval)
+            t += interval
+        simtxs = mempool.get_entries().values()
+        txrate = len(simtxs) / t
+        self.assertLess(abs(log(txrate) - log(ref_txrate)), 0.02)
+        byteratefn = SimTxSource(simtxs, txrate).get_byteratefn()
+        for feerate, refrate in zip(self.feerates, self.ref_byterates):
+            diff = abs(log(byteratefn(feerate)) - log(refrate))
+            self.assertLess(diff, 0.02)
+
+        with self.assertRaises(ValueError):
+            SimTxSource(ref_txsample, ref_txrate, weights=[1, 1]).check()
+        with self.assertRaises(ValueError):
+            SimTxSource(ref_txsample, ref_txrate, weights=[1, -1, 1]).check()
+
+    def test_compress(self):
+        # A sample with many repeated txs compresses to the unique ones,
+        # with the same byterates and mean byterate.
+        txsample = [tx for tx in ref_txsample for i in range(100)]
+        tx_source = SimTxSource(txsample, ref_txrate)
+        compressed = tx_source.compress()
+        self.assertEqual(len(compressed.txsample), len(ref_txsample))
+        self.assertEqual(sorted(compressed.weights), [100]*3)
+        byteratefn = compressed.get_byteratefn()
+        for feerate, refrate in zip(self.feerates, self.ref_byterates):
+            self.assertAlmostEqual(refrate, byteratefn(feerate))
+        for stat, refstat in zip(compressed.calc_mean_byterate(),
+                                 tx_source.calc_mean_byterate()):
+            self.assertAlmostEqual(stat, refstat)
+
+        hist = TxHistogram()
+        hist.add(txsample)
+        hist.rescale(0.01)
+        self.assertEqual(len(hist), 3)
+        self.assertAlmostEqual(hist.get_totalweight(), 3)
+        hist.add(ref_txsample[:1], weights=[0.5])
+        hist.thin(0.5)
+        txs, weights = hist.get_sample()
+        self.assertEqual(len(txs), 3)
+        for weight, refweight in zip(sorted(weights), [1, 1, 1.5]):
+            self.assertAlmostEqual(weight, refweight)
+        # Each bin is kept with probability ~1e-9.
+        hist.thin(1e9)
+        self.assertEqual(len(hist), 0)
+
     def test_feerate_threshold(self):
+        # As in test_blockgen, the seed matters at this size.
+        seed(3)
         t = 10000.
         # emitted = TxPtrArray()
         mempool = SimMempool({})
@@ -287,6 +433,49 @@ class TxSourceTests(unittest.TestCase):
         process1.join()
 
 
+class VariatesTests(unittest.TestCase):
+
+    def test_reproducible(self):
+        v0 = Variates(seed=1)
+        v1 = Variates(seed=1)
+        draws0 = [(v0.random(), v0.expovariate(2), v0.poissonvariate(50))
+                  for i in range(10000)]
+        draws1 = [(v1.random(), v1.expovariate(2), v1.poissonvariate(50))
+                  for i in range(10000)]
+        self.assertEqual(draws0, draws1)
+        v2 = Variates(seed=2)
+        self.assertNotEqual(v2.random(), draws0[0][0])
+
+    def test_moments(self):
+        N = 100000
+        v = Variates(seed=0)
+        uniforms = [v.random() for i in range(N)]
+        self.assertTrue(all([0 <= u < 1 for u in uniforms]))
+        self.assertAlmostEqual(sum(uniforms)/N, 0.5, places=2)
+        exps = [v.expovariate(1/600) for i in range(N)]
+        self.assertLess(abs(sum(exps)/N/600 - 1), 0.02)
+
+        # Both the inversion and the PTRS methods.
+        for lam in [0, 0.5, 5, 9.99, 10, 30, 660, 1e5]:
+            poissons = [v.poissonvariate(lam) for i in range(N)]
+            mean = sum(poissons) / N
+            var = sum([(p - mean)**2 for p in poissons]) / (N-1)
+            print("lam: {}, mean: {}, var: {}".format(lam, mean, var))
+            self.assertTrue(all([p >= 0 for p in poissons]))
+            if lam == 0:
+                self.assertEqual(mean, 0)
+                continue
+            self.assertLess(abs(mean - lam), 5*(lam/N)**0.5)
+            self.assertLess(abs(var/lam - 1), 0.03)
+
+        # The PTRS distribution is exact.
+        lam = 12
+        counts = Counter([v.poissonvariate(lam) for i in range(N)])
+        for k in range(3, 25):
+            p = exp(-lam + k*log(lam) - lgamma(k+1))
+            self.assertLess(abs(counts[k] - N*p), 5*(N*p)**0.5)
+
+
 class BasicSimTests(unittest.TestCase):
 
     def setUp(self):
@@ -325,6 +514,51 @@ class BasicSimTests(unittest.TestCase):
                                             simblock.size, simblock.sfr,
                                             mempoolsize))
 
+    def test_arrays(self):
+        def unpack(buf, typecode):
+            return array(typecode, memoryview(buf).tobytes())
+
+        trace = SimTrace()
+        blocks = []
+        for idx, simblock in enumerate(
+                self.sim.run(init_entries=self.init_entries, trace=trace)):
+            blocks.append(simblock)
+            if idx == 49:
+                entries = self.sim.mempool.get_entries()
+                mempooltxs = unpack(self.sim.mempool.get_txarray(), 'L')
+                break
+        self.assertEqual(
+            sorted(zip(mempooltxs[::2], mempooltxs[1::2])),
+            sorted([(entry.feerate, entry.size)
+                    for entry in entries.values()]))
+
+        # The blocks keep their tx memory alive.
+        del self.sim
+        poolnames = sorted(ref_pools)
+        view = memoryview(trace)
+        self.assertEqual(view.shape, (50, 4))
+        self.assertTrue(view.readonly)
+        rows = unpack(trace, 'd')
+        for idx, simblock in enumerate(blocks):
+            view = memoryview(simblock.txarray)
+            self.assertEqual(view.shape, (len(simblock.txs), 2))
+            blocktxs = unpack(simblock.txarray, 'L')
+            self.assertEqual(
+                zip(blocktxs[::2], blocktxs[1::2]),
+                [(tx.feerate, tx.size) for tx in simblock.txs])
+            self.assertEqual(
+                list(rows[4*idx+1:4*idx+4]),
+                [simblock.sfr, simblock.size,
+                 poolnames.index(simblock.poolname)])
+        self.assertTrue(all([interval > 0 for interval in rows[::4]]))
+
+        # Can't grow the trace while it's being viewed.
+        trace = SimTrace(maxsize=1)
+        sim = Simul(self.simpools, self.tx_source)
+        with self.assertRaises(BufferError):
+            for simblock in sim.run(trace=trace):
+                view = memoryview(trace)
+
     def test_degenerate_pools(self):
         degen_pools = {'pool0': SimPool(1, 0, float("inf")),
                        'pool1': SimPool(1, 0, 0)}
@@ -348,6 +582,39 @@ class BasicSimTests(unittest.TestCase):
                                             simblock.size, simblock.sfr,
                                             mempoolsize))
 
+    def test_maxmempoolsize(self):
+        # An unstable sim, with a bounded mempool
+        MAXSIZE = 1000000
+        tx_source = SimTxSource(ref_txsample, 100)
+        sim = Simul(self.simpools, tx_source)
+        sim.stablefeerate = 0
+        with self.assertRaises(ValueError):
+            for idx, simblock in enumerate(sim.run()):
+                if idx >= 50:
+                    break
+
+        sim = Simul(self.simpools, tx_source, maxmempoolsize=MAXSIZE)
+        sim.stablefeerate = 0
+        print("Bounded mempool:")
+        print("Height\tNumtxs\tSize\tSFR\tMPsize\tMinrelayfee")
+        for idx, simblock in enumerate(
+                sim.run(init_entries=self.init_entries)):
+            if idx >= 50:
+                break
+            entries = sim.mempool.get_entries()
+            mempoolsize = sum([entry.size for entry in entries.values()
+                               if not entry.depends])
+            self.assertLessEqual(mempoolsize, MAXSIZE)
+            # The low feerate txs get evicted.
+            self.assertGreater(sim.mempool.minrelayfeerate, 2000)
+            print("%d\t%d\t%d\t%.0f\t%d\t%.0f" % (
+                idx, len(simblock.txs), simblock.size, simblock.sfr,
+                mempoolsize, sim.mempool.minrelayfeerate))
+        sim.mempool.reset()
+        self.assertEqual(sim.mempool.minrelayfeerate, 0)
+        self.assertEqual(len(sim.mempool.get_entries()),
+                         len(self.init_entries))
+
     def test_insane_feerates(self):
         # Test the restriction of feerates to unsigned int.
         for entry in self.init_entries.values():
@@ -463,6 +730,239 @@ class CustomMempoolTests(unittest.TestCase):
             else:
                 break
 
+    def test_reset(self):
+        # Chain of txs, plus independent txs
+        init_entries = {
+            str(i): SimEntry(10500-i, 2000, depends=[str(i+1)])
+            for i in range(1000)
+        }
+        init_entries['1000'] = SimEntry(1001, 2000)
+        for i in range(1001, 1500):
+            init_entries[str(i)] = SimEntry(5000+i, 1000)
+
+        def entries_tuple(entries):
+            return {
+                txid: (entry.feerate, entry.size, sorted(entry.depends))
+                for txid, entry in entries.items()}
+
+        ref_entries = entries_tuple(init_entries)
+        for numblocks in [1, 3, 6]:
+            for idx, simblock in enumerate(
+                    self.sim.run(init_entries=init_entries)):
+                if idx == numblocks:
+                    break
+            self.assertNotEqual(
+                entries_tuple(self.sim.mempool.get_entries()), ref_entries)
+            self.sim.mempool.reset()
+            self.assertEqual(
+                entries_tuple(self.sim.mempool.get_entries()), ref_entries)
+            # Resetting twice is the same as resetting once.
+            self.sim.mempool.reset()
+            self.assertEqual(
+                entries_tuple(self.sim.mempool.get_entries()), ref_entries)
+
+    def test_reset_cost(self):
+        # A reset doesn't visit the untouched roots: resetting a large
+        # mempool after a few blocks costs about the same as a small one.
+        def reset_time(numtxs):
+            feerates = array('L', [10000 + i % 5000 for i in range(numtxs)])
+            sizes = array('L', [250]*numtxs)
+            sim = Simul(self.sim.pools, self.sim.txsource)
+            init_entries = (feerates, sizes, array('L', [0]*(numtxs+1)),
+                            array('L'))
+            for idx, simblock in enumerate(
+                    sim.run(init_entries=init_entries)):
+                if idx == 2:
+                    break
+            self.assertLess(len(sim.mempool.get_entries()), numtxs)
+            starttime = time()
+            for i in range(200):
+                sim.mempool.reset()
+            elapsed = time() - starttime
+            self.assertEqual(len(sim.mempool.get_entries()), numtxs)
+            return elapsed
+
+        smalltime = reset_time(1000)
+        largetime = reset_time(400000)
+        print("Reset time: {}s for 1000 txs, {}s for 400000 txs.".format(
+            smalltime, largetime))
+        self.assertLess(largetime, smalltime*10 + 0.01)
+
+
+    def test_evict_descendants(self):
+        # A low feerate parent with a chain of descendants, which are
+        # evicted along with it.
+        init_entries = {
+            'c0': SimEntry(50000, 1000, depends=['p']),
+            'c1': SimEntry(50000, 1000, depends=['c0']),
+            'c2': SimEntry(50000, 1000, depends=['c1', 'h0']),
+            'p': SimEntry(1000, 500000),
+        }
+        for i in range(100):
+            init_entries['h'+str(i)] = SimEntry(20000, 5000)
+        sim = Simul(self.sim.pools, self.sim.txsource,
+                    maxmempoolsize=600000)
+        for simblock in sim.run(init_entries=init_entries):
+            entries = sim.mempool.get_entries()
+            for txid in ['p', 'c0', 'c1', 'c2']:
+                self.assertNotIn(txid, entries)
+            self.assertNotIn(50000, [tx.feerate for tx in simblock.txs])
+            for entry in entries.values():
+                for txid in entry.depends:
+                    self.assertIn(txid, entries)
+            self.assertEqual(sim.mempool.minrelayfeerate, 2000)
+            break
+        sim.mempool.reset()
+        self.assertEqual(set(sim.mempool.get_entries()), set(init_entries))
+
+    def test_cpfp(self):
+        # A low feerate parent with high feerate children, as in test_B.
+        init_entries = {
+            str(i): SimEntry(100000, 250, depends=['0'])
+            for i in range(1, 1000)
+        }
+        init_entries['0'] = SimEntry(999, 250)
+        sim = Simul(self.sim.pools, self.sim.txsource, cpfp=True)
+        for simblock in sim.run(init_entries=init_entries):
+            print(simblock)
+            # The children pay for the parent.
+            self.assertEqual(len(simblock.txs), 1000)
+            self.assertEqual(simblock.sfr, 1000)
+            self.assertEqual(len(sim.mempool.get_entries()), 0)
+            break
+
+        # The packages are mined in ancestor score order.
+        init_entries = {
+            'a': SimEntry(1000, 400000),
+            'b': SimEntry(50000, 250, depends=['a']),
+            'c': SimEntry(5000, 300000),
+            'd': SimEntry(4000, 300000),
+            'e': SimEntry(3000, 300000, depends=['c', 'd'])
+        }
+        for simblock in sim.run(init_entries=init_entries):
+            # The pool has maxblocksize 1000000 and minfeerate 1000.
+            print(simblock)
+            self.assertEqual(
+                sorted([tx.feerate for tx in simblock.txs]),
+                [3000, 4000, 5000])
+            self.assertEqual(simblock.sfr, 3001)
+            self.assertEqual(
+                sorted(sim.mempool.get_entries().keys()), ['a', 'b'])
+            break
+
+    def test_cpfp_entries(self):
+        # Chain of txs, plus a diamond, plus independent txs
+        init_entries = {
+            str(i): SimEntry(10500-i, 2000, depends=[str(i+1)])
+            for i in range(1000)
+        }
+        init_entries['1000'] = SimEntry(1001, 2000)
+        init_entries['d0'] = SimEntry(2000, 1000)
+        init_entries['d1'] = SimEntry(3000, 1000, depends=['d0'])
+        init_entries['d2'] = SimEntry(1500, 1000, depends=['d0'])
+        init_entries['d3'] = SimEntry(90000, 1000, depends=['d1', 'd2'])
+        for i in range(1001, 1500):
+            init_entries[str(i)] = SimEntry(5000+i, 1000)
+
+        def entries_tuple(entries):
+            return {
+                txid: (entry.feerate, entry.size, sorted(entry.depends))
+                for txid, entry in entries.items()}
+
+        ref_entries = entries_tuple(init_entries)
+        sim = Simul(self.sim.pools, self.sim.txsource, cpfp=True)
+        for numblocks in [0, 1, 3, 6]:
+            for idx, simblock in enumerate(
+                    sim.run(init_entries=init_entries)):
+                if idx == numblocks:
+                    break
+            entries = sim.mempool.get_entries()
+            # The remaining packages round-trip.
+            self.assertEqual(
+                entries_tuple(
+                    SimMempool(entries, cpfp=True).get_entries()),
+                entries_tuple(entries))
+            for entry in entries.values():
+                for txid in entry.depends:
+                    self.assertIn(txid, entries)
+            sim.mempool.reset()
+            self.assertEqual(
+                entries_tuple(sim.mempool.get_entries()), ref_entries)
+
+        init_entries['1000'].depends = ['0']
+        with self.assertRaises(ValueError):
+            SimMempool(init_entries, cpfp=True)
+
+    def test_from_arrays(self):
+        # Chain of txs with a low fee tx in the middle, plus a diamond,
+        # plus independent txs
+        init_entries = {
+            str(i): SimEntry(10500-i, 2000, depends=[str(i+1)])
+            for i in range(1000)
+        }
+        init_entries['500'].feerate = 900
+        init_entries['1000'] = SimEntry(1700, 2000)
+        init_entries['d0'] = SimEntry(2000, 1000)
+        init_entries['d1'] = SimEntry(3000, 1000, depends=['d0'])
+        init_entries['d2'] = SimEntry(1500, 1000, depends=['d0'])
+        init_entries['d3'] = SimEntry(90000, 1000, depends=['d1', 'd2'])
+        for i in range(1001, 1500):
+            init_entries[str(i)] = SimEntry(5000+i, 1000)
+
+        def entries_tuple(entries):
+            return {
+                txid: (entry.feerate, entry.size, sorted(entry.depends))
+                for txid, entry in entries.items()}
+
+        packed = pack_entries(init_entries)
+        txids = packed[0]
+        for cpfp in [False, True]:
+            mempool = SimMempool.from_arrays(*packed[1:], txids=txids,
+                                             cpfp=cpfp)
+            self.assertEqual(entries_tuple(mempool.get_entries()),
+                             entries_tuple(init_entries))
+            # Without txids, the entry indices are the txids.
+            mempool = SimMempool.from_arrays(*packed[1:], cpfp=cpfp)
+            self.assertEqual(
+                entries_tuple(mempool.get_entries()),
+                {txids.index(txid): (feerate, size, sorted(
+                    [txids.index(dep) for dep in depends]))
+                 for txid, (feerate, size, depends) in
+                 entries_tuple(init_entries).items()})
+            # The low fee txs and their dependants are excluded.
+            mempool = SimMempool.from_arrays(
+                *packed[1:], txids=txids, minfeerate=1600, cpfp=cpfp)
+            ref_entries = entries_tuple(init_entries)
+            for txid in map(str, range(501)) + ['d2', 'd3']:
+                del ref_entries[txid]
+            self.assertEqual(entries_tuple(mempool.get_entries()),
+                             ref_entries)
+
+        # The same sim as with the dict.
+        sim = Simul(self.sim.pools, self.sim.txsource, cpfp=True)
+        for init in [init_entries, tuple(packed[1:])]:
+            blocks = []
+            for idx, simblock in enumerate(sim.run(init_entries=init)):
+                if idx == 5:
+                    break
+                blocks.append((simblock.sfr, simblock.size))
+            if init is init_entries:
+                ref_blocks = blocks
+        self.assertEqual(blocks, ref_blocks)
+
+        # Hanging and cyclic dependencies, and inconsistent arrays
+        feerates, sizes, depends_start, depends = packed[1:]
+        with self.assertRaises(ValueError):
+            SimMempool.from_arrays(feerates, sizes, depends_start,
+                                   array('L', [len(feerates)]*len(depends)))
+        init_entries['1000'].depends = ['0']
+        with self.assertRaises(ValueError):
+            SimMempool.from_arrays(*pack_entries(init_entries)[1:],
+                                   cpfp=True)
+        with self.assertRaises(ValueError):
+            SimMempool.from_arrays(feerates, sizes[:-1], depends_start,
+                                   depends)
+
 
 class TransientSimTests(unittest.TestCase):
 
@@ -502,6 +1002,118 @@ class TransientSimTests(unittest.TestCase):
                 maxiters=1000,
                 maxtime=60)
 
+    def test_kernel(self):
+        # Check that the compiled kernel agrees with transientsim_core.
+        NUMITERS = 50
+        seed(2)
+        core_waitvectors = []
+        for waitvector in transientsim_core(self.sim, self.init_entries,
+                                            self.feepoints):
+            core_waitvectors.append(waitvector)
+            if len(core_waitvectors) == NUMITERS:
+                break
+        seed(2)
+        kernel = TransientKernel(self.sim, self.feepoints,
+                                 init_entries=self.init_entries)
+        waits = kernel.run(NUMITERS)
+        n = len(self.feepoints)
+        kernel_waitvectors = [list(waits[i:i+n])
+                              for i in range(0, len(waits), n)]
+        self.assertEqual(kernel_waitvectors, core_waitvectors)
+        # The same with packed entries.
+        seed(2)
+        packed = tuple(pack_entries(self.init_entries)[1:])
+        kernel = TransientKernel(self.sim, self.feepoints,
+                                 init_entries=packed)
+        self.assertEqual(kernel.run(NUMITERS), waits)
+
+        # Continue running in chunks, and check the stopflag.
+        self.assertEqual(len(kernel.run(NUMITERS)), NUMITERS*n)
+        stopflag = threading.Event()
+        stopflag.set()
+        self.assertEqual(len(kernel.run(NUMITERS, stopflag=stopflag)), n)
+
+        with self.assertRaises(ValueError):
+            TransientKernel(self.sim, [self.sim.stablefeerate-1])
+
+    def test_kernel_variance_reduction(self):
+        NUMITERS = 50
+        n = len(self.feepoints)
+        waits = make_kernel(self.sim, self.feepoints, self.init_entries,
+                            seed=3).run(NUMITERS)
+        # Common random numbers
+        self.assertEqual(
+            make_kernel(self.sim, self.feepoints, self.init_entries,
+                        seed=3).run(NUMITERS),
+            waits)
+        # With the control variates appended to each row
+        kernel = make_kernel(self.sim, self.feepoints, self.init_entries,
+                             seed=3, control=True)
+        cwaits = kernel.run(NUMITERS)
+        self.assertEqual(len(cwaits), 2*n*NUMITERS)
+        meaninterval = 1 / self.simpools.blockrate
+        for i in range(NUMITERS):
+            row = cwaits[2*n*i:2*n*(i+1)]
+            self.assertEqual(row[:n], waits[n*i:n*(i+1)])
+            for wait, control in zip(row[:n], row[n:]):
+                # wait - control is a multiple of the mean block interval
+                numblocks = (wait - control) / meaninterval
+                self.assertAlmostEqual(numblocks, round(numblocks))
+                self.assertGreaterEqual(round(numblocks), 1)
+        # Antithetic pairs
+        awaits = make_kernel(self.sim, self.feepoints, self.init_entries,
+                             seed=3, antithetic=True).run(NUMITERS)
+        self.assertEqual(awaits[:n], waits[:n])
+        self.assertNotEqual(awaits, waits)
+
+    def test_kernel_importance(self):
+        NUMITERS = 500
+        n = len(self.feepoints)
+        waits = make_kernel(self.sim, self.feepoints, self.init_entries,
+                            seed=3).run(NUMITERS)
+        # No tilt, so the weights are all 1, and the waits are the same.
+        iwaits = make_kernel(self.sim, self.feepoints, self.init_entries,
+                             seed=3, tilt=(1, 1)).run(NUMITERS)
+        self.assertEqual(len(iwaits), (n+1)*NUMITERS)
+        self.assertEqual(list(iwaits[n::n+1]), [1]*NUMITERS)
+        for i in range(NUMITERS):
+            self.assertEqual(iwaits[(n+1)*i:(n+1)*i+n], waits[n*i:n*(i+1)])
+        # The weights are likelihood ratios, so their mean is 1.
+        iwaits = make_kernel(self.sim, self.feepoints, self.init_entries,
+                             seed=3, tilt=(1.2, 1)).run(NUMITERS)
+        weights = iwaits[n::n+1]
+        self.assertTrue(all([w > 0 for w in weights]))
+        # Probabilistic test
+        self.assertLess(abs(sum(weights)/NUMITERS - 1), 0.2)
+        for tilt in [(0.9, 1), (1, 0.9)]:
+            with self.assertRaises(ValueError):
+                make_kernel(self.sim, self.feepoints, self.init_entries,
+                            tilt=tilt)
+
+    def test_kernel_dense(self):
+        # With the feepoints as the dense feerates, the dense stats are
+        # the sums of the wait vectors.
+        NUMITERS = 50
+        n = len(self.feepoints)
+        kernel = make_kernel(self.sim, self.feepoints, self.init_entries,
+                             seed=3, densefeerates=self.feepoints)
+        waits = kernel.run(NUMITERS)
+        self.assertEqual(
+            waits,
+            make_kernel(self.sim, self.feepoints, self.init_entries,
+                        seed=3).run(NUMITERS))
+        densestats = kernel.pop_dense()
+        self.assertEqual(len(densestats), 1 + 2*n)
+        self.assertEqual(densestats[0], NUMITERS)
+        for i in range(n):
+            self.assertAlmostEqual(densestats[1+i], sum(waits[i::n]))
+            self.assertAlmostEqual(densestats[1+n+i],
+                                   sum([w*w for w in waits[i::n]]))
+        self.assertEqual(kernel.pop_dense()[0], 0)
+        with self.assertRaises(ValueError):
+            TransientKernel(self.sim, self.feepoints,
+                            densefeerates=[self.sim.stablefeerate-1])
+
     def test_monoprocess(self):
         NUMPROCESSES = 1
 
@@ -1,17 +1,27 @@
 '''Test app.transient.'''
 import unittest
 import logging
+import socket
+import threading
 from time import sleep, time
 from bisect import bisect
 from math import log
 from pprint import pprint
-from copy import deepcopy
-
-from feemodel.simul.transient import transientsim
+from copy import deepcopy, copy
+from collections import defaultdict
+
+from feemodel.simul.transient import (transientsim, TransientWorkerPool,
+                                      PrecisionTarget, get_precision,
+                                      SimProcessError,
+                                      pack_entries, make_kernel,
+                                      get_dense_feerates, fluid_waits)
 from feemodel.simul.simul import Simul
+from feemodel.simul.remote import (TransientRemotePool,
+                                   TransientWorkerServer, parse_addresses,
+                                   encode_chunk, decode_chunk)
 from feemodel.txmempool import MempoolState
 from feemodel.util import DataSample
-from feemodel.app.transient import TransientOnline
+from feemodel.app.transient import TransientOnline, TransientStats
 from feemodel.app.predict import WAIT_PERCENTILE_PTS
 from feemodel.tests.config import (poolsref, txref,
                                    transientwaitsref as waitsref)
@@ -55,6 +65,382 @@ class TransientRefCmp(unittest.TestCase):
             self.assertLess(logdiff, 0.1)
 
 
+class TransientWorkerPoolTests(unittest.TestCase):
+
+    def test_A(self):
+        sim = Simul(poolsref, txref)
+        workerpool = TransientWorkerPool(numprocesses=2)
+        try:
+            # The pool is reused across calls, and with a changed Simul.
+            for txrate in [txref.txrate, txref.txrate*0.9, txref.txrate]:
+                txsource = deepcopy(txref)
+                txsource.txrate = txrate
+                sim = Simul(poolsref, txsource)
+                feepoints, waittimes = transientsim(
+                    sim,
+                    feepoints=waitsref[0],
+                    init_entries=init_entries,
+                    miniters=1000,
+                    maxiters=1000,
+                    workerpool=workerpool)
+                self.assertEqual(feepoints, waitsref[0])
+                self.assertGreaterEqual(len(waittimes[0]), 1000)
+                avgwaittimes = [sum(waits)/len(waits) for waits in waittimes]
+                print(zip(feepoints, avgwaittimes))
+            for avgwait, avgwaitref in zip(avgwaittimes, waitsref[1]):
+                # Probabilistic test
+                self.assertLess(abs(log(avgwait) - log(avgwaitref)), 0.2)
+        finally:
+            workerpool.close()
+        with self.assertRaises(ValueError):
+            transientsim(sim, feepoints=waitsref[0], workerpool=workerpool)
+
+    def test_worker_errors(self):
+        sim = Simul(poolsref, txref)
+        workerpool = TransientWorkerPool(numprocesses=2)
+        try:
+            # A task which fails in the workers is raised, not hung on.
+            with self.assertRaises(SimProcessError):
+                transientsim(sim, feepoints=waitsref[0],
+                             init_entries=init_entries, accumulate=True,
+                             tilt=(0.5, 1), workerpool=workerpool)
+            self.assertTrue(all([process.is_alive()
+                                 for process in workerpool.processes]))
+            # A dead worker is restarted.
+            workerpool.processes[0].terminate()
+            workerpool.processes[0].join()
+            feepoints, waittimes = transientsim(
+                sim, feepoints=waitsref[0], init_entries=init_entries,
+                miniters=100, maxiters=100, workerpool=workerpool)
+            self.assertGreaterEqual(len(waittimes[0]), 100)
+            self.assertTrue(all([process.is_alive()
+                                 for process in workerpool.processes]))
+            # So is one which dies during a call.
+            threading.Timer(1, workerpool.processes[1].terminate).start()
+            starttime = time()
+            with self.assertRaises(SimProcessError):
+                transientsim(sim, feepoints=waitsref[0],
+                             init_entries=init_entries, miniters=100,
+                             maxiters=10**8, maxtime=60,
+                             workerpool=workerpool)
+            self.assertLess(time() - starttime, 30)
+            feepoints, waittimes = transientsim(
+                sim, feepoints=waitsref[0], init_entries=init_entries,
+                miniters=100, maxiters=100, workerpool=workerpool)
+            self.assertGreaterEqual(len(waittimes[0]), 100)
+        finally:
+            workerpool.close()
+
+    def test_accumulate(self):
+        sim = Simul(poolsref, txref)
+        feepoints, waitstats = transientsim(
+            sim,
+            feepoints=waitsref[0],
+            init_entries=init_entries,
+            miniters=2000,
+            maxiters=2000,
+            accumulate=True)
+        self.assertEqual(feepoints, waitsref[0])
+        self.assertGreaterEqual(waitstats.numiters, 2000)
+        for waitdata, avgwaitref in zip(waitstats.samples, waitsref[1]):
+            self.assertEqual(len(waitdata), waitstats.numiters)
+            waitdata.calc_stats()
+            # Probabilistic test
+            self.assertLess(abs(log(waitdata.mean) - log(avgwaitref)), 0.2)
+
+    def test_stoppingrule(self):
+        sim = Simul(poolsref, txref)
+        stoppingrule = PrecisionTarget.from_ci_width(
+            0.1, percentiles=[0.5, 0.9])
+        self.assertAlmostEqual(stoppingrule.rse, 0.1/3.92)
+        with self.assertRaises(ValueError):
+            transientsim(sim, stoppingrule=stoppingrule)
+        feepoints, waitstats = transientsim(
+            sim,
+            feepoints=waitsref[0],
+            init_entries=init_entries,
+            miniters=100,
+            maxiters=1000000,
+            maxtime=600,
+            accumulate=True,
+            stoppingrule=stoppingrule)
+        print("Stopped at {} iters.".format(waitstats.numiters))
+        self.assertLess(waitstats.numiters, 1000000)
+        # The target was met at the stopping point.
+        self.assertLessEqual(max(stoppingrule.precision['maxrse']),
+                             stoppingrule.rse)
+        # The wait times sent after it are merged too, and the percentile
+        # estimates are randomized, so the final precision is only close.
+        precision = get_precision(waitstats, [0.5, 0.9])
+        self.assertLess(max(precision['maxrse']), stoppingrule.rse*1.2)
+        for waitdata, rse in zip(waitstats.samples,
+                                 precision['expectedwaits']):
+            self.assertAlmostEqual(
+                rse, waitdata.std / waitstats.numiters**0.5 / waitdata.mean)
+
+    def test_variance_reduction(self):
+        sim = Simul(poolsref, txref)
+        with self.assertRaises(ValueError):
+            transientsim(sim, control=True)
+        workerpool = TransientWorkerPool(numprocesses=2)
+        try:
+            feepoints, waitstats = transientsim(
+                sim,
+                feepoints=waitsref[0],
+                init_entries=init_entries,
+                miniters=2000,
+                maxiters=2000,
+                workerpool=workerpool,
+                accumulate=True,
+                antithetic=True,
+                control=True,
+                seed=0)
+        finally:
+            workerpool.close()
+        expectedwaits, stderrs = waitstats.get_expectedwaits()
+        reduction_factors = waitstats.get_reduction_factors()
+        print(zip(feepoints, expectedwaits, stderrs, reduction_factors))
+        precision = get_precision(waitstats)
+        for expectedwait, stderr, rse, avgwaitref in zip(
+                expectedwaits, stderrs, precision['expectedwaits'],
+                waitsref[1]):
+            self.assertAlmostEqual(rse, stderr / expectedwait)
+            # Probabilistic test
+            self.assertLess(abs(log(expectedwait) - log(avgwaitref)), 0.2)
+        # Probabilistic test; the factors are around 3 or more.
+        self.assertGreater(min(reduction_factors), 1.5)
+
+    def test_importance(self):
+        sim = Simul(poolsref, txref)
+        with self.assertRaises(ValueError):
+            transientsim(sim, tilt=(1.2, 1))
+        feepoints, waitstats = transientsim(
+            sim,
+            feepoints=waitsref[0],
+            init_entries=init_entries,
+            miniters=2000,
+            maxiters=2000,
+            accumulate=True,
+            control=True,
+            tilt=(1.2, 1),
+            seed=0)
+        expectedwaits, stderrs = waitstats.get_expectedwaits()
+        for expectedwait, avgwaitref in zip(expectedwaits, waitsref[1]):
+            # Probabilistic test
+            self.assertLess(abs(log(expectedwait) - log(avgwaitref)), 0.2)
+        ess = waitstats.get_ess()
+        print("ESS is {} of {} iters.".format(ess, waitstats.numiters))
+        self.assertGreater(ess, 0)
+        self.assertLess(ess, waitstats.numiters)
+        precision = get_precision(waitstats, [0.95])
+        self.assertEqual(len(precision['percentiles'][0]), len(feepoints))
+
+        stats = TransientStats()
+        stats.record_waitstats(feepoints, waitstats)
+        self.assertEqual(stats.get_stats()['ess'], ess)
+
+    def test_dense(self):
+        sim = Simul(poolsref, txref)
+        densefeerates = get_dense_feerates(sim, init_entries)
+        self.assertEqual(densefeerates[0], sim.stablefeerate)
+        feepoints = [sim.stablefeerate] + waitsref[0]
+        feepoints, waitstats = transientsim(
+            sim,
+            feepoints=feepoints,
+            init_entries=init_entries,
+            miniters=1000,
+            maxiters=1000,
+            accumulate=True,
+            densefeerates=densefeerates)
+        self.assertEqual(waitstats.densestats[0], waitstats.numiters)
+        densefeerates, densewaits, densestds = waitstats.get_dense()
+        # The same realizations, so the same means at the feepoints.
+        expectedwaits, dum = waitstats.get_expectedwaits()
+        for feepoint, expectedwait in zip(feepoints, expectedwaits):
+            idx = bisect(densefeerates, feepoint) - 1
+            self.assertAlmostEqual(densewaits[idx], expectedwait)
+        self.assertEqual(densewaits, sorted(densewaits, reverse=True))
+
+        stats = TransientStats()
+        stats.record_waitstats(feepoints, waitstats)
+        for waitminutes in [10, 15, 20, 30]:
+            feerate = stats.estimatefee(waitminutes)
+            idx = densefeerates.index(feerate)
+            self.assertLessEqual(densewaits[idx], waitminutes*60)
+            if idx:
+                self.assertGreater(densewaits[idx-1], waitminutes*60)
+        self.assertIsNone(stats.estimatefee(1))
+        best_fee, expectedwait, C = stats.decidefee(250, 1000)
+        self.assertIn(expectedwait, densewaits)
+
+        with self.assertRaises(ValueError):
+            transientsim(sim, densefeerates=densefeerates)
+
+    def test_pack_entries(self):
+        txids, feerates, sizes, depends_start, depends = pack_entries(
+            init_entries)
+        self.assertEqual(len(txids), len(init_entries))
+        for idx, txid in enumerate(txids):
+            entry = init_entries[txid]
+            self.assertEqual(feerates[idx], entry.feerate)
+            self.assertEqual(sizes[idx], entry.size)
+            self.assertEqual(
+                [txids[dep] for dep in
+                 depends[depends_start[idx]:depends_start[idx+1]]],
+                list(entry.depends))
+
+        # The low fee txs are removed from the packed entries by the
+        # kernel.
+        sim = Simul(poolsref, txref)
+        packed = (feerates, sizes, depends_start, depends)
+        kernel = make_kernel(sim, waitsref[0], packed,
+                             minfeerate=sim.stablefeerate)
+        self.assertEqual(
+            sorted([txids[idx] for idx in kernel.sim.mempool.get_entries()]),
+            sorted(remove_lowfee(init_entries, sim.stablefeerate)))
+        self.assertEqual(
+            get_dense_feerates(sim, packed),
+            get_dense_feerates(sim, init_entries))
+
+
+class TransientRemotePoolTests(unittest.TestCase):
+
+    def setUp(self):
+        self.server = TransientWorkerServer(('localhost', 0))
+        self.serverthread = threading.Thread(target=self.server.serve_forever)
+        self.serverthread.start()
+        self.address = self.server.server_address
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.serverthread.join()
+
+    def test_A(self):
+        # An address with nothing listening
+        s = socket.socket()
+        s.bind(('localhost', 0))
+        deadaddress = s.getsockname()
+        s.close()
+        workerpool = TransientRemotePool(
+            [self.address, self.address, deadaddress])
+        try:
+            for txrate in [txref.txrate, txref.txrate*0.9]:
+                txsource = deepcopy(txref)
+                txsource.txrate = txrate
+                sim = Simul(poolsref, txsource)
+                feepoints, waittimes = transientsim(
+                    sim,
+                    feepoints=waitsref[0],
+                    init_entries=init_entries,
+                    miniters=1000,
+                    maxiters=1000,
+                    workerpool=workerpool)
+                self.assertEqual(feepoints, waitsref[0])
+                self.assertGreaterEqual(len(waittimes[0]), 1000)
+            self.assertIsNone(workerpool._conns[2])
+
+            sim = Simul(poolsref, txref)
+            densefeerates = get_dense_feerates(sim, init_entries)
+            feepoints, waitstats = transientsim(
+                sim,
+                feepoints=waitsref[0],
+                init_entries=init_entries,
+                miniters=2000,
+                maxiters=2000,
+                workerpool=workerpool,
+                accumulate=True,
+                control=True,
+                seed=1,
+                densefeerates=densefeerates)
+            self.assertGreaterEqual(waitstats.numiters, 2000)
+            self.assertEqual(waitstats.densestats[0], waitstats.numiters)
+            expectedwaits, dum = waitstats.get_expectedwaits()
+            for avgwait, avgwaitref in zip(expectedwaits, waitsref[1]):
+                # Probabilistic test
+                self.assertLess(abs(log(avgwait) - log(avgwaitref)), 0.2)
+        finally:
+            workerpool.close()
+        with self.assertRaises(ValueError):
+            transientsim(sim, feepoints=waitsref[0], workerpool=workerpool)
+        with self.assertRaises(ValueError):
+            transientsim(sim, feepoints=waitsref[0],
+                         workerpool=TransientRemotePool([deadaddress]))
+
+    def test_worker_loss(self):
+        sim = Simul(poolsref, txref)
+        workerpool = TransientRemotePool([self.address, self.address])
+        try:
+            # Warm up the connections.
+            transientsim(sim, feepoints=waitsref[0],
+                         init_entries=init_entries, miniters=100,
+                         maxiters=100, workerpool=workerpool)
+            conn = workerpool._conns[0]
+            timer = threading.Timer(
+                0.5, lambda: conn.shutdown(socket.SHUT_RDWR))
+            timer.start()
+            feepoints, waitstats = transientsim(
+                sim,
+                feepoints=waitsref[0],
+                init_entries=init_entries,
+                miniters=4000,
+                maxiters=4000,
+                workerpool=workerpool,
+                accumulate=True)
+            timer.join()
+            # The lost worker's results are kept, and the other makes up
+            # the rest.
+            self.assertGreaterEqual(waitstats.numiters, 4000)
+            self.assertIsNone(workerpool._conns[0])
+            # It's reconnected on the next call.
+            feepoints, waittimes = transientsim(
+                sim, feepoints=waitsref[0], init_entries=init_entries,
+                miniters=100, maxiters=100, workerpool=workerpool)
+            self.assertIsNotNone(workerpool._conns[0])
+        finally:
+            workerpool.close()
+
+    def test_protocol(self):
+        self.assertEqual(
+            parse_addresses(" a:1, b,c:3,", defaultport=2),
+            [('a', 1), ('b', 2), ('c', 3)])
+        self.assertEqual(parse_addresses(""), [])
+        for chunk in ['abcd', ('abcdefgh', 'ijkl'), ('', '')]:
+            self.assertEqual(decode_chunk(*encode_chunk(chunk)), chunk)
+
+
+class FluidWaitsTests(unittest.TestCase):
+
+    def test_A(self):
+        sim = Simul(poolsref, txref)
+        mempoolstate = MempoolState.__new__(MempoolState)
+        mempoolstate.entries = init_entries
+        sizefn = mempoolstate.get_sizefn()
+        starttime = time()
+        feepoints, waits, stds = fluid_waits(sim, sizefn, waitsref[0])
+        print("fluid_waits took {:.4f}s.".format(time() - starttime))
+        self.assertEqual(feepoints, waitsref[0])
+        self.assertEqual(waits, sorted(waits, reverse=True))
+        for wait, std, waitref in zip(waits, stds, waitsref[1]):
+            self.assertLess(abs(log(wait) - log(waitref)), 0.4)
+            self.assertLessEqual(std, wait)
+
+        # With an empty mempool, it's just the wait for the next block.
+        mempoolstate.entries = {}
+        feepoints, waits, stds = fluid_waits(sim, mempoolstate.get_sizefn())
+        self.assertEqual(waits, stds)
+        self.assertAlmostEqual(waits[-1], 1 / sim.pools.blockrate)
+
+        stats = TransientStats()
+        stats.record_approx(*fluid_waits(sim, sizefn, waitsref[0]))
+        self.assertTrue(stats.approximate)
+        self.assertIsNone(stats.predict(waitsref[0][-1], 0))
+        feerate = stats.estimatefee(20)
+        self.assertLessEqual(stats.expectedwaits(feerate), 20*60)
+        stats.decidefee(250, 1000)
+        self.assertTrue(stats.get_stats()['approximate'])
+
+
 class TransientSamplingDist(unittest.TestCase):
     """Test the sampling distribution of the transient waittimes.
 
@@ -108,10 +494,19 @@ class TransientOnlineTests(unittest.TestCase):
             miniters=0,
             maxiters=float("inf"))
         with transientonline.context_start():
+            # The approximate stats are available first; the sim takes
+            # update_period.
+            while transientonline.get_feestats() is None:
+                sleep(0.01)
+            approxstats = transientonline.get_feestats()
+            self.assertTrue(approxstats.approximate)
+            self.assertIsNotNone(approxstats.estimatefee(30))
             while transientonline.stats is None:
                 sleep(0.1)
             stats = transientonline.stats
             self.assertIsNotNone(stats)
+            self.assertIs(transientonline.get_feestats(), stats)
+            self.assertFalse(stats.approximate)
             print("First stats:")
             print("===========")
             print("Expected wait:")
@@ -221,6 +616,90 @@ class TransientOnlineTests(unittest.TestCase):
             stats = transientonline.stats
             self.assertLess(stats.numiters, MINITERS*1.1)
 
+    def test_warmstart(self):
+        pools = deepcopy(poolsref)
+        pools.version = 1
+        mempool = PseudoMempool()
+        transientonline = TransientOnline(
+            mempool,
+            PseudoPoolsOnline(pools),
+            PseudoTxOnline(txref),
+            update_period=60,
+            miniters=1000,
+            maxiters=1000,
+            warmstart=True)
+        try:
+            transientonline.update()
+            stats = transientonline.stats
+            self.assertEqual(stats.numreused, 0)
+
+            # Same inputs: the previous run is reused.
+            transientonline.update()
+            warmstats = transientonline.stats
+            print("Reused {} of {} iters.".format(
+                warmstats.numreused, warmstats.numiters))
+            self.assertGreater(warmstats.numreused, 900)
+            self.assertEqual(warmstats.feepoints, stats.feepoints)
+            self.assertGreaterEqual(warmstats.numiters,
+                                    warmstats.numreused + 200)
+            self.assertLess(warmstats.numiters, 2000)
+
+            # New block
+            mempool.state = copy(mempool.state)
+            mempool.state.height += 1
+            transientonline.update()
+            self.assertEqual(transientonline.stats.numreused, 0)
+
+            # Changed pools
+            pools = deepcopy(pools)
+            pools.version = 2
+            transientonline.poolsonline = PseudoPoolsOnline(pools)
+            transientonline.update()
+            self.assertEqual(transientonline.stats.numreused, 0)
+        finally:
+            transientonline._workerpool.close()
+
+    def test_scheduler(self):
+        pools = deepcopy(poolsref)
+        pools.version = 1
+        mempool = PseudoMempool()
+        transientonline = TransientOnline(
+            mempool,
+            PseudoPoolsOnline(pools),
+            PseudoTxOnline(txref),
+            update_period=1000,
+            min_refresh=0.5,
+            miniters=10**8,
+            maxiters=10**8)
+        with transientonline.context_start():
+            # The first update is too long to finish.
+            sleep(2)
+            self.assertIsNone(transientonline.stats)
+            # It's cancelled by a new block, and the next one runs
+            # straight away.
+            transientonline.miniters = transientonline.maxiters = 1000
+            transientonline.notify_block()
+            starttime = time()
+            while transientonline.stats is None:
+                sleep(0.1)
+            self.assertLess(time() - starttime, 10)
+            stats = transientonline.stats
+
+            # No change in the inputs: no update.
+            transientonline.notify_update()
+            sleep(2)
+            self.assertIs(transientonline.stats, stats)
+
+            # A material change in the mempool
+            mempool.state = copy(mempool.state)
+            for entry in mempool.state.entries.values():
+                entry.size *= 2
+            transientonline.notify_update()
+            starttime = time()
+            while transientonline.stats is stats:
+                sleep(0.1)
+            self.assertLess(time() - starttime, 10)
+
 
 class PseudoMempool(object):
     '''A pseudo TxMempool'''
@@ -255,5 +734,28 @@ class PseudoTxOnline(object):
         return bool(self.txrate_estimator)
 
 
+
+def remove_lowfee(entries, feethresh):
+    """Remove all low fee (< feethresh) transactions and their dependants.
+    """
+    # Build a dependency map
+    depmap = defaultdict(list)
+    for txid, entry in entries.items():
+        for dep in entry.depends:
+            depmap[dep].append(txid)
+    removed = set()
+    for txid, entry in entries.items():
+        if entry.feerate < feethresh:
+            removelist = [txid]
+            while removelist:
+                txid_remove = removelist.pop()
+                if txid_remove in removed:
+                    continue
+                removed.add(txid_remove)
+                removelist.extend(depmap[txid_remove])
+    return {txid: entry for txid, entry in entries.items()
+            if txid not in removed}
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -6,12 +6,14 @@ import threading
 import logging
 from random import expovariate, random
 from math import log
+from copy import copy
 
 from feemodel.tests.config import (test_memblock_dbfile as dbfile, txref,
                                    tmpdatadir_context)
 from feemodel.txmempool import MemBlock, MemEntry
 from feemodel.estimate import RectEstimator, ExpEstimator
 from feemodel.simul.simul import SimMempool
+from feemodel.simul.txsources import SimTx
 
 logging.basicConfig(level=logging.DEBUG)
 
@@ -59,6 +61,18 @@ class ExpEstimatorTest(unittest.TestCase):
         print("unique ratio is {}".format(len(uniquetxs) / len(tr.txsample)))
         print(tr)
 
+    def test_copy(self):
+        tr = ExpEstimator(3600)
+        tr.start(self.blockrange[1]-1, dbfile=dbfile)
+        txrate = tr.txrate
+        totalweight = tr._hist.get_totalweight()
+        # Updating the copy must not affect the original.
+        tr_copy = copy(tr)
+        tr_copy._add_txs([SimTx(10000, 250)]*100, 60, False)
+        self.assertNotEqual(tr_copy.txrate, txrate)
+        self.assertEqual(tr.txrate, txrate)
+        self.assertEqual(tr._hist.get_totalweight(), totalweight)
+
     def test_stop(self):
         tr = ExpEstimator(3600)
         stopflag = threading.Event()
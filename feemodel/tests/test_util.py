@@ -2,8 +2,9 @@ import unittest
 from random import random, seed
 
 from feemodel.util import get_coinbase_info
-from feemodel.util import round_random, DataSample, interpolate
-from feemodel.util import Function
+from feemodel.util import round_random, DataSample, DataSketch, interpolate
+from feemodel.util import WeightedDataSketch
+from feemodel.util import Function, StepFunction, merge_grids
 
 from feemodel.tests.pseudoproxy import install
 
@@ -59,6 +60,105 @@ class DataSampleTest(unittest.TestCase):
         self.assertEqual(first, d.datapoints[0])
 
 
+class DataSketchTest(unittest.TestCase):
+
+    def test_exact(self):
+        # No compaction, so it's the same as DataSample.
+        sample = [random() for i in xrange(1000)]
+        d = DataSample(sample)
+        d.calc_stats()
+        sketch = DataSketch()
+        for i in range(0, 1000, 100):
+            sketch.add_datapoints(sample[i:i+100])
+        sketch.calc_stats()
+        print(sketch)
+        self.assertEqual(len(sketch), 1000)
+        self.assertAlmostEqual(sketch.mean, d.mean)
+        self.assertAlmostEqual(sketch.std, d.std)
+        for p in [0, 0.05, 0.5, 0.975, 1]:
+            self.assertEqual(sketch.get_percentile(p), d.get_percentile(p))
+
+    def test_compaction(self):
+        seed(0)
+        sample = [random() for i in xrange(100000)]
+        sketch = DataSketch(maxlevelsize=256)
+        other = DataSketch(maxlevelsize=256)
+        for i in range(0, 50000, 100):
+            sketch.add_datapoints(sample[i:i+100])
+            other.add_datapoints(sample[50000+i:50100+i])
+        sketch.merge(other)
+        sketch.calc_stats()
+        d = DataSample(sample)
+        d.calc_stats()
+        self.assertEqual(len(sketch), 100000)
+        self.assertAlmostEqual(sketch.mean, d.mean)
+        self.assertAlmostEqual(sketch.std, d.std)
+        self.assertLess(
+            sum(map(len, sketch.levels)), 256*len(sketch.levels))
+        for p in [0.05, 0.5, 0.975]:
+            # Uniform on [0, 1], so the rank error is the value error.
+            self.assertLess(abs(sketch.get_percentile(p) - p), 0.01)
+
+    def test_downsample(self):
+        seed(0)
+        sketch = DataSketch([random() for i in xrange(10000)])
+        sketch.calc_stats()
+        mean, std = sketch.mean, sketch.std
+        sketch.downsample(0.25)
+        sketch.calc_stats()
+        self.assertLess(abs(len(sketch) - 2500), 200)
+        self.assertEqual(
+            len(sketch),
+            sum([len(level)*2**h for h, level in enumerate(sketch.levels)]))
+        self.assertEqual(sketch.mean, mean)
+        self.assertAlmostEqual(sketch.std, std, places=2)
+        self.assertLess(abs(sketch.get_percentile(0.5) - 0.5), 0.05)
+        sketch.downsample(0)
+        self.assertEqual(len(sketch), 0)
+        with self.assertRaises(ValueError):
+            sketch.downsample(1.5)
+
+
+class WeightedDataSketchTest(unittest.TestCase):
+
+    def test_equal_weights(self):
+        # No compaction and equal weights, so it's the same as DataSample.
+        sample = [random() for i in xrange(1000)]
+        d = DataSample(sample)
+        d.calc_stats()
+        sketch = WeightedDataSketch()
+        for i in range(0, 1000, 100):
+            sketch.add_datapoints(sample[i:i+100], [2]*100)
+        sketch.calc_stats()
+        print(sketch)
+        self.assertEqual(len(sketch), 1000)
+        self.assertAlmostEqual(sketch.ess, 1000)
+        self.assertAlmostEqual(sketch.mean, d.mean)
+        self.assertAlmostEqual(sketch.std, d.std)
+        for p in [0.05, 0.5, 0.975, 1]:
+            self.assertEqual(sketch.get_percentile(p), d.get_percentile(p))
+
+    def test_compaction(self):
+        # Uniform on [0, 2], importance sampled for uniform on [0, 1].
+        seed(0)
+        sample = [2*random() for i in xrange(100000)]
+        weights = [2 if d < 1 else 0 for d in sample]
+        sketch = WeightedDataSketch(maxsize=256)
+        other = WeightedDataSketch(maxsize=256)
+        for i in range(0, 50000, 100):
+            sketch.add_datapoints(sample[i:i+100], weights[i:i+100])
+            other.add_datapoints(sample[50000+i:50100+i],
+                                 weights[50000+i:50100+i])
+        sketch.merge(other)
+        sketch.calc_stats()
+        self.assertEqual(len(sketch), 100000)
+        self.assertLessEqual(len(sketch.items), 256)
+        self.assertLess(abs(sketch.ess - 50000), 1000)
+        self.assertLess(abs(sketch.mean - 0.5), 0.01)
+        for p in [0.05, 0.5, 0.975]:
+            self.assertLess(abs(sketch.get_percentile(p) - p), 0.02)
+
+
 class InterpolateTest(unittest.TestCase):
 
     def test_interpolate(self):
@@ -95,6 +195,40 @@ class FunctionTest(unittest.TestCase):
         self.assertEqual(f.inv(-19, use_lower=True), f.inv(-18))
         self.assertEqual(f.inv(1, use_upper=True), f.inv(0))
 
+    def test_evaluate(self):
+        f = Function([0, 1, 3, 7], [5, 2, 4, 1])
+        xs = [-1, 0, 0.5, 1, 2, 3, 6, 7, 8]
+        for kwargs in [{}, {'use_upper': True}, {'use_lower': True}]:
+            self.assertEqual(f.evaluate(xs, **kwargs),
+                             [f(x0, **kwargs) for x0 in xs])
+
+        # Increasing and decreasing step functions
+        for y in [[0, 2, 5, 9], [9, 5, 5, 0]]:
+            f = StepFunction([0, 1, 3, 7], y)
+            self.assertEqual(f.evaluate(xs), [f(x0) for x0 in xs])
+
+    def test_merge_grids(self):
+        f = Function([0, 2, 4], [0, 0, 0])
+        g = StepFunction([1, 2, 5], [0, 1, 2])
+        self.assertEqual(merge_grids(f, g), [0, 1, 2, 4, 5])
+
+    def test_approx(self):
+        seed(0)
+        for i in range(20):
+            x = sorted(set([int(random()*1000) for j in range(100)]))
+            y = [0]
+            for j in range(len(x)-1):
+                y.append(y[-1] + int(random()*1000))
+            if i % 2:
+                y.reverse()
+            f = StepFunction(x, y)
+            for percenterror in [0.05, 0.01]:
+                error_thresh = percenterror*max(y)
+                approxfn = f.approx(percenterror=percenterror)
+                for x0 in range(x[0], x[-1]+1):
+                    self.assertLessEqual(
+                        abs(approxfn(x0) - f(x0)), error_thresh)
+
 
 if __name__ == '__main__':
     unittest.main()
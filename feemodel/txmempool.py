@@ -7,8 +7,9 @@ import decimal
 import logging
 from time import time
 from copy import copy
-from itertools import groupby
-from operator import attrgetter, itemgetter
+from collections import defaultdict
+from itertools import izip
+from operator import itemgetter
 
 from bitcoin.core import b2lx
 
@@ -220,20 +221,9 @@ class MempoolState(object):
         self.time = int(time())
 
     def get_sizefn(self):
-        entries = sorted(self.entries.values(), key=attrgetter("feerate"),
-                         reverse=True)
-        sizebyfee = [
-            (feerate, sum([entry.size for entry in feegroup]))
-            for feerate, feegroup in groupby(entries, attrgetter("feerate"))]
-        if not sizebyfee:
-            return StepFunction([0, 1], [0, 0])
-        feerates_rev, sizes = zip(*sizebyfee)
-        cumsize_rev = list(cumsum_gen(sizes))
-        feerates = list(reversed(feerates_rev))
-        cumsize = list(reversed(cumsize_rev))
-        sizefn = StepFunction(feerates, cumsize)
-        sizefn.addpoint(feerates[-1]+1, 0)
-        return sizefn
+        entries = self.entries.values()
+        return calc_sizefn([entry.feerate for entry in entries],
+                           [entry.size for entry in entries])
 
     def get_stats(self):
         sizefn = self.get_sizefn()
@@ -859,6 +849,28 @@ class MemEntry(SimEntry):
         return self.__dict__ != other.__dict__
 
 
+def calc_sizefn(feerates, sizes):
+    """Get the mempool size function, from the feerates and sizes of its txs.
+
+    That is, the total size of the txs with feerate >= x, as a
+    StepFunction of x. feerates and sizes can be packed arrays (see
+    pack_entries).
+    """
+    sizebyfee = defaultdict(int)
+    for feerate, size in izip(feerates, sizes):
+        sizebyfee[feerate] += size
+    if not sizebyfee:
+        return StepFunction([0, 1], [0, 0])
+    feerates = sorted(sizebyfee, reverse=True)
+    cumsize_rev = list(cumsum_gen([sizebyfee[feerate]
+                                   for feerate in feerates]))
+    feerates.reverse()
+    cumsize = list(reversed(cumsize_rev))
+    sizefn = StepFunction(feerates, cumsize)
+    sizefn.addpoint(feerates[-1]+1, 0)
+    return sizefn
+
+
 def get_mempool_state():
     starttime = time()
     state = MempoolState(*proxy.poll_mempool())
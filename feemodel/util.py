@@ -6,6 +6,7 @@ import logging
 import operator
 import cPickle as pickle
 from bisect import insort, bisect, bisect_left
+from heapq import merge
 from math import ceil, log
 from contextlib import contextmanager
 from random import random
@@ -339,6 +340,292 @@ class DataSample(object):
             len(self), self.mean, self.std, self.mean_95ci)
 
 
+class DataSketch(object):
+    '''Like DataSample, but in memory which grows only as O(log(n)).
+
+    The mean and variance are kept as running stats (Welford's update, in
+    batches, using the pairwise formula of Chan et al.). The percentiles
+    are estimated with a quantile sketch (KLL, with equal capacities):
+    the datapoints are kept in levels, each datapoint at level h standing
+    for 2**h of the original ones. When a level holds more than
+    maxlevelsize datapoints, it's sorted, and every other datapoint is
+    promoted to the next level (starting with the first or second, at
+    random). So the percentiles are exact as long as there are no more
+    than maxlevelsize datapoints; beyond that, the rank error is on the
+    order of log(n/maxlevelsize)/maxlevelsize.
+
+    Sketches are mergeable: merging two sketches gives the sketch of the
+    union of their datapoints.
+    '''
+
+    def __init__(self, datapoints=None, maxlevelsize=2048):
+        self.maxlevelsize = maxlevelsize
+        self.levels = [[]]
+        self.n = 0
+        self._mean = 0.
+        self._m2 = 0.
+        self.mean = None
+        self.std = None
+        self.mean_95ci = None
+        if datapoints:
+            self.add_datapoints(datapoints)
+
+    def add_datapoints(self, datapoints):
+        '''Add datapoints with a sequence.'''
+        n = len(datapoints)
+        if not n:
+            return
+        mean = float(sum(datapoints)) / n
+        m2 = sum([(d - mean)**2 for d in datapoints])
+        self._update_moments(n, mean, m2)
+        self.levels[0].extend(datapoints)
+        self._compact()
+
+    def merge(self, other):
+        '''Merge in the datapoints of another DataSketch.'''
+        if not other.n:
+            return
+        self._update_moments(other.n, other._mean, other._m2)
+        for h, level in enumerate(other.levels):
+            if h == len(self.levels):
+                self.levels.append([])
+            self.levels[h].extend(level)
+        self._compact()
+
+    def downsample(self, fraction):
+        '''Keep each datapoint with probability fraction.
+
+        This is for downweighting the datapoints, e.g. by their age, before
+        adding new ones: the sketch is then that of a random subsample, and
+        the moments are rescaled to the new count.
+        '''
+        if not 0 <= fraction <= 1:
+            raise ValueError("fraction must be in [0, 1].")
+        self.levels = [[d for d in level if random() < fraction]
+                       for level in self.levels]
+        n = sum([len(level)*2**h for h, level in enumerate(self.levels)])
+        if n:
+            self._m2 *= n / self.n
+        else:
+            self._mean = self._m2 = 0.
+        self.n = n
+
+    def calc_stats(self):
+        '''Compute the statistics, as in DataSample.calc_stats.'''
+        n = self.n
+        if n < 2:
+            raise ValueError("Need at least 2 datapoints.")
+        self.mean = self._mean
+        variance = self._m2 / (n - 1)
+        self.std = variance**0.5
+        half_95ci = 1.96*(variance/n)**0.5
+        self.mean_95ci = (self.mean - half_95ci, self.mean + half_95ci)
+
+    def get_percentile(self, p):
+        '''Returns the (p*100)th percentile of the data.
+
+        Same as DataSample.get_percentile, if no compaction has occurred.
+        '''
+        return self.get_percentiles([p])[0]
+
+    def get_percentiles(self, ps):
+        '''Returns the percentiles for each p in ps, which must be sorted.'''
+        if any([p > 1 or p < 0 for p in ps]):
+            raise ValueError("p must be in [0, 1].")
+        if not self.n:
+            raise ValueError("No datapoints.")
+        weighted = sorted([
+            (d, 2**h) for h, level in enumerate(self.levels)
+            for d in level])
+        percentiles = []
+        idx = 0
+        curr_total = weighted[0][1]
+        for p in ps:
+            target = p*self.n
+            while curr_total < target and idx < len(weighted) - 1:
+                idx += 1
+                curr_total += weighted[idx][1]
+            percentiles.append(weighted[idx][0])
+        return percentiles
+
+    def _update_moments(self, n, mean, m2):
+        total = self.n + n
+        delta = mean - self._mean
+        self._mean += delta*n/total
+        self._m2 += m2 + delta**2*self.n*n/total
+        self.n = total
+
+    def _compact(self):
+        h = 0
+        while h < len(self.levels):
+            level = self.levels[h]
+            if len(level) > self.maxlevelsize:
+                level.sort()
+                # If odd, the last datapoint stays at this level.
+                numpromoted = len(level) // 2 * 2
+                offset = 0 if random() < 0.5 else 1
+                if h + 1 == len(self.levels):
+                    self.levels.append([])
+                self.levels[h+1].extend(level[offset:numpromoted:2])
+                self.levels[h] = level[numpromoted:]
+            h += 1
+
+    def __len__(self):
+        return self.n
+
+    def __repr__(self):
+        return "DataSketch(n: {}, mean: {}, std: {}, mean_95ci: {})".format(
+            len(self), self.mean, self.std, self.mean_95ci)
+
+
+class WeightedDataSketch(object):
+    '''Like DataSketch, but for weighted datapoints.
+
+    The weights are e.g. likelihood ratios, from importance sampling: the
+    stats are those of the distribution in which each datapoint counts in
+    proportion to its weight, i.e. the mean and percentiles are
+    self-normalized by the total weight.
+
+    The moments are kept as running stats, as in DataSketch. For the
+    percentiles, the datapoints are kept as (datapoint, weight) pairs;
+    when there are more than maxsize, they're sorted, and each consecutive
+    pair is compacted into one with their total weight, taking either
+    datapoint at random in proportion to its weight. So the weighted rank
+    of any value is unbiased, and the rank error is on the order of
+    log(n/maxsize)/maxsize.
+
+    ess is the effective sample size, (sum of weights)**2 / (sum of squared
+    weights), which is used in place of the count in mean_95ci.
+    '''
+
+    def __init__(self, datapoints=None, weights=None, maxsize=4096):
+        self.maxsize = maxsize
+        self.items = []
+        self.n = 0
+        self.sumweights = 0.
+        self.sumsqweights = 0.
+        self._mean = 0.
+        self._m2 = 0.
+        self.mean = None
+        self.std = None
+        self.mean_95ci = None
+        if datapoints:
+            self.add_datapoints(datapoints, weights)
+
+    @property
+    def ess(self):
+        if not self.sumsqweights:
+            return 0.
+        return self.sumweights**2 / self.sumsqweights
+
+    def add_datapoints(self, datapoints, weights):
+        '''Add datapoints, with the sequence of their weights.'''
+        if len(weights) != len(datapoints):
+            raise ValueError("len(weights) must be equal to len(datapoints).")
+        sumweights = float(sum(weights))
+        if not sumweights:
+            self.n += len(datapoints)
+            return
+        mean = sum([d*w for d, w in izip(datapoints, weights)]) / sumweights
+        m2 = sum([w*(d - mean)**2 for d, w in izip(datapoints, weights)])
+        self._update_moments(sumweights, mean, m2)
+        self.n += len(datapoints)
+        self.sumsqweights += sum([w*w for w in weights])
+        self.items.extend([(d, w) for d, w in izip(datapoints, weights)
+                           if w > 0])
+        self._compact()
+
+    def merge(self, other):
+        '''Merge in the datapoints of another WeightedDataSketch.'''
+        if other.sumweights:
+            self._update_moments(other.sumweights, other._mean, other._m2)
+        self.n += other.n
+        self.sumsqweights += other.sumsqweights
+        self.items.extend(other.items)
+        self._compact()
+
+    def downsample(self, fraction):
+        '''Keep each datapoint with probability fraction.
+
+        As in DataSketch.downsample; the sums of the weights are rescaled
+        by their expected fractions.
+        '''
+        if not 0 <= fraction <= 1:
+            raise ValueError("fraction must be in [0, 1].")
+        self.items = [item for item in self.items if random() < fraction]
+        self.n = int(round(self.n*fraction))
+        self.sumweights *= fraction
+        self.sumsqweights *= fraction
+        self._m2 *= fraction
+        if not self.items:
+            self.sumweights = self.sumsqweights = self._mean = self._m2 = 0.
+
+    def calc_stats(self):
+        '''Compute the statistics, as in DataSample.calc_stats.'''
+        ess = self.ess
+        if ess < 2:
+            raise ValueError("Need an effective sample size of at least 2.")
+        self.mean = self._mean
+        variance = self._m2 / self.sumweights * ess / (ess - 1)
+        self.std = variance**0.5
+        half_95ci = 1.96*(variance/ess)**0.5
+        self.mean_95ci = (self.mean - half_95ci, self.mean + half_95ci)
+
+    def get_percentile(self, p):
+        '''Returns the weighted (p*100)th percentile of the data.
+
+        As DataSample.get_percentile with weights, if no compaction has
+        occurred.
+        '''
+        return self.get_percentiles([p])[0]
+
+    def get_percentiles(self, ps):
+        '''Returns the percentiles for each p in ps, which must be sorted.'''
+        if any([p > 1 or p < 0 for p in ps]):
+            raise ValueError("p must be in [0, 1].")
+        if not self.items:
+            raise ValueError("No datapoints.")
+        items = sorted(self.items)
+        total = sum([w for d, w in items])
+        percentiles = []
+        idx = 0
+        curr_total = items[0][1]
+        for p in ps:
+            target = p*total
+            while curr_total < target and idx < len(items) - 1:
+                idx += 1
+                curr_total += items[idx][1]
+            percentiles.append(items[idx][0])
+        return percentiles
+
+    def _update_moments(self, sumweights, mean, m2):
+        total = self.sumweights + sumweights
+        delta = mean - self._mean
+        self._mean += delta*sumweights/total
+        self._m2 += m2 + delta**2*self.sumweights*sumweights/total
+        self.sumweights = total
+
+    def _compact(self):
+        if len(self.items) <= self.maxsize:
+            return
+        items = sorted(self.items)
+        compacted = []
+        for (d0, w0), (d1, w1) in izip(items[0::2], items[1::2]):
+            w = w0 + w1
+            compacted.append((d0 if random()*w < w0 else d1, w))
+        if len(items) % 2:
+            compacted.append(items[-1])
+        self.items = compacted
+
+    def __len__(self):
+        return self.n
+
+    def __repr__(self):
+        return ("WeightedDataSketch(n: {}, ess: {}, mean: {}, std: {}, "
+                "mean_95ci: {})".format(len(self), self.ess, self.mean,
+                                        self.std, self.mean_95ci))
+
+
 class Function(object):
     '''A (math) function object with interpolation methods.'''
 
@@ -388,10 +675,36 @@ class Function(object):
             return x0 if use_upper or y0 == _y[-1] else None
         return x0
 
+    def evaluate(self, xs, use_upper=False, use_lower=False):
+        '''Evaluate the function at each of xs, which must be sorted.
+
+        Equivalent to [self(x0, use_upper, use_lower) for x0 in xs], but
+        done in a single merge pass over xs and self._x, i.e. in
+        O(len(xs) + len(self)) instead of O(len(xs)*log(len(self))).
+        '''
+        _x, _y = self._x, self._y
+        n = len(_x)
+        idx = 0
+        ys = []
+        for x0 in xs:
+            # Maintain idx == bisect(_x, x0)
+            while idx < n and _x[idx] <= x0:
+                idx += 1
+            if idx == 0:
+                ys.append(_y[0] if use_lower else None)
+            elif idx == n:
+                ys.append(_y[-1] if use_upper or x0 == _x[-1] else None)
+            else:
+                x_b, y_b = _x[idx-1], _y[idx-1]
+                ys.append(y_b + (x0-x_b)/(_x[idx]-x_b)*(_y[idx]-y_b))
+        return ys
+
     def addpoint(self, xi, yi):
-        if xi in self._x:
+        idx = bisect(self._x, xi)
+        if idx and self._x[idx-1] == xi:
             return
-        self._x, self._y = map(list, zip(*sorted(list(self) + [(xi, yi)])))
+        self._x = self._x[:idx] + [xi] + self._x[idx:]
+        self._y = self._y[:idx] + [yi] + self._y[idx:]
 
     def __getitem__(self, idx):
         return self._x[idx], self._y[idx]
@@ -457,12 +770,41 @@ class StepFunction(Function):
                 return 0
         return self._y[idx]
 
+    def evaluate(self, xs):
+        '''Evaluate the function at each of xs, which must be sorted.
+
+        Equivalent to [self(x0) for x0 in xs], in a single merge pass.
+        '''
+        if len(self) < 2:
+            raise ValueError("Function must have at least 2 points.")
+        _x, _y = self._x, self._y
+        n = len(_x)
+        idx = 0
+        ys = []
+        if _y[-1] > _y[0]:
+            # Function is strictly increasing; idx == bisect(_x, x0)
+            for x0 in xs:
+                while idx < n and _x[idx] <= x0:
+                    idx += 1
+                ys.append(_y[idx-1] if idx > 0 else 0)
+        else:
+            # Function is weakly decreasing; idx == bisect_left(_x, x0)
+            for x0 in xs:
+                while idx < n and _x[idx] < x0:
+                    idx += 1
+                ys.append(_y[idx] if idx < n else 0)
+        return ys
+
     def approx(self, percenterror=0.05, percentstep=0.05):
         """Approximate by a piecewise linear function.
 
         Use as few segments as possible to stay below a given allowable error.
         For convenience, errors are only defined on integer values of the
         domain (also because feerates are integer valued).
+
+        The knots are chosen greedily in a single pass. The error of each
+        candidate knot is checked in O(1) using an _ErrorCorridor, so the
+        whole thing is O(n).
         """
         if len(self) < 2:
             raise ValueError("Function must have at least 2 points.")
@@ -475,54 +817,120 @@ class StepFunction(Function):
             selfcopy._x = map(operator.neg, reversed(selfcopy._x))
             selfcopy._y.reverse()
 
-        selfmax = selfcopy._y[-1]
+        _x, _y = selfcopy._x, selfcopy._y
+        # The function value at x-1 for each x in the domain.
+        _y_back = selfcopy.evaluate([x-1 for x in _x])
+        selfmax = _y[-1]
         error_thresh = percenterror*selfmax
         step = percentstep*selfmax
-        f = Function([selfcopy._x[0]], [selfcopy._y[0]])
+        # The knots are found in increasing order of x, so they're
+        # appended in place, rather than with Function.addpoint, which
+        # copies the lists.
+        knots_x, knots_y = [_x[0]], [_y[0]]
+        f = Function(knots_x, knots_y)
+
+        def addknot(xk, yk):
+            knotidx = bisect(knots_x, xk)
+            if knots_x[knotidx-1] != xk:
+                knots_x.insert(knotidx, xk)
+                knots_y.insert(knotidx, yk)
+
+        def get_corridor():
+            # Points which the segment after the last knot of f must fit.
+            corridor = _ErrorCorridor(f, error_thresh)
+            for j in range(previdx, idx):
+                corridor.addpoint(_x[j]-1, _y_back[j])
+                corridor.addpoint(_x[j], _y[j])
+            return corridor
+
         previdx = 0
         prev_cand_idx = None
         idx = 0
-        while idx < len(selfcopy):
-            cand = selfcopy[idx]
-            _f = copy(f)
-            _f.addpoint(*cand)
-            maxerror = selfcopy._get_maxerror(previdx, idx, _f)
-            if maxerror > error_thresh:
+        corridor = get_corridor()
+        while idx < len(_x):
+            cand = _x[idx], _y[idx]
+            corridor.addpoint(cand[0]-1, _y_back[idx])
+            if corridor.get_maxerror(*cand) > error_thresh:
                 if prev_cand_idx is not None:
-                    f.addpoint(*selfcopy[prev_cand_idx])
+                    addknot(*selfcopy[prev_cand_idx])
                     previdx = prev_cand_idx
                 else:
-                    x, y = selfcopy[idx]
-                    f.addpoint(x-1, selfcopy(x-1))
+                    addknot(cand[0]-1, _y_back[idx])
                 prev_cand_idx = None
-            elif cand[1] - selfcopy[previdx][1] > step:
-                f.addpoint(*cand)
+                corridor = get_corridor()
+            elif cand[1] - _y[previdx] > step:
+                addknot(*cand)
                 previdx = idx
                 prev_cand_idx = None
                 idx += 1
+                corridor = get_corridor()
             else:
+                corridor.addpoint(*cand)
                 prev_cand_idx = idx
                 idx += 1
         if prev_cand_idx:
-            f.addpoint(*selfcopy[prev_cand_idx])
+            addknot(*selfcopy[prev_cand_idx])
         if reverse:
             f._x = map(operator.neg, reversed(f._x))
             f._y = list(reversed(f._y))
         return f
 
-    def _get_maxerror(self, previdx, curridx, f):
-        maxerror = 0
-        for idx in range(previdx, curridx+1):
-            x, y = self[idx]
-            curr_error = abs(y - f(x))
-            curr_error_back = abs(self(x-1) - f(x-1, use_lower=True))
-            maxerror = max(curr_error, curr_error_back, maxerror)
-        return maxerror
-
     def __copy__(self):
         return StepFunction(list(self._x), list(self._y))
 
 
+class _ErrorCorridor(object):
+    """The points to be fitted by the segment after the last knot of f.
+
+    Consider the segment from the last knot (xk, yk) to a candidate knot.
+    For a point (x, y) with x > xk, the error is within error_thresh iff
+    the slope of the segment is within
+    [(y-yk-error_thresh)/(x-xk), (y-yk+error_thresh)/(x-xk)]. So only the
+    two points which bound the slope from below and above need to be
+    checked; if the segment is within error_thresh of both, it is within
+    error_thresh of all the points.
+
+    Points with x <= xk are fitted by f itself, so their error doesn't
+    depend on the candidate knot.
+    """
+
+    def __init__(self, f, error_thresh):
+        self.f = f
+        self.xk, self.yk = f[-1]
+        self.error_thresh = error_thresh
+        self.fixed_error = 0
+        # (slope bound, x, y) of the binding points
+        self.lower = None
+        self.upper = None
+
+    def addpoint(self, x, y):
+        if x <= self.xk:
+            self.fixed_error = max(
+                self.fixed_error, abs(y - self.f(x, use_lower=True)))
+            return
+        dx = x - self.xk
+        lower = (y - self.yk - self.error_thresh) / dx
+        upper = (y - self.yk + self.error_thresh) / dx
+        if self.lower is None or lower > self.lower[0]:
+            self.lower = (lower, x, y)
+        if self.upper is None or upper < self.upper[0]:
+            self.upper = (upper, x, y)
+
+    def get_maxerror(self, xc, yc):
+        """Get the max error of the binding points w.r.t. f + (xc, yc).
+
+        This is > error_thresh iff the max error of all the points is.
+        """
+        maxerror = self.fixed_error
+        for bound in self.lower, self.upper:
+            if bound is not None:
+                _dummy, x, y = bound
+                y_approx = (
+                    self.yk + (x-self.xk)/(xc-self.xk)*(yc-self.yk))
+                maxerror = max(maxerror, abs(y - y_approx))
+        return maxerror
+
+
 class BlockMetadata(object):
     """Block metadata.
 
@@ -678,6 +1086,15 @@ def round_random(f):
     return int_f + (random() <= f - int_f)
 
 
+def merge_grids(*fns):
+    '''Get the sorted union of the x points of the functions fns.'''
+    grid = []
+    for x in merge(*[fn._x for fn in fns]):
+        if not grid or x != grid[-1]:
+            grid.append(x)
+    return grid
+
+
 def interpolate(x0, x, y):
     '''Linear interpolation of y = f(x) at x0.
 
@@ -25,8 +25,10 @@ setup(
         'tabulate'
     ],
     ext_modules=cythonize([
+        "feemodel/simul/variates.pyx",
         "feemodel/simul/txsources.pyx",
         "feemodel/simul/simul.pyx",
+        "feemodel/simul/kernel.pyx",
         "feemodel/stranding.pyx"
     ]),
     entry_points={